@@ -5,16 +5,26 @@ generating human-friendly output files. Keeping these helpers together
 makes it easier to reuse them across scripts and future services.
 """
 
+from .catalog_index import CatalogIndex, SynonymTable, get_catalog_index, get_synonym_table
 from .catalog_loader import DEFAULT_CATALOG_PATH, SCHEMA_PATH, load_catalog
-from .parser import main, parse_line, parse_quantity
+from .parser import main, normalize_line_with_catalog, parse_line, parse_lines, parse_quantity
 from .normalizer import normalize_text
+from .quantity import QuantityToken, scan_quantities
 
 __all__ = [
+    "CatalogIndex",
     "DEFAULT_CATALOG_PATH",
+    "QuantityToken",
     "SCHEMA_PATH",
+    "SynonymTable",
+    "get_catalog_index",
+    "get_synonym_table",
     "load_catalog",
     "main",
+    "normalize_line_with_catalog",
     "normalize_text",
     "parse_line",
+    "parse_lines",
     "parse_quantity",
+    "scan_quantities",
 ]
@@ -0,0 +1,237 @@
+"""Precomputed match index over an inventory catalog.
+
+``parse_line`` scores a transcript line against every keyword, phonetic
+spelling and item name in the catalog. Doing that naively re-normalizes each
+keyword and calls the scorer once per (item, keyword) pair for every line.
+
+``CatalogIndex`` does the catalog-side work once: it flattens the catalog into
+a single array of normalized match strings (deduplicated, keeping the first
+occurrence so ties resolve exactly as the original item-by-item loop did) and
+hands the whole array to rapidfuzz in one call per line.
+
+For whole transcripts, ``best_matches`` can instead score every segment in
+one multi-threaded ``process.cdist`` call. cdist computes the full
+segments × choices matrix, while extractOne prunes with a rising score
+cutoff; on the repo transcripts the matrix is ~20x more scorer work, so it
+only wins with many cores and is opt-in via ``workers``.
+
+``SynonymTable`` is the equivalent for ``normalize_line_with_catalog``: the
+deduplicated synonym → canonical-name table plus a prefix index, so a line is
+rewritten in one left-to-right scan instead of rebuilding the table and
+calling ``str.replace`` per synonym.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+from rapidfuzz import fuzz, process
+
+from .normalizer import normalize_text
+
+
+class CatalogMatch(NamedTuple):
+    """Best catalog hit for a line."""
+
+    category: str
+    item: str
+    keyword: str  # keyword as written in the catalog (not normalized)
+    score: float  # 0.0-1.0
+    entry: Dict[str, Any]
+
+
+class CatalogIndex:
+    """Flat, normalized view of a catalog for fast best-match lookups."""
+
+    def __init__(self, catalog: Dict[str, Any]):
+        self.choices: List[str] = []
+        self.owners: List[Tuple[str, Dict[str, Any], str]] = []
+        seen = set()
+
+        for cat, items in catalog.items():
+            if not isinstance(items, list):
+                continue
+            for obj in items:
+                if not isinstance(obj, dict) or "item" not in obj:
+                    continue
+                keywords = obj.get("keywords", [])
+                phonetics = obj.get("phonetic", [])
+                for kw in keywords + phonetics + [obj["item"].lower()]:
+                    norm = normalize_text(kw)
+                    # Identical strings score identically; the first one wins ties
+                    if norm in seen:
+                        continue
+                    seen.add(norm)
+                    self.choices.append(norm)
+                    self.owners.append((cat, obj, kw))
+
+        self.signature = catalog_signature(catalog)
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def best_match(self, line_norm: str) -> Tuple[float, Optional[CatalogMatch]]:
+        """Highest partial_ratio match for an already-normalized line.
+
+        Returns (score, match); match is None when nothing scores above 0.
+        """
+        if not self.choices:
+            return 0, None
+        _, score, idx = process.extractOne(line_norm, self.choices, scorer=fuzz.partial_ratio)
+        if score <= 0:
+            return 0, None
+        return self._match(score, idx)
+
+    def score_matrix(self, lines_norm: Sequence[str], workers: int = -1):
+        """lines × choices partial_ratio matrix (0-100, float64) in one cdist call."""
+        import numpy as np
+
+        return process.cdist(
+            lines_norm, self.choices, scorer=fuzz.partial_ratio, dtype=np.float64, workers=workers
+        )
+
+    def best_matches(
+        self, lines_norm: Sequence[str], workers: int = 1
+    ) -> List[Tuple[float, Optional[CatalogMatch]]]:
+        """``best_match`` for many normalized lines.
+
+        With ``workers=1`` each line goes through pruned extractOne; any other
+        value scores all lines as one cdist matrix on that many threads
+        (-1 = all cores). Both give identical results.
+        """
+        if not lines_norm or not self.choices:
+            return [(0, None) for _ in lines_norm]
+        if workers == 1:
+            return [self.best_match(line) for line in lines_norm]
+        matrix = self.score_matrix(lines_norm, workers=workers)
+        # argmax returns the first maximum, matching extractOne's tie-break
+        best = matrix.argmax(axis=1)
+        results = []
+        for row, idx in enumerate(best):
+            score = float(matrix[row, idx])
+            results.append((0, None) if score <= 0 else self._match(score, int(idx)))
+        return results
+
+    def _match(self, score: float, idx: int) -> Tuple[float, CatalogMatch]:
+        cat, obj, kw = self.owners[idx]
+        score = score / 100
+        return score, CatalogMatch(cat, obj["item"], kw, score, obj)
+
+
+class SynonymTable:
+    """Synonym → canonical-name table for rewriting lines in one pass.
+
+    Synonyms are normalized item names, keywords and phonetic spellings of at
+    least ``MIN_LENGTH`` characters; the first item to claim a synonym owns it.
+    """
+
+    MIN_LENGTH = 4
+
+    def __init__(self, catalog: Dict[str, Any]):
+        self.canonical: Dict[str, str] = {}
+        for items in catalog.values():
+            if not isinstance(items, list):
+                continue
+            for obj in items:
+                name = obj.get("item") if isinstance(obj, dict) else None
+                if not name:
+                    continue
+                for syn in [name] + obj.get("keywords", []) + obj.get("phonetic", []):
+                    syn_norm = normalize_text(syn)
+                    # Skip tiny tokens to avoid runaway replacements
+                    if len(syn_norm) < self.MIN_LENGTH or syn_norm in self.canonical:
+                        continue
+                    self.canonical[syn_norm] = name
+
+        # Insertion order doubles as the fuzzy-match choice order
+        self.vocab: List[str] = list(self.canonical)
+
+        # First MIN_LENGTH chars -> synonyms with that prefix, longest first
+        self._by_prefix: Dict[str, List[str]] = {}
+        for syn in self.vocab:
+            self._by_prefix.setdefault(syn[: self.MIN_LENGTH], []).append(syn)
+        for syns in self._by_prefix.values():
+            syns.sort(key=len, reverse=True)
+
+        self.signature = catalog_signature(catalog)
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+    def replace(self, line_norm: str) -> Tuple[str, int]:
+        """Replace whole-word synonym mentions with lowercase canonical names.
+
+        Scans left to right taking the longest synonym at each word start, so
+        inserted canonical names are never re-matched and words that merely
+        contain a synonym ("recording" / "cord") are left alone. Returns the
+        new line and the number of replacements made.
+        """
+        out: List[str] = []
+        i, n, count = 0, len(line_norm), 0
+        start = 0
+        while i <= n - self.MIN_LENGTH:
+            if i == 0 or not line_norm[i - 1].isalnum():
+                for syn in self._by_prefix.get(line_norm[i : i + self.MIN_LENGTH], ()):
+                    end = i + len(syn)
+                    if line_norm.startswith(syn, i) and (end == n or not line_norm[end].isalnum()):
+                        out.append(line_norm[start:i])
+                        out.append(self.canonical[syn].lower())
+                        i = start = end
+                        count += 1
+                        break
+                else:
+                    i += 1
+            else:
+                i += 1
+        out.append(line_norm[start:])
+        return "".join(out), count
+
+    def fuzzy(self, line_norm: str, score_cutoff: float) -> Optional[Tuple[str, str]]:
+        """Best (synonym, canonical) for the whole line above score_cutoff (0-100)."""
+        if not self.vocab:
+            return None
+        match = process.extractOne(line_norm, self.vocab, score_cutoff=score_cutoff)
+        if not match:
+            return None
+        return match[0], self.canonical[match[0]]
+
+
+def catalog_signature(catalog: Dict[str, Any]) -> Tuple[Tuple[str, int], ...]:
+    """Cheap fingerprint that changes when items are added or removed."""
+    return tuple((cat, len(items)) for cat, items in catalog.items() if isinstance(items, list))
+
+
+_T = TypeVar("_T", CatalogIndex, SynonymTable)
+
+# (kind, id(catalog)) -> (catalog, built object); the catalog reference keeps the id valid
+_CACHE: Dict[Tuple[type, int], Tuple[Dict[str, Any], Any]] = {}
+_CACHE_SIZE = 8
+
+
+def _cached(kind: Callable[[Dict[str, Any]], _T], catalog: Dict[str, Any]) -> _T:
+    key = (kind, id(catalog))
+    cached = _CACHE.get(key)
+    if cached is not None and cached[0] is catalog and cached[1].signature == catalog_signature(catalog):
+        return cached[1]
+
+    built = kind(catalog)
+    if len(_CACHE) >= _CACHE_SIZE:
+        _CACHE.pop(next(iter(_CACHE)))
+    _CACHE[key] = (catalog, built)
+    return built
+
+
+def get_catalog_index(catalog: Dict[str, Any]) -> CatalogIndex:
+    """Return the index for this catalog object, building it on first use.
+
+    The index is rebuilt if items were added to or removed from the catalog
+    since it was built. In-place edits to an item's keywords are not detected;
+    build a new ``CatalogIndex`` after such edits.
+    """
+    return _cached(CatalogIndex, catalog)
+
+
+def get_synonym_table(catalog: Dict[str, Any]) -> SynonymTable:
+    """Return the synonym table for this catalog object (same caching rules
+    as ``get_catalog_index``)."""
+    return _cached(SynonymTable, catalog)
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 from typing import Any, Dict
 import csv
 
+from .catalog_store import get_catalog_store
+
 PACKAGE_ROOT = Path(__file__).resolve().parent
 DATA_DIR = PACKAGE_ROOT.parent / "data"
 DEFAULT_CATALOG_PATH = DATA_DIR / "inventory_catalog.json"
@@ -20,6 +21,10 @@ def load_catalog(catalog_path: str | Path | None = None) -> Dict[str, Any]:
 
     If no path is provided, we default to ``data/inventory_catalog.json`` so
     callers do not need to remember the file layout.
+
+    The file is parsed through the shared ``CatalogStore`` (the
+    same cache the inventory agent and prompt builders use); the result is a
+    mutable copy the caller may edit.
     """
 
     path = Path(catalog_path) if catalog_path else DEFAULT_CATALOG_PATH
@@ -28,8 +33,7 @@ def load_catalog(catalog_path: str | Path | None = None) -> Dict[str, Any]:
             f"Catalog file not found at {path}. Ensure the data files are in place."
         )
 
-    with path.open("r") as f:
-        catalog = json.load(f)
+    catalog = get_catalog_store(path).copy()
 
     roster_path = Path(
         os.getenv("ROSTER_CSV_PATH", DEFAULT_ROSTER_PATH)
@@ -0,0 +1,204 @@
+"""Process-wide inventory catalog cache.
+
+The inventory catalog JSON is read by ``catalog_loader``, and in transrouter
+by the inventory agent (unit lookups), the inventory/consolidation prompt
+builders and the catalog retriever.
+``CatalogStore`` parses the file once per process and hands every caller
+the same read-only object, so they all see the same catalog version.
+
+Each ``get()`` stats the file; when its mtime or size changes the catalog is
+re-parsed and ``version`` bumps. Category slices and anything registered via
+``cached()`` (lookup indexes, retrievers) are rebuilt lazily for the new
+version. A reload that fails to parse keeps serving the previous version.
+
+Views are ``FrozenDict``/``FrozenList`` (dict/list subclasses that refuse
+mutation), so existing ``isinstance(..., list)`` checks and ``json.dump``
+keep working. Use ``copy()`` for a mutable catalog.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+log = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# First existing path wins. Docker images copy the catalog to data/.
+DEFAULT_CATALOG_PATHS = (
+    REPO_ROOT / "data" / "inventory_catalog.json",
+    REPO_ROOT / "inventory_agent" / "inventory_catalog.json",
+)
+
+# Inventory category -> catalog keys
+CATEGORY_KEYS = {
+    "bar": ["beer_cost", "wine_cost", "liquor_cost", "n_a_beverage_cost"],
+    "food": ["grocery_and_dry_goods"],
+    "supplies": ["grocery_and_dry_goods"],  # Overlap with food
+}
+
+_T = TypeVar("_T")
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only; use CatalogStore.copy() for a mutable catalog")
+
+
+class FrozenDict(dict):
+    """dict that refuses mutation."""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return thaw(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (thaw(self),))
+
+
+class FrozenList(list):
+    """list that refuses mutation."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return thaw(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (list, (thaw(self),))
+
+
+def freeze(obj: Any) -> Any:
+    """Read-only copy of parsed JSON."""
+    if isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return FrozenList(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """Mutable plain dict/list copy of a (possibly frozen) JSON value."""
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+_EMPTY = FrozenDict()
+
+
+class CatalogStore:
+    """Cached, hot-reloading view of one catalog file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.version = 0
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._catalog: FrozenDict = _EMPTY
+        self._slices: Dict[str, FrozenDict] = {}
+        self._derived: Dict[Hashable, Any] = {}
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def get(self) -> FrozenDict:
+        """The full catalog, re-parsed if the file changed since the last call."""
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._reload(stamp)
+        return self._catalog
+
+    def _reload(self, stamp: Optional[Tuple[int, int]]) -> None:
+        if stamp is None:
+            log.warning("Inventory catalog not found at %s", self.path)
+            catalog = _EMPTY
+        else:
+            try:
+                with self.path.open("r") as f:
+                    catalog = freeze(json.load(f))
+            except (OSError, ValueError) as e:
+                if self._stamp is None:
+                    raise
+                # Likely caught mid-write; keep serving the last good version
+                log.error("Failed to reload inventory catalog %s: %s", self.path, e)
+                return
+
+        self._catalog = catalog
+        self._slices = {}
+        self._derived = {}
+        self._stamp = stamp
+        self.version += 1
+        log.info("Loaded inventory catalog %s (version=%d, categories=%d)", self.path, self.version, len(catalog))
+
+    def slice(self, category: str = "all") -> FrozenDict:
+        """Product lists for an inventory category (bar, food, supplies, or "all")."""
+        catalog = self.get()
+        slices = self._slices
+        cached = slices.get(category)
+        if cached is None:
+            if category == "all":
+                cached = FrozenDict((k, v) for k, v in catalog.items() if k != "global_rules")
+            else:
+                cached = FrozenDict(
+                    (key, catalog[key]) for key in CATEGORY_KEYS.get(category, []) if key in catalog
+                )
+            slices[category] = cached
+        return cached
+
+    def cached(self, key: Hashable, build: Callable[[], _T]) -> _T:
+        """Value of build() for the current catalog version, built once per version."""
+        self.get()
+        derived = self._derived
+        try:
+            return derived[key]
+        except KeyError:
+            # Stored in this version's dict, so a concurrent reload discards it
+            value = derived[key] = build()
+            return value
+
+    def copy(self) -> Dict[str, Any]:
+        """Mutable copy of the current catalog."""
+        return thaw(self.get())
+
+
+_STORES: Dict[Path, CatalogStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def default_catalog_path() -> Path:
+    for path in DEFAULT_CATALOG_PATHS:
+        if path.exists():
+            return path
+    return DEFAULT_CATALOG_PATHS[0]
+
+
+def get_catalog_store(path: Optional[Path] = None) -> CatalogStore:
+    """Shared store for a catalog file (the default catalog if path is None)."""
+    path = Path(path).resolve() if path else default_catalog_path()
+    store = _STORES.get(path)
+    if store is None:
+        with _STORES_LOCK:
+            store = _STORES.setdefault(path, CatalogStore(path))
+    return store
@@ -14,14 +14,14 @@ Architecture snapshot & Cycle 2 plan
 from __future__ import annotations
 
 import json
-import re
 import sys
 from pathlib import Path
+from typing import List, Sequence
 
-from rapidfuzz import fuzz, process
-
+from .catalog_index import CatalogIndex, CatalogMatch, get_catalog_index, get_synonym_table
 from .catalog_loader import DEFAULT_CATALOG_PATH, load_catalog
 from .normalizer import normalize_text
+from .quantity import hint_pattern, resolve_quantity, scan_quantities
 from .tokenizer import split_line_into_segments
 from .validator import validate_output
 
@@ -44,20 +44,16 @@ QUANTITY_WORDS = {
 }
 
 
+_UNIT_WORDS = ("bottle", "bottles", "can", "cans", "pack", "packs", "case", "cases", "keg", "kegs", "barrel", "barrels", "bbl", "bbls", "ounce", "ounces", "oz")
+
+# Digits, quantity words or common units that imply quantity context
+_QUANTITY_HINT = hint_pattern(QUANTITY_WORDS | set(_UNIT_WORDS))
+
+
 def _has_quantity_token(text: str) -> bool:
     """Fast heuristic to skip narrative lines with no quantities/units."""
 
-    lower = normalize_text(text)
-    if re.search(r"\d", lower):
-        return True
-    for tok in QUANTITY_WORDS:
-        if tok in lower:
-            return True
-    # common units that imply quantity context
-    for unit in ("bottle", "bottles", "can", "cans", "pack", "packs", "case", "cases", "keg", "kegs", "barrel", "barrels", "bbl", "bbls", "ounce", "ounces", "oz"):
-        if unit in lower:
-            return True
-    return False
+    return _QUANTITY_HINT.search(normalize_text(text)) is not None
 
 
 def _detect_location(text: str) -> str | None:
@@ -81,187 +77,131 @@ def _detect_location(text: str) -> str | None:
 def parse_quantity(phrase: str, global_rules: dict) -> float | None:
     """Extract a numeric quantity from a phrase with basic unit awareness."""
 
-    fraction_words = global_rules.get("fraction_words", {})
-    phrase_norm = normalize_text(phrase)
-
-    # Percentages like "80% bottle" or "80 percent"
-    percent_match = re.search(r"(\d+(?:\.\d+)?)\s*%|\b(\d+(?:\.\d+)?)\s+percent\b", phrase_norm)
-    if percent_match:
-        value = percent_match.group(1) or percent_match.group(2)
-        try:
-            return float(value) / 100.0
-        except Exception:
-            pass
-
-    # Fractions by words
-    word_fractions = {
-        "three quarters": 0.75,
-        "three quarter": 0.75,
-        "half": 0.5,
-        "quarter": 0.25,
-        "full": 1.0,
-    }
-    for w, val in word_fractions.items():
-        if w in phrase_norm:
-            return val
-
-    # Patterns like "4 six packs" or "four six packs"
-    pack_patterns = [
-        (r"^(\d+(?:\.\d+)?)\s+(six|6)\s+pack", 6),
-        (r"^(\d+(?:\.\d+)?)\s+(twelve|12)\s+pack", 12),
-        (r"^(\d+(?:\.\d+)?)\s+(twenty four|24)\s+pack", 24),
-    ]
-    for pat, mult in pack_patterns:
-        m = re.match(pat, phrase_norm)
-        if m:
-            return float(m.group(1)) * mult
-
-    # Leading numeric
-    m = re.match(r"^([0-9]+(\.[0-9]+)?)", phrase_norm)
-    if m:
-        return float(m.group(1))
-
-    # Fractions / words
-    for word, value in fraction_words.items():
-        if word in phrase_norm:
-            return value
-
-    numbers = {
-        "zero": 0,
-        "one": 1,
-        "two": 2,
-        "three": 3,
-        "four": 4,
-        "five": 5,
-        "six": 6,
-        "seven": 7,
-        "eight": 8,
-        "nine": 9,
-        "ten": 10,
-    }
-    words = phrase_norm.split()
-    if words and words[0] in numbers:
-        return float(numbers[words[0]])
+    return _quantity_from_norm(normalize_text(phrase), global_rules)
 
-    return None
+
+def _quantity_from_norm(phrase_norm: str, global_rules: dict) -> float | None:
+    """``parse_quantity`` for text that is already normalized."""
+
+    tokens = scan_quantities(phrase_norm)
+    return resolve_quantity(tokens, phrase_norm, global_rules.get("fraction_words", {}))
 
 
 def normalize_line_with_catalog(line: str, catalog: dict, threshold: float = 0.85) -> str:
     """Normalize a line by replacing matched product mentions with canonical item names."""
 
     line_norm = normalize_text(line)
-    replacements = []
-    choices = []
-
-    for cat, items in catalog.items():
-        if not isinstance(items, list):
-            continue
-        for obj in items:
-            name = obj.get("item") if isinstance(obj, dict) else None
-            if not name:
-                continue
-            synonyms = [name]
-            synonyms += obj.get("keywords", [])
-            synonyms += obj.get("phonetic", [])
-            for syn in synonyms:
-                syn_norm = normalize_text(syn)
-                # Skip tiny tokens to avoid runaway replacements
-                if len(syn_norm) < 4:
-                    continue
-                if syn_norm and syn_norm not in [c[0] for c in choices]:
-                    choices.append((syn_norm, name))
-
-    # Direct substring replacements
-    for syn_norm, canon in choices:
-        if syn_norm and syn_norm in line_norm:
-            replacements.append((syn_norm, canon))
-
-    # Fuzzy replacements when no direct hit
-    if not replacements and choices:
-        vocab = [c[0] for c in choices]
-        match = process.extractOne(line_norm, vocab, score_cutoff=int(threshold * 100))
-        if match:
-            syn_norm = match[0]
-            canon = next(c for c in choices if c[0] == syn_norm)[1]
-            replacements.append((syn_norm, canon))
-
-    for syn_norm, canon in replacements:
+    table = get_synonym_table(catalog)
+
+    # Direct whole-word replacements
+    replaced, count = table.replace(line_norm)
+    if count:
+        return replaced
+
+    # Fuzzy replacement when no direct hit
+    match = table.fuzzy(line_norm, score_cutoff=int(threshold * 100))
+    if match:
+        syn_norm, canon = match
         line_norm = line_norm.replace(syn_norm, canon.lower())
 
     return line_norm
 
 
-def parse_line(line: str, catalog: dict, global_rules: dict):
-    """Return details for a transcript line if it matches the catalog.
+_NO_MATCH = (None, None, None, None, None)
 
-    Returns a tuple of:
-        (category, canonical_name, qty, match_score, matched_keyword)
-    or a tuple of Nones when the line does not match.
-    """
 
-    line = normalize_text(line)
+def _line_quantity(line: str, global_rules: dict) -> float | None:
+    """Quantity for an already-normalized line, or None if it should be skipped."""
 
     if any(nk in line for nk in global_rules.get("negative_keywords", [])):
-        return None, None, None, None, None
+        return None
 
-    qty = parse_quantity(line, global_rules)
+    qty = _quantity_from_norm(line, global_rules)
     if qty is None:
         if "full" in line:
             qty = 1.0
         elif "empty" in line:
             qty = 0.0
-        else:
-            return None, None, None, None, None
-
-    best_score = 0
-    best_item = None
-    best_cat = None
-    best_keyword = None
-    best_obj = None
-
-    for cat, items in catalog.items():
-        if not isinstance(items, list):
-            continue
-        for obj in items:
-            if not isinstance(obj, dict):
-                continue
-            if "item" not in obj:
-                continue
-            keywords = obj.get("keywords", [])
-            phonetics = obj.get("phonetic", [])
-
-            for kw in keywords + phonetics + [obj["item"].lower()]:
-                score = fuzz.partial_ratio(line, normalize_text(kw)) / 100
-                if score > best_score:
-                    best_score = score
-                    best_item = obj["item"]
-                    best_cat = cat
-                    best_keyword = kw
-                    best_obj = obj
-
-            if best_score == 1.0:
-                break
-        if best_score == 1.0:
-            break
+    return qty
+
+
+def _resolve_match(line: str, qty: float, best_score: float, match: CatalogMatch | None, global_rules: dict):
+    """Apply the match threshold and case multipliers to a scored line."""
 
     threshold = global_rules.get("fuzzy_match_threshold", 0.78)
     if best_score < threshold:
         return None, None, None, best_score, None
+    if match is None:
+        return None, None, qty, best_score, None
 
     # If we matched and the line mentions cases, apply case size multiplier
-    if best_obj:
-        default_case_size = global_rules.get("default_case_size", 12)
-        case_size = best_obj.get("case_size", default_case_size)
-
-        if "case" in line or "cases" in line:
-            # If canned/pack context, assume 24 unless overridden
-            if any(word in line for word in ("can", "pack")):
-                can_case_size = best_obj.get("case_size", global_rules.get("case_size_cans", 24))
-                qty = qty * can_case_size
-            else:
-                qty = qty * case_size
+    best_obj = match.entry
+    default_case_size = global_rules.get("default_case_size", 12)
+    case_size = best_obj.get("case_size", default_case_size)
+
+    if "case" in line or "cases" in line:
+        # If canned/pack context, assume 24 unless overridden
+        if any(word in line for word in ("can", "pack")):
+            can_case_size = best_obj.get("case_size", global_rules.get("case_size_cans", 24))
+            qty = qty * can_case_size
+        else:
+            qty = qty * case_size
+
+    return match.category, match.item, qty, best_score, match.keyword
+
+
+def parse_line(line: str, catalog: dict, global_rules: dict, index: CatalogIndex | None = None):
+    """Return details for a transcript line if it matches the catalog.
+
+    Returns a tuple of:
+        (category, canonical_name, qty, match_score, matched_keyword)
+    or a tuple of Nones when the line does not match.
 
-    return best_cat, best_item, qty, best_score, best_keyword
+    ``index`` defaults to the cached CatalogIndex for ``catalog``.
+    """
+
+    line = normalize_text(line)
+    qty = _line_quantity(line, global_rules)
+    if qty is None:
+        return _NO_MATCH
+
+    if index is None:
+        index = get_catalog_index(catalog)
+    best_score, match = index.best_match(line)
+    return _resolve_match(line, qty, best_score, match, global_rules)
+
+
+def parse_lines(
+    lines: Sequence[str],
+    catalog: dict,
+    global_rules: dict,
+    index: CatalogIndex | None = None,
+    workers: int = 1,
+) -> List[tuple]:
+    """Batch version of ``parse_line`` for a whole transcript.
+
+    Quantity detection runs first; the remaining lines are scored together
+    via ``CatalogIndex.best_matches``. Pass ``workers=-1`` (or a thread count)
+    to score them as one multi-threaded ``process.cdist`` matrix on machines
+    with many cores. Returns one tuple per input line, identical to calling
+    ``parse_line`` on each.
+    """
+
+    if index is None:
+        index = get_catalog_index(catalog)
+
+    results: List[tuple] = [_NO_MATCH] * len(lines)
+    pending = []  # (position, normalized line, qty)
+    for pos, line in enumerate(lines):
+        line = normalize_text(line)
+        qty = _line_quantity(line, global_rules)
+        if qty is not None:
+            pending.append((pos, line, qty))
+
+    matches = index.best_matches([line for _, line, _ in pending], workers=workers)
+    for (pos, line, qty), (best_score, match) in zip(pending, matches):
+        results[pos] = _resolve_match(line, qty, best_score, match, global_rules)
+    return results
 
 
 def main() -> None:
@@ -292,11 +232,13 @@ def main() -> None:
 
     catalog_data = load_catalog(catalog_path)
     global_rules = catalog_data.get("global_rules", {})
+    index = CatalogIndex(catalog_data)
 
     results = {cat: {} for cat in catalog_data if isinstance(catalog_data[cat], list)}
     unmatched = []
     breakdown = {cat: {} for cat in catalog_data if isinstance(catalog_data[cat], list)}
     current_location = "unknown"
+    segments = []  # (segment, location at that point in the transcript)
 
     with transcript_path.open("r") as f:
         for raw_line in f:
@@ -319,14 +261,18 @@ def main() -> None:
                     continue
                 if normalize_on:
                     line = normalize_line_with_catalog(line, catalog_data)
-                cat, canonical, qty, score, kw = parse_line(line, catalog_data, global_rules)
-                if cat and canonical and qty is not None:
-                    results[cat][canonical] = results[cat].get(canonical, 0) + qty
-                    breakdown[cat].setdefault(canonical, []).append(
-                        {"line": line, "qty": qty, "location": current_location}
-                    )
-                else:
-                    unmatched.append({"line": line, "score": score})
+                segments.append((line, current_location))
+
+    # Score every segment against the catalog in one vectorized pass
+    parsed = parse_lines([line for line, _ in segments], catalog_data, global_rules, index)
+    for (line, location), (cat, canonical, qty, score, kw) in zip(segments, parsed):
+        if cat and canonical and qty is not None:
+            results[cat][canonical] = results[cat].get(canonical, 0) + qty
+            breakdown[cat].setdefault(canonical, []).append(
+                {"line": line, "qty": qty, "location": location}
+            )
+        else:
+            unmatched.append({"line": line, "score": score})
 
     out_json = {}
     for cat in results:
@@ -0,0 +1,163 @@
+"""Compiled quantity grammar shared by the tokenizer and parser.
+
+Quantity phrases ("two bottles", "4 six packs", "80%", "three quarters")
+used to be recognized separately in three places, each re-normalizing the
+text and looping over word sets with substring checks. This module compiles
+the vocabulary once:
+
+- ``scan_quantities`` reads an already-normalized line in a single regex pass
+  and returns structured ``QuantityToken`` values.
+- ``hint_pattern`` builds the cheap "does this mention a quantity at all"
+  check used to skip narrative lines.
+- ``QUANTITY_PHRASE_START`` marks where each quantity phrase begins, for
+  splitting multi-item lines.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+WORD_NUMBERS = {
+    "zero": 0,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+}
+
+# Checked in this order; the first one present wins
+FRACTION_WORDS = {
+    "three quarters": 0.75,
+    "three quarter": 0.75,
+    "half": 0.5,
+    "quarter": 0.25,
+    "full": 1.0,
+}
+
+PACK_SIZES = {"six": 6, "6": 6, "twelve": 12, "12": 12, "twenty four": 24, "24": 24}
+
+UNITS = ("bottle", "can", "pack", "case", "keg", "barrel", "bbl", "ounce", "oz")
+
+
+class QuantityToken(NamedTuple):
+    """One quantity mention in a normalized line."""
+
+    kind: str  # "percent", "pack", "number", "fraction", "word" or "unit"
+    value: Optional[float]  # None for bare units
+    unit: Optional[str]  # singular unit name, "pack" or "percent"
+    pack_size: Optional[int]  # units per pack for "4 six packs"
+    span: Tuple[int, int]
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # Longest first so "three quarters" wins over "three"
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+_NUMBER = r"\d+(?:\.\d+)?"
+
+def _first_chars(words: Iterable[str]) -> str:
+    return "".join(sorted({w[0] for w in words}))
+
+
+# Alternatives are tried in order at each position. Fractions keep the
+# original substring semantics ("half" in "behalf"); word numbers only count
+# as whole, whitespace-delimited words. The leading lookahead rejects most
+# positions on their first character before any alternative is tried.
+_GRAMMAR = re.compile(
+    rf"(?=[\d{_first_chars(FRACTION_WORDS)}]|\b[{_first_chars([*WORD_NUMBERS, *UNITS])}])"
+    rf"(?:(?P<percent>{_NUMBER})\s*%"
+    rf"|\b(?P<percent_word>{_NUMBER})\s+percent\b"
+    rf"|(?P<pack_count>{_NUMBER})\s+(?P<pack_size>{_alternation(PACK_SIZES)})\s+pack"
+    rf"|(?P<number>{_NUMBER})"
+    rf"|(?P<fraction>{_alternation(FRACTION_WORDS)})"
+    rf"|(?<!\S)(?P<word>{_alternation(WORD_NUMBERS)})(?!\S)"
+    rf"|\b(?P<unit>{_alternation(UNITS)})s?\b)"
+)
+
+# Start of "<amount> [pack size] <unit>" phrases; zero-width so adjacent
+# phrases are all found
+QUANTITY_PHRASE_START = re.compile(
+    r"(?=\b[\dhq" + _first_chars(WORD_NUMBERS) + "])"
+    r"(?=("
+    r"(?:\b\d+(?:\.\d+)?|\bone\b|\btwo\b|\bthree\b|\bfour\b|\bfive\b|\bsix\b|\bseven\b|\beight\b|\bnine\b|\bten\b|\bhalf\b|\bquarter\b|\bthree\s+quarters?)"
+    r"\s+(?:\d+[ -]?)?"  # optional numeric prefix for pack sizes like 24-pack
+    r"(?:bottles?|bottle|cans?|can|packs?|pack|cases?|case|kegs?|keg|barrels?|bbls?|ounces?|ounce|oz)"
+    r"))",
+    re.IGNORECASE,
+)
+
+
+def hint_pattern(words: Iterable[str]) -> Pattern[str]:
+    """Pattern matching any digit or any of ``words`` anywhere in a line."""
+
+    return re.compile(r"\d|" + _alternation(words))
+
+
+def scan_quantities(text_norm: str) -> List[QuantityToken]:
+    """All quantity tokens in an already-normalized line, left to right."""
+
+    tokens: List[QuantityToken] = []
+    for m in _GRAMMAR.finditer(text_norm):
+        kind = m.lastgroup
+        if kind == "percent" or kind == "percent_word":
+            tokens.append(QuantityToken("percent", float(m.group(kind)) / 100.0, "percent", None, m.span()))
+        elif kind == "pack_size":
+            size = PACK_SIZES[m.group("pack_size")]
+            tokens.append(QuantityToken("pack", float(m.group("pack_count")), "pack", size, m.span()))
+        elif kind == "number":
+            tokens.append(QuantityToken("number", float(m.group(kind)), None, None, m.span()))
+        elif kind == "fraction":
+            word = m.group(kind)
+            tokens.append(QuantityToken("fraction", FRACTION_WORDS[word], None, None, m.span()))
+        elif kind == "word":
+            tokens.append(QuantityToken("word", float(WORD_NUMBERS[m.group(kind)]), None, None, m.span()))
+        else:
+            tokens.append(QuantityToken("unit", None, m.group("unit"), None, m.span()))
+    return tokens
+
+
+_FRACTION_RANK = {word: rank for rank, word in enumerate(FRACTION_WORDS)}
+
+
+def resolve_quantity(
+    tokens: List[QuantityToken], text_norm: str, fraction_words: Optional[dict] = None
+) -> Optional[float]:
+    """Pick the quantity a line refers to from its scanned tokens.
+
+    Precedence: a percent anywhere, then a fraction word anywhere, then a
+    leading pack count ("4 six packs") or number, then ``fraction_words`` from
+    the catalog rules, then a leading word number.
+    """
+
+    fraction = None
+    for tok in tokens:
+        if tok.kind == "percent":
+            return tok.value
+        if tok.kind == "fraction":
+            word = text_norm[tok.span[0] : tok.span[1]]
+            if fraction is None or _FRACTION_RANK[word] < fraction[0]:
+                fraction = (_FRACTION_RANK[word], tok.value)
+    if fraction is not None:
+        return fraction[1]
+
+    lead = tokens[0] if tokens and tokens[0].span[0] == 0 else None
+    if lead is not None and lead.kind == "pack":
+        return lead.value * lead.pack_size
+    if lead is not None and lead.kind == "number":
+        return lead.value
+
+    for word, value in (fraction_words or {}).items():
+        if word in text_norm:
+            return value
+
+    if lead is not None and lead.kind == "word":
+        return lead.value
+    return None
@@ -6,6 +6,7 @@ import re
 from typing import List
 
 from .normalizer import normalize_text
+from .quantity import QUANTITY_PHRASE_START, hint_pattern
 
 
 QUANTITY_TOKENS = {
@@ -42,27 +43,21 @@ QUANTITY_TOKENS = {
 }
 
 
+_QUANTITY_HINT = hint_pattern(QUANTITY_TOKENS)
+_AND_SPLIT = re.compile(r"\s+(?:and|&)\s+")
+_COMMA_SPLIT = re.compile(r",\s*")
+_LEADING_CONNECTOR = re.compile(r"^(?:and|&)\s+", re.IGNORECASE)
+_TRAILING_CONNECTORS = re.compile(r"(?:\s+(?:and|&))+\s*$", re.IGNORECASE)
+
+
 def _looks_like_quantity(segment: str) -> bool:
-    seg = normalize_text(segment)
-    if re.search(r"\d", seg):
-        return True
-    for tok in QUANTITY_TOKENS:
-        if tok in seg:
-            return True
-    return False
+    return _QUANTITY_HINT.search(normalize_text(segment)) is not None
 
 
 def _split_on_quantity_tokens(line: str) -> List[str]:
     """Split when multiple quantity phrases appear in one line (handles hyphenated pack/case)."""
 
-    quantity_pattern = (
-        r"(?=("  # positive lookahead start
-        r"(?:\b\d+(?:\.\d+)?|\bone\b|\btwo\b|\bthree\b|\bfour\b|\bfive\b|\bsix\b|\bseven\b|\beight\b|\bnine\b|\bten\b|\bhalf\b|\bquarter\b|\bthree\s+quarters?)"
-        r"\s+(?:\d+[ -]?)?"  # optional numeric prefix for pack sizes like 24-pack
-        r"(?:bottles?|bottle|cans?|can|packs?|pack|cases?|case|kegs?|keg|barrels?|bbls?|ounces?|ounce|oz)"  # unit
-        r"))"
-    )
-    matches = [m.start() for m in re.finditer(quantity_pattern, line, flags=re.IGNORECASE)]
+    matches = [m.start() for m in QUANTITY_PHRASE_START.finditer(line)]
     if len(matches) <= 1:
         return [line.strip()]
 
@@ -72,8 +67,8 @@ def _split_on_quantity_tokens(line: str) -> List[str]:
         chunk = line[start:end].strip(",;. ").strip()
         if chunk:
             # Drop leading connectors and trailing connectors like "and"/"&"
-            chunk = re.sub(r"^(?:and|&)\s+", "", chunk, flags=re.IGNORECASE).strip()
-            chunk = re.sub(r"(?:\s+(?:and|&))+\s*$", "", chunk, flags=re.IGNORECASE).strip()
+            chunk = _LEADING_CONNECTOR.sub("", chunk).strip()
+            chunk = _TRAILING_CONNECTORS.sub("", chunk).strip()
         if chunk:
             parts.append(chunk)
     return parts if parts else [line.strip()]
@@ -96,12 +91,12 @@ def split_line_into_segments(line: str) -> List[str]:
         return qty_chunks
 
     # Try ampersand / "and" separation when each part looks like a quantity phrase.
-    parts = re.split(r"\s+(?:and|&)\s+", line)
+    parts = _AND_SPLIT.split(line)
     if len(parts) > 1 and all(_looks_like_quantity(p) for p in parts):
         return [p.strip() for p in parts if p.strip()]
 
     # Try comma separation with the same guard.
-    comma_parts = [p.strip() for p in re.split(r",\s*", line) if p.strip()]
+    comma_parts = [p.strip() for p in _COMMA_SPLIT.split(line) if p.strip()]
     if len(comma_parts) > 1 and all(_looks_like_quantity(p) for p in comma_parts):
         return comma_parts
 
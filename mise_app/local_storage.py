@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from mise_app.storage_backend import get_storage_backend
 
@@ -37,6 +37,17 @@ class LocalApprovalStorage:
         path = self._get_approval_path(restaurant_id, period_id)
         self.backend.write_json(path, data)
 
+    def _update(self, restaurant_id: str, period_id: str, mutate: Callable[[List[Dict[str, Any]]], Any]):
+        """Apply mutate to the queue in place and save, retrying on concurrent writes.
+
+        mutate may return False to skip the write.
+        """
+        def apply(data):
+            return None if mutate(data) is False else data
+
+        path = self._get_approval_path(restaurant_id, period_id)
+        self.backend.update_json(path, apply, default=list)
+
     def add_shifty(
         self,
         period_id: str,
@@ -58,14 +69,12 @@ class LocalApprovalStorage:
             detail_blocks: Calculation details from approval_json (for display)
             restaurant_id: Restaurant identifier for data isolation (default: papasurf)
         """
-        data = self._load(restaurant_id, period_id)
-        start_idx = len(data)
-
         # Serialize detail_blocks as JSON string for storage
         detail_blocks_json = json.dumps(detail_blocks) if detail_blocks else ""
+        new_rows = []
 
         for i, row in enumerate(rows):
-            data.append({
+            new_rows.append({
                 "id": f"{filename}_{i}",
                 "Date": row.get("date", ""),
                 "Shift": row.get("shift", ""),
@@ -80,7 +89,14 @@ class LocalApprovalStorage:
                 "created_at": datetime.now().isoformat(),
             })
 
-        self._save(restaurant_id, period_id, data)
+        start_idx = 0
+
+        def append(data):
+            nonlocal start_idx
+            start_idx = len(data)
+            data.extend(new_rows)
+
+        self._update(restaurant_id, period_id, append)
         log.info(f"[{restaurant_id}] Added {len(rows)} rows for {filename} in period {period_id}")
         return start_idx
 
@@ -91,13 +107,18 @@ class LocalApprovalStorage:
 
     def delete_by_filename(self, period_id: str, filename: str, restaurant_id: str = DEFAULT_RESTAURANT_ID) -> int:
         """Delete all rows for a filename in a pay period (for re-recording)."""
-        data = self._load(restaurant_id, period_id)
-        original_count = len(data)
-        data = [r for r in data if r.get("Filename") != filename]
-        deleted_count = original_count - len(data)
+        deleted_count = 0
+
+        def remove(data):
+            nonlocal deleted_count
+            kept = [r for r in data if r.get("Filename") != filename]
+            deleted_count = len(data) - len(kept)
+            if not deleted_count:
+                return False
+            data[:] = kept
 
+        self._update(restaurant_id, period_id, remove)
         if deleted_count > 0:
-            self._save(restaurant_id, period_id, data)
             log.info(f"[{restaurant_id}] Deleted {deleted_count} rows for {filename} in period {period_id}")
 
         return deleted_count
@@ -115,12 +136,13 @@ class LocalApprovalStorage:
 
     def approve_all(self, period_id: str, filename: str, restaurant_id: str = DEFAULT_RESTAURANT_ID):
         """Approve all rows for a filename in a pay period."""
-        data = self._load(restaurant_id, period_id)
-        for row in data:
-            if row.get("Filename") == filename:
-                row["Status"] = "Approved"
-                row["approved_at"] = datetime.now().isoformat()
-        self._save(restaurant_id, period_id, data)
+        def approve(data):
+            for row in data:
+                if row.get("Filename") == filename:
+                    row["Status"] = "Approved"
+                    row["approved_at"] = datetime.now().isoformat()
+
+        self._update(restaurant_id, period_id, approve)
         log.info(f"[{restaurant_id}] Approved all rows for {filename} in period {period_id}")
 
     def get_approved_data(self, period_id: str, filename: str, restaurant_id: str = DEFAULT_RESTAURANT_ID) -> List[Dict[str, Any]]:
@@ -129,12 +151,13 @@ class LocalApprovalStorage:
 
     def update_row(self, period_id: str, row_id: str, updates: Dict[str, Any], restaurant_id: str = DEFAULT_RESTAURANT_ID):
         """Update a specific row in a pay period."""
-        data = self._load(restaurant_id, period_id)
-        for row in data:
-            if row.get("id") == row_id:
-                row.update(updates)
-                break
-        self._save(restaurant_id, period_id, data)
+        def update(data):
+            for row in data:
+                if row.get("id") == row_id:
+                    row.update(updates)
+                    break
+
+        self._update(restaurant_id, period_id, update)
 
     def get_all(self, period_id: str, restaurant_id: str = DEFAULT_RESTAURANT_ID) -> List[Dict[str, Any]]:
         """Get all rows for a pay period."""
@@ -172,15 +195,21 @@ class LocalTotalsStorage:
         path = self._get_totals_path(restaurant_id, period_id)
         self.backend.write_json(path, data)
 
+    def _update(self, restaurant_id: str, period_id: str, mutate: Callable[[Dict[str, Dict[str, float]]], Any]):
+        """Apply mutate to the totals in place and save, retrying on concurrent writes."""
+        def apply(data):
+            mutate(data)
+            return data
+
+        path = self._get_totals_path(restaurant_id, period_id)
+        self.backend.update_json(path, apply, default=dict)
+
     def add_shift_amount(self, period_id: str, employee: str, shift_code: str, amount: float, restaurant_id: str = DEFAULT_RESTAURANT_ID):
         """Add/update amount for employee's shift in a pay period."""
-        data = self._load(restaurant_id, period_id)
-
-        if employee not in data:
-            data[employee] = {}
+        def set_amount(data):
+            data.setdefault(employee, {})[shift_code] = amount
 
-        data[employee][shift_code] = amount
-        self._save(restaurant_id, period_id, data)
+        self._update(restaurant_id, period_id, set_amount)
         log.info(f"[{restaurant_id}] Updated {employee} {shift_code} = ${amount:.2f} in period {period_id}")
 
     def get_employee_total(self, period_id: str, employee: str, restaurant_id: str = DEFAULT_RESTAURANT_ID) -> float:
@@ -212,11 +241,11 @@ class LocalTotalsStorage:
 
     def clear_shifty(self, period_id: str, shifty_code: str, restaurant_id: str = DEFAULT_RESTAURANT_ID):
         """Clear a specific shifty from all employees' totals."""
-        data = self._load(restaurant_id, period_id)
-        for employee in data:
-            if shifty_code in data[employee]:
-                del data[employee][shifty_code]
-        self._save(restaurant_id, period_id, data)
+        def clear_code(data):
+            for employee in data:
+                data[employee].pop(shifty_code, None)
+
+        self._update(restaurant_id, period_id, clear_code)
         log.info(f"[{restaurant_id}] Cleared {shifty_code} from all employees in period {period_id}")
 
     def clear(self, period_id: str, restaurant_id: str = DEFAULT_RESTAURANT_ID):
@@ -17,6 +17,7 @@ from __future__ import annotations
 import logging
 import os
 import sys
+from contextlib import asynccontextmanager
 
 # Set environment based on Cloud Run detection
 if os.getenv("K_SERVICE"):  # Running on Cloud Run
@@ -55,11 +56,21 @@ log = logging.getLogger(__name__)
 config = ShiftyConfig.from_env()
 log.info(f"🔧 LOADED CONFIG - TRANSROUTER_URL: {config.transrouter_url}")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the ASR provider used by the in-process agents before serving."""
+    from transrouter.src.asr_adapter import warm_asr_provider
+
+    warm_asr_provider()
+    yield
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Mise",
     description="Restaurant operations platform",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware for cross-origin requests
@@ -269,7 +280,9 @@ async def legacy_period_path(period_id: str, rest: str):
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "ok", "app": "mise"}
+    from transrouter.src.asr_adapter import asr_status
+
+    return {"status": "ok", "app": "mise", "asr": asr_status()}
 
 
 if __name__ == "__main__":
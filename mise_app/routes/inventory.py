@@ -15,6 +15,7 @@ from uuid import uuid4
 
 import requests
 from fastapi import APIRouter, File, Form, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 
 from mise_app.shelfy_storage import (
@@ -290,7 +291,12 @@ def _process_inventory_background(
         # Check file size: use direct processing for files >32MB
         FILE_SIZE_LIMIT = 32 * 1024 * 1024  # 32MB
 
-        if len(audio_bytes) > FILE_SIZE_LIMIT:
+        # Long recordings go through the agent only when the ASR adapter can
+        # split them into bounded chunks (chunking enabled and ffmpeg present);
+        # otherwise one request would exceed the provider's limit.
+        from transrouter.src.asr_adapter import asr_chunks_long_audio
+
+        if len(audio_bytes) > FILE_SIZE_LIMIT and not asr_chunks_long_audio():
             log.info(f"[{job_id}] Large file ({len(audio_bytes):,} bytes), using direct processing")
 
             # Use direct Google Speech-to-Text + Claude API
@@ -309,7 +315,7 @@ def _process_inventory_background(
             inventory_json = result.get("approval_json", {})
 
         else:
-            log.info(f"[{job_id}] Small file ({len(audio_bytes):,} bytes), using agent service")
+            log.info(f"[{job_id}] File ({len(audio_bytes):,} bytes), using agent service")
 
             # Process through inventory agent directly (bypasses transrouter HTTP)
             from transrouter.src.agents.inventory_agent import get_agent as get_inventory_agent
@@ -549,7 +555,9 @@ async def record_shelfy(
     # Call inventory agent directly (bypasses transrouter HTTP)
     try:
         from transrouter.src.agents.inventory_agent import get_agent as get_inventory_agent
-        result = get_inventory_agent().process_audio(audio_bytes, category=category, area=area)
+        result = await run_in_threadpool(
+            get_inventory_agent().process_audio, audio_bytes, category=category, area=area
+        )
     except Exception as e:
         log.error(f"🗄️ Agent service error: {e}")
         return JSONResponse(
@@ -914,7 +922,7 @@ async def inventory_landing_page(request: Request):
 
     # Check if any shelfies exist for current period
     period_id = get_current_period_id_html()
-    shelfies = storage.get_all_shelfies(period_id)
+    shelfies = storage.list_shelfies(period_id)
     has_shelfies = len(shelfies) > 0
 
     context = get_template_context(request)
@@ -1065,7 +1073,7 @@ async def inventory_totals_page(request: Request, period_id: str):
     storage = get_shelfy_storage()
 
     # Get shelfies for this period
-    shelfies = storage.get_all_shelfies(period_id)
+    shelfies = storage.list_shelfies(period_id)
 
     # Add display timestamps
     for s in shelfies:
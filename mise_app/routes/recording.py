@@ -11,6 +11,7 @@ from typing import Optional
 
 import requests
 from fastapi import APIRouter, File, Form, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 
 from mise_app.config import SHIFTY_DEFINITIONS, get_shifty_by_code, PayPeriod
@@ -343,7 +344,7 @@ async def process_audio(
     log.info(f"Calling payroll agent directly for period {period_id}")
     try:
         from transrouter.src.agents.payroll_agent import get_agent as get_payroll_agent
-        result = get_payroll_agent().process_audio(audio_bytes)
+        result = await get_payroll_agent().process_audio_async(audio_bytes)
         log.info(f"Agent result status: {result.get('status')}")
     except Exception as e:
         log.error(f"Agent service error: {e}")
@@ -488,7 +489,7 @@ async def process_shifty(
     # Call payroll agent directly (bypasses transrouter HTTP)
     try:
         from transrouter.src.agents.payroll_agent import get_agent as get_payroll_agent
-        result = get_payroll_agent().process_audio(audio_bytes, shift_code=shifty_code)
+        result = await get_payroll_agent().process_audio_async(audio_bytes, shift_code=shifty_code)
     except Exception as e:
         log.error(f"Agent service error: {e}")
         return JSONResponse(
@@ -907,7 +908,8 @@ async def submit_clarification(
 
         # Call payroll agent directly with clarifications (bypasses transrouter HTTP)
         from transrouter.src.agents.payroll_agent import get_agent as get_payroll_agent
-        result = get_payroll_agent().process_with_clarification_dict(
+        result = await run_in_threadpool(
+            get_payroll_agent().process_with_clarification_dict,
             transcript=transcript,
             pay_period_hint=pay_period_hint,
             shift_code=shift_code,
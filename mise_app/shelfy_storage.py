@@ -5,15 +5,20 @@ Uses Google Cloud Storage for persistent inventory data across container restart
 
 from __future__ import annotations
 
+import bisect
 import json
 import logging
 from datetime import datetime, date
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import calendar
 import os
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from google.cloud import storage
 
+from mise_app.storage_backend import WriteConflict, update_with_retry
+
 log = logging.getLogger(__name__)
 
 # GCS bucket for inventory data
@@ -123,10 +128,188 @@ def get_audio_archive_path(period_id: str, category: str, area: str, ext: str =
     return f"recordings/{period_id}/{category_cap}_{area_clean}_{timestamp}{ext}"
 
 
+# Manifest fields kept per shelfy (everything except transcript/inventory_json)
+INDEX_FIELDS = (
+    "shelfy_id",
+    "area",
+    "category",
+    "period_id",
+    "audio_path",
+    "status",
+    "recorded_at",
+    "created_at",
+    "approved_at",
+    "updated_at",
+)
+
+# Parallel downloads when a caller needs many full shelfy records
+FETCH_WORKERS = 16
+
+
+def _index_entry(shelfy: Dict[str, Any]) -> Dict[str, Any]:
+    """Manifest entry for a shelfy: its small fields plus an item count."""
+    entry = {k: shelfy[k] for k in INDEX_FIELDS if k in shelfy}
+    items = (shelfy.get("inventory_json") or {}).get("items") or []
+    entry["item_count"] = len(items)
+    return entry
+
+
+# ----------------------------------------------------------------------
+# Period totals aggregate
+#
+# periods/{period_id}/totals.json holds every approved shelfy's per-item
+# contribution, grouped by product, for all categories and per category:
+#
+#   {"shelfies": {shelfy_id: {"area", "category", "order", "keys"}},
+#    "all": {product_key: {"total_quantity", "contributions": [...]}},
+#    "by_category": {category: {product_key: {...}}}}
+#
+# Contributions are kept in shelfy recording order (then item order), so the
+# rendered totals match summing the approved shelfies one by one: the first
+# contribution supplies the product's name, unit and category, and totals are
+# re-summed in that order when a shelfy is added or removed.
+# ----------------------------------------------------------------------
+
+
+def _empty_aggregate() -> Dict[str, Any]:
+    return {"shelfies": {}, "all": {}, "by_category": {}}
+
+
+def _aggregate_tables(agg: Dict[str, Any], category: Optional[str]) -> List[Dict[str, Any]]:
+    tables = [agg["all"]]
+    if category:
+        tables.append(agg["by_category"].setdefault(category, {}))
+    return tables
+
+
+def _remove_from_aggregate(agg: Dict[str, Any], shelfy_id: str):
+    """Subtract a shelfy's contribution (no-op if it has none)."""
+    info = agg["shelfies"].pop(shelfy_id, None)
+    if info is None:
+        return
+    for table in _aggregate_tables(agg, info["category"]):
+        for key in info["keys"]:
+            product = table.get(key)
+            if product is None:
+                continue
+            kept = [c for c in product["contributions"] if c["shelfy_id"] != shelfy_id]
+            if kept:
+                product["contributions"] = kept
+                product["total_quantity"] = _sum_contributions(kept)
+            else:
+                del table[key]
+    if info["category"] and not agg["by_category"].get(info["category"]):
+        agg["by_category"].pop(info["category"], None)
+
+
+def _add_to_aggregate(agg: Dict[str, Any], shelfy: Dict[str, Any]):
+    """Add an approved shelfy's items to the aggregate (replacing any previous contribution)."""
+    shelfy_id = shelfy.get("shelfy_id", "")
+    _remove_from_aggregate(agg, shelfy_id)
+
+    items = (shelfy.get("inventory_json") or {}).get("items")
+    if shelfy.get("status") != "approved" or not items:
+        return
+
+    order = [shelfy.get("recorded_at") or shelfy.get("created_at") or "", shelfy_id]
+    category = shelfy.get("category")
+    info = agg["shelfies"][shelfy_id] = {
+        "area": shelfy.get("area", "Unknown"),
+        "category": category,
+        "order": order,
+        "keys": [],
+    }
+    orders = {sid: s["order"] for sid, s in agg["shelfies"].items()}
+
+    for item in items:
+        product_name = (item.get("product_name") or "").strip()
+        if not product_name:
+            continue
+        quantity = item.get("quantity")
+        contribution = {
+            "shelfy_id": shelfy_id,
+            "product_name": product_name,
+            # Converted quantity/base unit when available (e.g. "6 4-packs" -> 24 cans)
+            "quantity": item.get("converted_quantity", quantity),
+            "unit": item.get("base_unit", item.get("unit", "")),
+        }
+        key = product_name.lower()
+        if key not in info["keys"]:
+            info["keys"].append(key)
+
+        for table in _aggregate_tables(agg, category):
+            product = table.setdefault(key, {"total_quantity": 0, "contributions": []})
+            contributions = product["contributions"]
+            # After every contribution from earlier-or-same shelfies
+            pos = bisect.bisect_right([orders[c["shelfy_id"]] for c in contributions], order)
+            contributions.insert(pos, contribution)
+            product["total_quantity"] = _sum_contributions(contributions)
+
+
+def _sum_contributions(contributions: List[Dict[str, Any]]):
+    total = 0
+    for c in contributions:
+        # Null quantities name the product but don't count toward it
+        if c["quantity"] is not None:
+            total += c["quantity"]
+    return total
+
+
+def _build_aggregate(shelfies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    agg = _empty_aggregate()
+    for shelfy in shelfies:
+        _add_to_aggregate(agg, shelfy)
+    return agg
+
+
+def _render_totals(agg: Dict[str, Any], category: Optional[str]) -> Dict[str, Any]:
+    """get_aggregated_totals() result from the stored aggregate."""
+    table = agg["by_category"].get(category, {}) if category else agg["all"]
+    shelfies = agg["shelfies"]
+
+    items = []
+    for product in table.values():
+        contributions = product["contributions"]
+        first = contributions[0]
+        first_category = shelfies[first["shelfy_id"]]["category"]
+        items.append({
+            "product_name": first["product_name"],  # Original casing from first occurrence
+            "total_quantity": product["total_quantity"],
+            "unit": first["unit"],
+            "category": first_category if first_category is not None else "unknown",
+            "breakdown": [
+                {"area": shelfies[c["shelfy_id"]]["area"], "quantity": c["quantity"], "shelfy_id": c["shelfy_id"]}
+                for c in contributions
+                if c["quantity"] is not None
+            ],
+        })
+    items.sort(key=lambda x: x["product_name"])
+
+    counted = [s for s in shelfies.values() if not category or s["category"] == category]
+    return {
+        "items": items,
+        "shelfies_count": len(counted),
+        "areas_covered": sorted({s["area"] for s in counted}),
+    }
+
+
 class ShelfyStorage:
     """GCS-based JSON storage for shelfies, isolated by inventory period.
 
-    Data is stored in GCS at: gs://{PROJECT_ID}_inventory/periods/{period_id}/shelfies.json
+    Each shelfy is its own object, with a small per-period manifest listing
+    them (in recording order) without transcripts or inventory JSON:
+
+        gs://{PROJECT_ID}_inventory/periods/{period_id}/index.json
+        gs://{PROJECT_ID}_inventory/periods/{period_id}/shelfies/{shelfy_id}.json
+
+    Single-shelfy reads and writes touch one object (plus the manifest when
+    a listed field changes); summaries and listings read only the manifest.
+    Periods still in the old single-blob layout (periods/{period_id}/shelfies.json)
+    are migrated the first time their manifest is needed.
+
+    Every read-modify-write is conditional on the object generation that was
+    read, and re-applied to fresh data if another request or instance wrote
+    in between, so concurrent adds and approvals don't overwrite each other.
     """
 
     def __init__(self, bucket_name: str = INVENTORY_BUCKET):
@@ -162,42 +345,213 @@ class ShelfyStorage:
                 raise
         return self._bucket
 
+    # ------------------------------------------------------------------
+    # Object layout
+    # ------------------------------------------------------------------
+
     def _get_shelfy_blob_path(self, period_id: str) -> str:
-        """Get the GCS blob path for a period's shelfies.
+        """Get the legacy single-blob path for a period's shelfies.
 
         Format: periods/{period_id}/shelfies.json
         """
         return f"periods/{period_id}/shelfies.json"
 
-    def _load(self, period_id: str) -> List[Dict[str, Any]]:
-        """Load all shelfies for a period from GCS."""
-        blob_path = self._get_shelfy_blob_path(period_id)
-        blob = self.bucket.blob(blob_path)
+    def _index_path(self, period_id: str) -> str:
+        return f"periods/{period_id}/index.json"
 
-        if not blob.exists():
-            log.debug(f"📭 No shelfies found for period {period_id} (blob doesn't exist)")
-            return []
+    def _totals_path(self, period_id: str) -> str:
+        return f"periods/{period_id}/totals.json"
+
+    def _shelfy_path(self, period_id: str, shelfy_id: str) -> str:
+        return f"periods/{period_id}/shelfies/{shelfy_id}.json"
 
+    def _read_json_versioned(self, blob_path: str) -> Tuple[Optional[Any], int]:
+        """Download and parse a JSON object with its generation; (None, 0) if missing."""
+        blob = self.bucket.blob(blob_path)
         try:
             content = blob.download_as_text()
-            data = json.loads(content)
-            log.debug(f"📥 Loaded {len(data)} shelfies from GCS for period {period_id}")
-            return data
-        except (json.JSONDecodeError, Exception) as e:
-            log.error(f"Failed to load shelfies from GCS: {e}")
-            return []
+        except NotFound:
+            return None, 0
+        return json.loads(content), int(blob.generation)
+
+    def _read_json(self, blob_path: str) -> Optional[Any]:
+        """Download and parse a JSON object; None if it doesn't exist."""
+        try:
+            return self._read_json_versioned(blob_path)[0]
+        except json.JSONDecodeError as e:
+            log.error(f"Failed to parse {blob_path} from GCS: {e}")
+            return None
 
-    def _save(self, period_id: str, data: List[Dict[str, Any]]):
-        """Save shelfies for a period to GCS."""
-        blob_path = self._get_shelfy_blob_path(period_id)
+    def _write_json(self, blob_path: str, data: Any, if_version: Optional[int] = None):
+        """Upload a JSON object, only if still at generation if_version (0 = new) when given."""
         blob = self.bucket.blob(blob_path)
+        try:
+            blob.upload_from_string(
+                json.dumps(data, indent=2),
+                content_type="application/json",
+                if_generation_match=if_version,
+            )
+        except PreconditionFailed as e:
+            raise WriteConflict(f"{blob_path} changed since it was read") from e
+
+    def _update_json(self, blob_path: str, mutate: Callable[[Any], Any], default: Any = None) -> Any:
+        """Conditional read-modify-write with bounded retries (see update_with_retry)."""
+        return update_with_retry(self._read_json_versioned, self._write_json, blob_path, mutate, default)
+
+    def _delete_blob(self, blob_path: str) -> bool:
+        try:
+            self.bucket.blob(blob_path).delete()
+        except NotFound:
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _load_index(self, period_id: str) -> List[Dict[str, Any]]:
+        """Manifest entries for a period, migrating a legacy blob if needed."""
+        index = self._read_json(self._index_path(period_id))
+        if index is not None:
+            return index.get("shelfies", [])
+        return self._migrate_legacy(period_id)
+
+    def _update_index(self, period_id: str, mutate: Callable[[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]):
+        """Apply mutate to the manifest entries, retrying on concurrent writes.
+
+        mutate returns the new entries, or None to leave the manifest as is.
+        """
+        def apply(index):
+            if index is None:
+                # New period, or one still in the legacy layout; a migration
+                # makes the write below conflict, so the retry sees its manifest
+                current = self._migrate_legacy(period_id)
+            else:
+                current = index.get("shelfies", [])
+            entries = mutate(list(current))
+            return None if entries is None else {"shelfies": entries}
+
+        index = self._update_json(self._index_path(period_id), apply) or {}
+        log.debug(f"💾 Saved index of {len(index.get('shelfies', []))} shelfies for period {period_id}")
+
+    def _sync_index_entry(self, period_id: str, shelfy_id: str):
+        """Refresh a shelfy's manifest entry from its stored object.
+
+        The object is re-read on every attempt, so whichever request writes the
+        manifest last records the latest object state.
+        """
+        def refresh(entries):
+            shelfy = self._read_json(self._shelfy_path(period_id, shelfy_id))
+            if shelfy is None:
+                return None
+            return [_index_entry(shelfy) if e.get("shelfy_id") == shelfy_id else e for e in entries]
+
+        self._update_index(period_id, refresh)
+
+    def _update_shelfy(self, period_id: str, shelfy_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply field changes to one shelfy object and its manifest entry.
+
+        Returns the updated shelfy, or None if it doesn't exist.
+        """
+        def apply(shelfy):
+            if shelfy is None:
+                # Deleted, or its period is still in the legacy layout
+                shelfy = self._load_shelfy(period_id, shelfy_id)
+                if shelfy is None:
+                    return None
+            shelfy.update(changes)
+            return shelfy
+
+        shelfy = self._update_json(self._shelfy_path(period_id, shelfy_id), apply)
+        if shelfy is None:
+            return None
+        self._sync_index_entry(period_id, shelfy_id)
+        self._sync_aggregate(period_id, shelfy_id)
+        return shelfy
+
+    def _migrate_legacy(self, period_id: str) -> List[Dict[str, Any]]:
+        """Split a legacy shelfies.json blob into per-shelfy objects + manifest."""
+        legacy = self._read_json(self._get_shelfy_blob_path(period_id))
+        if not legacy:
+            log.debug(f"📭 No shelfies found for period {period_id}")
+            return []
+
+        for shelfy in legacy:
+            try:
+                self._write_json(self._shelfy_path(period_id, shelfy["shelfy_id"]), shelfy, if_version=0)
+            except WriteConflict:
+                pass  # already migrated, and maybe changed since
+        entries = [_index_entry(shelfy) for shelfy in legacy]
+        try:
+            self._write_json(self._index_path(period_id), {"shelfies": entries}, if_version=0)
+        except WriteConflict:
+            # Another request migrated (and maybe already changed) the period
+            return (self._read_json(self._index_path(period_id)) or {}).get("shelfies", [])
+        log.info(f"🗄️ Migrated {len(entries)} shelfies for period {period_id} to per-shelfy objects")
+        return entries
+
+    # ------------------------------------------------------------------
+    # Totals aggregate
+    # ------------------------------------------------------------------
+
+    def _build_period_aggregate(self, period_id: str) -> Dict[str, Any]:
+        entries = [
+            e for e in self._load_index(period_id)
+            if e.get("status") == "approved" and e.get("item_count")
+        ]
+        return _build_aggregate(self._load_shelfies(period_id, entries))
+
+    def _sync_aggregate(self, period_id: str, shelfy_id: str):
+        """Re-apply one shelfy's contribution to the stored totals.
 
-        content = json.dumps(data, indent=2)
-        blob.upload_from_string(
-            content,
-            content_type="application/json"
+        The shelfy is re-read on every attempt (see _sync_index_entry). A
+        period without a stored aggregate gets a full build instead.
+        """
+        def apply(agg):
+            if agg is None:
+                return self._build_period_aggregate(period_id)
+            shelfy = self._read_json(self._shelfy_path(period_id, shelfy_id))
+            if shelfy is None:
+                _remove_from_aggregate(agg, shelfy_id)
+            else:
+                _add_to_aggregate(agg, shelfy)
+            return agg
+
+        self._update_json(self._totals_path(period_id), apply)
+
+    def _load_aggregate(self, period_id: str) -> Dict[str, Any]:
+        """Stored totals for a period, built and saved on first use."""
+        return self._update_json(
+            self._totals_path(period_id),
+            lambda agg: self._build_period_aggregate(period_id) if agg is None else None,
         )
-        log.debug(f"💾 Saved {len(data)} shelfies to GCS for period {period_id}")
+
+    def rebuild_aggregate(self, period_id: str) -> Dict[str, Any]:
+        """Recompute and save a period's totals from its shelfies (for repair)."""
+        agg = self._update_json(self._totals_path(period_id), lambda _: self._build_period_aggregate(period_id))
+        log.info(f"🗄️ Rebuilt totals for period {period_id} ({len(agg['shelfies'])} approved shelfies)")
+        return agg
+
+    def _load_shelfy(self, period_id: str, shelfy_id: str) -> Optional[Dict[str, Any]]:
+        shelfy = self._read_json(self._shelfy_path(period_id, shelfy_id))
+        if shelfy is None and self._read_json(self._index_path(period_id)) is None:
+            # Period may still be in the legacy layout
+            if any(e.get("shelfy_id") == shelfy_id for e in self._migrate_legacy(period_id)):
+                shelfy = self._read_json(self._shelfy_path(period_id, shelfy_id))
+        return shelfy
+
+    def _load_shelfies(self, period_id: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Full records for manifest entries, downloaded in parallel, in order."""
+        if not entries:
+            return []
+        paths = [self._shelfy_path(period_id, e["shelfy_id"]) for e in entries]
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(paths))) as pool:
+            shelfies = list(pool.map(self._read_json, paths))
+        return [s for s in shelfies if s is not None]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
 
     def add_shelfy(
         self,
@@ -213,7 +567,6 @@ class ShelfyStorage:
 
         Returns the created shelfy dict.
         """
-        data = self._load(period_id)
         now = datetime.now()
 
         shelfy = {
@@ -232,53 +585,60 @@ class ShelfyStorage:
         if inventory_json:
             shelfy["inventory_json"] = inventory_json
 
-        data.append(shelfy)
-        self._save(period_id, data)
+        self._write_json(self._shelfy_path(period_id, shelfy_id), shelfy)
+        entry = _index_entry(shelfy)
+        self._update_index(
+            period_id,
+            lambda entries: [e for e in entries if e.get("shelfy_id") != shelfy_id] + [entry],
+        )
         log.info(f"🗄️ Added shelfy {shelfy_id} for {area} ({category}) in period {period_id}")
 
         return shelfy
 
     def get_shelfy(self, period_id: str, shelfy_id: str) -> Optional[Dict[str, Any]]:
         """Get a single shelfy by ID."""
-        data = self._load(period_id)
-        for shelfy in data:
-            if shelfy.get("shelfy_id") == shelfy_id:
-                return shelfy
-        return None
+        return self._load_shelfy(period_id, shelfy_id)
+
+    def list_shelfies(self, period_id: str) -> List[Dict[str, Any]]:
+        """Manifest entries for a period (no transcript or inventory_json)."""
+        return self._load_index(period_id)
 
     def get_all_shelfies(self, period_id: str) -> List[Dict[str, Any]]:
-        """Get all shelfies for a period."""
-        return self._load(period_id)
+        """Get all shelfies for a period (full records)."""
+        return self._load_shelfies(period_id, self._load_index(period_id))
 
     def approve_shelfy(self, period_id: str, shelfy_id: str) -> bool:
         """Mark a shelfy as approved.
 
         Returns True if found and updated, False otherwise.
         """
-        data = self._load(period_id)
-        for shelfy in data:
-            if shelfy.get("shelfy_id") == shelfy_id:
-                shelfy["status"] = "approved"
-                shelfy["approved_at"] = datetime.now().isoformat()
-                self._save(period_id, data)
-                log.info(f"🗄️ Approved shelfy {shelfy_id} in period {period_id}")
-                return True
-        return False
+        changes = {"status": "approved", "approved_at": datetime.now().isoformat()}
+        if self._update_shelfy(period_id, shelfy_id, changes) is None:
+            return False
+        log.info(f"🗄️ Approved shelfy {shelfy_id} in period {period_id}")
+        return True
 
     def delete_shelfy(self, period_id: str, shelfy_id: str) -> bool:
         """Delete a shelfy (for re-recording).
 
         Returns True if found and deleted, False otherwise.
         """
-        data = self._load(period_id)
-        original_len = len(data)
-        data = [s for s in data if s.get("shelfy_id") != shelfy_id]
+        found = False
+
+        def remove(entries):
+            nonlocal found
+            remaining = [e for e in entries if e.get("shelfy_id") != shelfy_id]
+            found = len(remaining) != len(entries)
+            return remaining if found else None
+
+        self._update_index(period_id, remove)
+        if not found:
+            return False
 
-        if len(data) < original_len:
-            self._save(period_id, data)
-            log.info(f"🗄️ Deleted shelfy {shelfy_id} from period {period_id}")
-            return True
-        return False
+        self._delete_blob(self._shelfy_path(period_id, shelfy_id))
+        self._sync_aggregate(period_id, shelfy_id)
+        log.info(f"🗄️ Deleted shelfy {shelfy_id} from period {period_id}")
+        return True
 
     def update_shelfy_inventory(self, period_id: str, shelfy_id: str, inventory_json: Dict[str, Any]) -> bool:
         """Update the inventory_json for a shelfy.
@@ -287,19 +647,15 @@ class ShelfyStorage:
 
         Returns True if found and updated, False otherwise.
         """
-        data = self._load(period_id)
-        for shelfy in data:
-            if shelfy.get("shelfy_id") == shelfy_id:
-                shelfy["inventory_json"] = inventory_json
-                shelfy["updated_at"] = datetime.now().isoformat()
-                self._save(period_id, data)
-                log.info(f"🗄️ Updated inventory_json for shelfy {shelfy_id}")
-                return True
-        return False
+        changes = {"inventory_json": inventory_json, "updated_at": datetime.now().isoformat()}
+        if self._update_shelfy(period_id, shelfy_id, changes) is None:
+            return False
+        log.info(f"🗄️ Updated inventory_json for shelfy {shelfy_id}")
+        return True
 
     def get_period_summary(self, period_id: str) -> Dict[str, Any]:
-        """Get summary stats for a period."""
-        data = self._load(period_id)
+        """Get summary stats for a period (reads only the manifest)."""
+        data = self._load_index(period_id)
 
         kitchen_count = len([s for s in data if s.get("category") == "kitchen"])
         bar_count = len([s for s in data if s.get("category") == "bar"])
@@ -321,6 +677,9 @@ class ShelfyStorage:
         Combines all approved shelfies and sums quantities by product name.
         Also tracks breakdown by shelfy/area for each product.
 
+        Reads the period's stored aggregate (one object), which approve,
+        update and delete keep current; use rebuild_aggregate() to repair it.
+
         Args:
             period_id: Period to aggregate
             category: Optional filter by category (kitchen/bar)
@@ -331,75 +690,7 @@ class ShelfyStorage:
             - shelfies_count: Number of shelfies aggregated
             - areas_covered: List of unique areas
         """
-        data = self._load(period_id)
-
-        # Filter to approved shelfies with inventory_json
-        approved = [
-            s for s in data
-            if s.get("status") == "approved"
-            and s.get("inventory_json")
-            and s["inventory_json"].get("items")
-        ]
-
-        # Filter by category if specified
-        if category:
-            approved = [s for s in approved if s.get("category") == category]
-
-        # Aggregate items by product name
-        product_totals = {}
-        areas_covered = set()
-
-        for shelfy in approved:
-            area = shelfy.get("area", "Unknown")
-            areas_covered.add(area)
-            shelfy_category = shelfy.get("category", "unknown")
-            shelfy_id = shelfy.get("shelfy_id", "")
-
-            for item in shelfy["inventory_json"]["items"]:
-                product_name = item.get("product_name", "").strip()
-                quantity = item.get("quantity")
-                unit = item.get("unit", "")
-
-                # Use converted_quantity if available (e.g., 24 cans), otherwise fallback to raw quantity
-                converted_quantity = item.get("converted_quantity", quantity)
-
-                # Use base_unit if available (e.g., "cans"), otherwise use original unit
-                base_unit = item.get("base_unit", unit)
-
-                if not product_name:
-                    continue
-
-                # Normalize product name (case-insensitive key)
-                key = product_name.lower()
-
-                if key not in product_totals:
-                    product_totals[key] = {
-                        "product_name": product_name,  # Keep original casing from first occurrence
-                        "total_quantity": 0,
-                        "unit": base_unit,  # Use base unit for final aggregated display
-                        "category": shelfy_category,
-                        "breakdown": [],  # Track contributions by shelfy/area
-                    }
-
-                # Sum converted quantity (skip if null)
-                # This ensures "6 4-packs" contributes 24 to the total, not 6
-                if converted_quantity is not None:
-                    product_totals[key]["total_quantity"] += converted_quantity
-                    # Track breakdown: which area contributed how much
-                    product_totals[key]["breakdown"].append({
-                        "area": area,
-                        "quantity": converted_quantity,
-                        "shelfy_id": shelfy_id,
-                    })
-
-        # Sort by product name
-        items = sorted(product_totals.values(), key=lambda x: x["product_name"])
-
-        return {
-            "items": items,
-            "shelfies_count": len(approved),
-            "areas_covered": sorted(areas_covered),
-        }
+        return _render_totals(self._load_aggregate(period_id), category)
 
 
 # Singleton
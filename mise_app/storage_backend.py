@@ -1,13 +1,37 @@
-"""Storage backend abstraction for local/cloud storage."""
+"""Storage backend abstraction for local/cloud storage.
+
+Every stored object has a version: the GCS object generation, or a content
+hash for local files; 0 means "does not exist". ``write_json`` accepts an
+``if_version`` precondition and raises ``WriteConflict`` when the object
+changed since it was read, so concurrent read-modify-write cycles (several
+requests or Cloud Run instances) cannot silently overwrite each other.
+``update_json`` wraps that in a bounded re-read/re-apply loop.
+"""
 from pathlib import Path
+import hashlib
 import json
 import os
+import random
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
 import logging
 
 log = logging.getLogger(__name__)
 
+# Attempts for update_json before giving up on a contended object
+MAX_WRITE_ATTEMPTS = 5
+
+
+class WriteConflict(Exception):
+    """A conditional write lost a race with another writer."""
+
+
+def conflict_backoff(attempt: int) -> None:
+    """Sleep a short, jittered, exponentially growing delay before a retry."""
+    time.sleep(random.uniform(0, 0.02 * (2 ** attempt)))
+
 
 class StorageBackend(ABC):
     """Abstract storage backend."""
@@ -17,20 +41,71 @@ class StorageBackend(ABC):
         pass
 
     @abstractmethod
-    def write_json(self, path: str, data: dict) -> None:
+    def read_json_versioned(self, path: str) -> Tuple[Optional[Any], int]:
+        """Return (data, version); (None, 0) if the object does not exist."""
         pass
 
     @abstractmethod
-    def exists(self, path: str) -> bool:
-        pass
+    def write_json(self, path: str, data: dict, if_version: Optional[int] = None) -> int:
+        """Write data and return its new version.
 
-    @abstractmethod
-    def list_dir(self, path: str) -> list[str]:
+        With ``if_version`` set, the write only happens if the stored object
+        is still at that version (0 = must not exist); otherwise raises
+        ``WriteConflict``.
+        """
         pass
 
-    @abstractmethod
-    def delete(self, path: str) -> bool:
-        pass
+    def update_json(
+        self,
+        path: str,
+        mutate: Callable[[Any], Any],
+        default: Any = None,
+        attempts: int = MAX_WRITE_ATTEMPTS,
+    ) -> Any:
+        """Read-modify-write ``path`` without losing concurrent updates.
+
+        See ``update_with_retry``.
+        """
+        return update_with_retry(
+            self.read_json_versioned, self.write_json, path, mutate, default, attempts
+        )
+
+
+def update_with_retry(
+    read_versioned: Callable[[str], Tuple[Optional[Any], int]],
+    write: Callable[..., Any],
+    path: str,
+    mutate: Callable[[Any], Any],
+    default: Any = None,
+    attempts: int = MAX_WRITE_ATTEMPTS,
+) -> Any:
+    """Compare-and-swap loop shared by the storage classes.
+
+    ``mutate`` receives the current data (``default``, or ``default()`` if
+    callable, when missing or unreadable) and returns the data to store, or
+    None to leave the object untouched. The write is conditional on the
+    version that was read; on a conflict ``mutate`` is re-applied to fresh
+    data, so it must be safe to call more than once. Returns the stored data
+    and raises ``WriteConflict`` once ``attempts`` are used up.
+    """
+    for attempt in range(attempts):
+        try:
+            data, version = read_versioned(path)
+        except ValueError as e:
+            log.warning(f"Unreadable {path}, rebuilding from default: {e}")
+            data, version = None, None
+        if data is None:
+            data = default() if callable(default) else default
+        new_data = mutate(data)
+        if new_data is None:
+            return data
+        try:
+            write(path, new_data, if_version=version)
+            return new_data
+        except WriteConflict:
+            log.info(f"Write conflict on {path} (attempt {attempt + 1}/{attempts}), retrying")
+            conflict_backoff(attempt)
+    raise WriteConflict(f"{path} kept changing; gave up after {attempts} attempts")
 
 
 class LocalStorage(StorageBackend):
@@ -38,17 +113,46 @@ class LocalStorage(StorageBackend):
 
     def __init__(self, base_dir: Path):
         self.base_dir = Path(base_dir)
+        # Serializes version check + write within this process
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def _version(content: bytes) -> int:
+        # Never 0, which means "missing"
+        return int.from_bytes(hashlib.blake2b(content, digest_size=8).digest(), "big") or 1
+
+    def _read_bytes(self, file_path: Path) -> Optional[bytes]:
+        try:
+            return file_path.read_bytes()
+        except FileNotFoundError:
+            return None
 
     def read_json(self, path: str) -> dict:
         file_path = self.base_dir / path
         with open(file_path) as f:
             return json.load(f)
 
-    def write_json(self, path: str, data: dict) -> None:
+    def read_json_versioned(self, path: str) -> Tuple[Optional[Any], int]:
+        content = self._read_bytes(self.base_dir / path)
+        if content is None:
+            return None, 0
+        return json.loads(content), self._version(content)
+
+    def write_json(self, path: str, data: dict, if_version: Optional[int] = None) -> int:
         file_path = self.base_dir / path
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        content = json.dumps(data, indent=2).encode()
+        with self._write_lock:
+            if if_version is not None:
+                current = self._read_bytes(file_path)
+                current_version = 0 if current is None else self._version(current)
+                if current_version != if_version:
+                    raise WriteConflict(f"{path} changed since it was read")
+            # Write-then-rename so readers never see a partial file
+            tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, file_path)
+        return self._version(content)
 
     def exists(self, path: str) -> bool:
         return (self.base_dir / path).exists()
@@ -72,6 +176,8 @@ class GCSStorage(StorageBackend):
 
     def __init__(self, bucket_name: str, base_prefix: str = ""):
         from google.cloud import storage
+        from google.api_core import exceptions as gcs_exceptions
+        self._gcs_exceptions = gcs_exceptions
         self.client = storage.Client()
         self.bucket = self.client.bucket(bucket_name)
         self.base_prefix = base_prefix.rstrip("/")
@@ -86,12 +192,26 @@ class GCSStorage(StorageBackend):
         content = blob.download_as_text()
         return json.loads(content)
 
-    def write_json(self, path: str, data: dict) -> None:
+    def read_json_versioned(self, path: str) -> Tuple[Optional[Any], int]:
         blob = self.bucket.blob(self._blob_path(path))
-        blob.upload_from_string(
-            json.dumps(data, indent=2),
-            content_type="application/json"
-        )
+        try:
+            content = blob.download_as_text()
+        except self._gcs_exceptions.NotFound:
+            return None, 0
+        # The download response carries the object generation
+        return json.loads(content), int(blob.generation)
+
+    def write_json(self, path: str, data: dict, if_version: Optional[int] = None) -> int:
+        blob = self.bucket.blob(self._blob_path(path))
+        try:
+            blob.upload_from_string(
+                json.dumps(data, indent=2),
+                content_type="application/json",
+                if_generation_match=if_version,
+            )
+        except self._gcs_exceptions.PreconditionFailed as e:
+            raise WriteConflict(f"{path} changed since it was read") from e
+        return int(blob.generation)
 
     def exists(self, path: str) -> bool:
         blob = self.bucket.blob(self._blob_path(path))
@@ -2,7 +2,7 @@ from fastapi import APIRouter
 from google.cloud import bigquery
 from datetime import datetime
 
-from .database import get_db
+from .database import BufferFull, get_bulk_writer, get_db
 
 router = APIRouter()
 
@@ -20,6 +20,11 @@ async def commit_shift(payload: dict):
     """
     Commit shift rows using database abstraction.
     Supports both BigQuery (production) and PostgreSQL (local dev).
+
+    With "defer": true the rows are queued on the bulk writer and written
+    with other requests' rows on the next size/time flush (backfills).
+    A queued response means the rows were accepted and must not be resent;
+    "retry": true means they were not accepted (buffer full).
     """
     rows = payload["rows"]
     filename = payload["filename"]
@@ -57,6 +62,12 @@ async def commit_shift(payload: dict):
         )
 
     try:
+        if payload.get("defer"):
+            try:
+                queued = get_bulk_writer().add(formatted, row_ids)
+            except BufferFull as e:
+                return {"ok": False, "inserted": 0, "queued": 0, "retry": True, "error": str(e)}
+            return {"ok": True, "inserted": 0, "queued": queued}
         result = get_db().insert_shift_rows(formatted, row_ids)
         return result
     except Exception as e:
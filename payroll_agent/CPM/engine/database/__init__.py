@@ -10,10 +10,12 @@ from typing import Optional
 from .interface import DatabaseBackend
 from .bigquery_backend import BigQueryBackend
 from .postgres_backend import PostgresBackend
+from .bulk_writer import BufferFull, BulkShiftWriter
 
 
-# Singleton instance
+# Singleton instances
 _db_instance: Optional[DatabaseBackend] = None
+_bulk_writer: Optional[BulkShiftWriter] = None
 
 
 def get_database() -> DatabaseBackend:
@@ -49,4 +51,45 @@ def get_db() -> DatabaseBackend:
     return get_database()
 
 
-__all__ = ["DatabaseBackend", "get_database", "get_db"]
+def get_bulk_writer() -> BulkShiftWriter:
+    """
+    Get the process-wide buffered bulk writer for the active backend.
+
+    Environment Variables:
+        BULK_WRITE_MAX_ROWS: flush when this many rows are buffered (default: 500)
+        BULK_WRITE_MAX_AGE_S: flush when the oldest row is this old (default: 5)
+        BULK_WRITE_MAX_BUFFERED: reject new rows beyond this many buffered (default: 10000)
+        BULK_WRITE_MAX_ATTEMPTS: failed flushes before rows are written one by one (default: 3)
+    """
+    global _bulk_writer
+
+    if _bulk_writer is None:
+        _bulk_writer = BulkShiftWriter(
+            get_database(),
+            max_rows=int(os.getenv("BULK_WRITE_MAX_ROWS", "500")),
+            max_age_s=float(os.getenv("BULK_WRITE_MAX_AGE_S", "5")),
+            max_buffered=int(os.getenv("BULK_WRITE_MAX_BUFFERED", "10000")),
+            max_attempts=int(os.getenv("BULK_WRITE_MAX_ATTEMPTS", "3")),
+        )
+
+    return _bulk_writer
+
+
+def close_bulk_writer() -> None:
+    """Flush and stop the bulk writer (call on app shutdown)."""
+    global _bulk_writer
+
+    if _bulk_writer is not None:
+        _bulk_writer.close()
+        _bulk_writer = None
+
+
+__all__ = [
+    "DatabaseBackend",
+    "BufferFull",
+    "BulkShiftWriter",
+    "get_database",
+    "get_db",
+    "get_bulk_writer",
+    "close_bulk_writer",
+]
@@ -1,11 +1,25 @@
 """BigQuery database backend for production."""
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from datetime import datetime
 from google.cloud import bigquery
 
-from .interface import DatabaseBackend
+from .interface import (
+    DatabaseBackend,
+    decode_cursor,
+    encode_cursor,
+    validate_aggregate_args,
+)
+
+# BigQuery DATE_TRUNC parts for aggregate_shifts periods (tip weeks run Mon-Sun)
+_BQ_PERIOD_PARTS = {
+    "day": "DAY",
+    "week": "WEEK(MONDAY)",
+    "month": "MONTH",
+    "quarter": "QUARTER",
+    "year": "YEAR",
+}
 
 
 class BigQueryBackend(DatabaseBackend):
@@ -23,6 +37,10 @@ class BigQueryBackend(DatabaseBackend):
             self._client = bigquery.Client(project=self.project_id)
         return self._client
 
+    def warm_up(self) -> None:
+        """Create the client up front (auth and transport setup)."""
+        self._get_client()
+
     def insert_shift_rows(
         self,
         rows: List[Dict[str, Any]],
@@ -42,6 +60,57 @@ class BigQueryBackend(DatabaseBackend):
 
         return {"ok": True, "inserted": len(rows)}
 
+    def insert_shift_rows_bulk(
+        self,
+        rows: List[Dict[str, Any]],
+        row_ids: List[str],
+        batch_size: int = 500,
+    ) -> Dict[str, Any]:
+        """Streaming-insert rows in request-sized chunks (BigQuery recommends <=500 rows)."""
+        table = f"{self.project_id}.{self.dataset}.{self.table_shifts}"
+        client = self._get_client()
+
+        errors = []
+        batches = 0
+        for i in range(0, len(rows), batch_size):
+            errors.extend(
+                client.insert_rows_json(
+                    table,
+                    rows[i:i + batch_size],
+                    row_ids=row_ids[i:i + batch_size],
+                )
+            )
+            batches += 1
+
+        if errors:
+            raise Exception(f"BigQuery insert errors: {errors[:20]}")
+
+        return {"ok": True, "inserted": len(rows), "batches": batches}
+
+    def _table(self) -> str:
+        return f"`{self.project_id}.{self.dataset}.{self.table_shifts}`"
+
+    @staticmethod
+    def _filters(employee, start_date, end_date):
+        """WHERE clauses + query parameters (values are never interpolated)."""
+        clauses = []
+        params = []
+        if employee:
+            clauses.append("employee = @employee")
+            params.append(bigquery.ScalarQueryParameter("employee", "STRING", employee))
+        if start_date:
+            clauses.append("shift_date >= @start_date")
+            params.append(bigquery.ScalarQueryParameter("start_date", "DATE", start_date.date()))
+        if end_date:
+            clauses.append("shift_date <= @end_date")
+            params.append(bigquery.ScalarQueryParameter("end_date", "DATE", end_date.date()))
+        return clauses, params
+
+    def _run(self, query: str, params: list) -> List[Dict[str, Any]]:
+        job_config = bigquery.QueryJobConfig(query_parameters=params)
+        results = self._get_client().query(query, job_config=job_config).result()
+        return [dict(row) for row in results]
+
     def get_shifts(
         self,
         employee: Optional[str] = None,
@@ -50,25 +119,83 @@ class BigQueryBackend(DatabaseBackend):
         limit: int = 100,
     ) -> List[Dict[str, Any]]:
         """Query shifts from BigQuery."""
-        query = f"""
-            SELECT *
-            FROM `{self.project_id}.{self.dataset}.{self.table_shifts}`
-            WHERE 1=1
-        """
+        return self.get_shifts_page(employee, start_date, end_date, limit)["rows"]
 
-        if employee:
-            query += f" AND employee = '{employee}'"
-        if start_date:
-            query += f" AND shift_date >= '{start_date.date().isoformat()}'"
-        if end_date:
-            query += f" AND shift_date <= '{end_date.date().isoformat()}'"
-
-        query += f" ORDER BY shift_date DESC LIMIT {limit}"
-
-        query_job = self._get_client().query(query)
-        results = query_job.result()
+    def get_shifts_page(
+        self,
+        employee: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Keyset pagination on (shift_date, employee, filename) DESC.
 
-        return [dict(row) for row in results]
+        BigQuery has no row_id column (row ids are only insert ids), so the
+        de-dupe key's components serve as the unique sort key.
+        """
+        clauses, params = self._filters(employee, start_date, end_date)
+        if cursor:
+            after_date, after_employee, after_filename = decode_cursor(cursor)
+            clauses.append(
+                "(shift_date < @after_date"
+                " OR (shift_date = @after_date AND (employee < @after_employee"
+                " OR (employee = @after_employee AND IFNULL(filename, '') < @after_filename))))"
+            )
+            params += [
+                bigquery.ScalarQueryParameter("after_date", "DATE", after_date),
+                bigquery.ScalarQueryParameter("after_employee", "STRING", after_employee),
+                bigquery.ScalarQueryParameter("after_filename", "STRING", after_filename or ""),
+            ]
+        params.append(bigquery.ScalarQueryParameter("limit", "INT64", limit))
+
+        query = f"SELECT * FROM {self._table()}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY shift_date DESC, employee DESC, IFNULL(filename, '') DESC LIMIT @limit"
+
+        rows = self._run(query, params)
+
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                [last["shift_date"].isoformat(), last["employee"], last.get("filename") or ""]
+            )
+        return {"rows": rows, "next_cursor": next_cursor}
+
+    def aggregate_shifts(
+        self,
+        group_by: Sequence[str] = ("employee",),
+        period: str = "week",
+        employee: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """SUM/COUNT tips in BigQuery grouped by employee/shift/period/etc."""
+        validate_aggregate_args(group_by, period)
+
+        # Only whitelisted identifiers are interpolated; values are parameters
+        select_cols = [
+            f"DATE_TRUNC(shift_date, {_BQ_PERIOD_PARTS[period]}) AS period_start" if g == "period" else g
+            for g in group_by
+        ]
+        clauses, params = self._filters(employee, start_date, end_date)
+
+        query = "SELECT " + ", ".join(
+            select_cols + ["SUM(amount_final) AS total_amount", "COUNT(*) AS shift_count"]
+        ) + f" FROM {self._table()}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if group_by:
+            positions = ", ".join(str(i + 1) for i in range(len(group_by)))
+            query += f" GROUP BY {positions} ORDER BY {positions}"
+
+        results = self._run(query, params)
+        for r in results:
+            r["total_amount"] = float(r["total_amount"] or 0)
+        return results
 
     def health_check(self) -> Dict[str, Any]:
         """Check BigQuery connection health."""
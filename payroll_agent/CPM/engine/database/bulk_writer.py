@@ -0,0 +1,263 @@
+"""
+Buffered bulk writer for shift rows.
+
+Coalesces rows from many requests and writes them through the backend's
+insert_shift_rows_bulk when the buffer reaches a size limit or its oldest row
+reaches an age limit. Intended for backfills and onboarding imports where
+per-call insert overhead dominates; interactive commits should keep using
+insert_shift_rows so the caller sees the write succeed.
+
+Writes happen only on the writer's own thread (or an explicit flush/close):
+add() just buffers and wakes that thread, so it never does database I/O on
+the caller's (e.g. the event loop's) thread.
+
+Once add() returns, the rows are the writer's responsibility: a failed
+flush keeps them buffered for the next attempt rather than surfacing an
+error that would make the caller resend them. Rows whose batch has failed
+max_attempts times are retried one by one if the backend is healthy, so a
+single bad row can't hold the rest back; rows that still fail are moved to
+a dead-letter list (see dead_letters() and stats()). While the database is
+down the buffer is capped at max_buffered; add() then rejects new rows with
+BufferFull, so callers know to retry those later.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .interface import DatabaseBackend
+
+log = logging.getLogger(__name__)
+
+# Dead-lettered rows kept in memory for inspection (oldest dropped first)
+DEAD_LETTER_KEEP = 1000
+
+
+class BufferFull(Exception):
+    """Raised by BulkShiftWriter.add when accepting rows would exceed max_buffered."""
+
+
+class BulkShiftWriter:
+    """Thread-safe row buffer that flushes by size or time."""
+
+    def __init__(
+        self,
+        backend: DatabaseBackend,
+        max_rows: int = 500,
+        max_age_s: float = 5.0,
+        max_buffered: int = 10000,
+        max_attempts: int = 3,
+    ):
+        self.backend = backend
+        self.max_rows = max_rows
+        self.max_age_s = max_age_s
+        self.max_buffered = max_buffered
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._rows: List[Dict[str, Any]] = []
+        self._row_ids: List[str] = []
+        self._attempts: List[int] = []  # failed flushes per buffered row
+        self._oldest: Optional[float] = None
+        self._dead: Deque[Dict[str, Any]] = deque(maxlen=DEAD_LETTER_KEEP)
+
+        self._stop = threading.Event()
+        self._due = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+
+        self._stats = {
+            "flushes": 0,
+            "rows_flushed": 0,
+            "flush_errors": 0,
+            "rows_rejected": 0,
+            "rows_dead_lettered": 0,
+            "last_flush_ms": None,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+            "last_error": None,
+        }
+
+    def add(self, rows: List[Dict[str, Any]], row_ids: List[str]) -> int:
+        """Buffer rows and wake the writer thread if the size limit is hit. Returns rows queued.
+
+        Raises BufferFull (queuing nothing) if the buffer can't take the rows.
+        Never writes to the database itself.
+        """
+        if len(rows) != len(row_ids):
+            raise ValueError("rows and row_ids must be the same length")
+
+        with self._lock:
+            if len(self._rows) + len(rows) > self.max_buffered:
+                self._stats["rows_rejected"] += len(rows)
+                raise BufferFull(
+                    f"bulk buffer holds {len(self._rows)} rows; max is {self.max_buffered}"
+                )
+            self._rows.extend(rows)
+            self._row_ids.extend(row_ids)
+            self._attempts.extend([0] * len(rows))
+            if self._oldest is None and rows:
+                self._oldest = time.monotonic()
+            full = len(self._rows) >= self.max_rows
+        self._ensure_timer()
+
+        if full:
+            self._due.set()
+        return len(rows)
+
+    def flush(self) -> Dict[str, Any]:
+        """Write everything buffered so far.
+
+        Raises if the write failed and rows were put back. Rows past
+        max_attempts are written one by one instead (when the backend is
+        healthy), dead-lettering those that still fail.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, row_ids, attempts = self._rows, self._row_ids, self._attempts
+                self._rows, self._row_ids, self._attempts, self._oldest = [], [], [], None
+            if not rows:
+                return {"ok": True, "inserted": 0}
+
+            start = time.perf_counter()
+            try:
+                result = self.backend.insert_shift_rows_bulk(rows, row_ids)
+            except Exception as e:
+                self._record_error(e)
+                log.exception("Bulk flush of %d shift rows failed", len(rows))
+                attempts = [a + 1 for a in attempts]
+                overdue = [i for i, a in enumerate(attempts) if a >= self.max_attempts]
+                if not overdue or not self._backend_healthy():
+                    self._requeue(rows, row_ids, attempts)
+                    raise
+                return self._isolate_failures(rows, row_ids, attempts, set(overdue))
+
+            self._record_flush(len(rows), (time.perf_counter() - start) * 1000)
+            return result
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        """Rows given up on, as {"row_id", "row", "error"} (most recent last)."""
+        with self._lock:
+            return list(self._dead)
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffer depth, dead letters and flush latency metrics."""
+        with self._lock:
+            s = dict(self._stats)
+            s["buffered"] = len(self._rows)
+            s["oldest_age_s"] = round(time.monotonic() - self._oldest, 2) if self._oldest else None
+            s["dead_letter_ids"] = [d["row_id"] for d in list(self._dead)[-20:]]
+        s["avg_flush_ms"] = round(s["total_flush_ms"] / s["flushes"], 2) if s["flushes"] else None
+        return s
+
+    def close(self) -> None:
+        """Stop the timer thread and flush what is left (failures are logged)."""
+        self._stop.set()
+        self._due.set()
+        if self._timer is not None:
+            self._timer.join(timeout=self.max_age_s + 1)
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            log.error("Shutdown flush failed; %d shift rows not written", self.stats()["buffered"])
+
+    # ------------------------------------------------------------------
+    # Failure handling
+    # ------------------------------------------------------------------
+    def _isolate_failures(
+        self,
+        rows: List[Dict[str, Any]],
+        row_ids: List[str],
+        attempts: List[int],
+        overdue: set,
+    ) -> Dict[str, Any]:
+        """Write overdue rows one at a time; dead-letter the ones that fail."""
+        retry = [i for i in range(len(rows)) if i not in overdue]
+        self._requeue([rows[i] for i in retry], [row_ids[i] for i in retry], [attempts[i] for i in retry])
+
+        start = time.perf_counter()
+        written = 0
+        for i in sorted(overdue):
+            try:
+                self.backend.insert_shift_rows_bulk([rows[i]], [row_ids[i]])
+                written += 1
+            except Exception as e:
+                self._dead_letter(rows[i], row_ids[i], e)
+        if written:
+            self._record_flush(written, (time.perf_counter() - start) * 1000)
+
+        dead = len(overdue) - written
+        log.warning(
+            "Isolated %d repeatedly failing shift rows: %d written, %d dead-lettered, %d re-queued",
+            len(overdue), written, dead, len(retry),
+        )
+        return {"ok": dead == 0 and not retry, "inserted": written, "dead_lettered": dead, "requeued": len(retry)}
+
+    def _backend_healthy(self) -> bool:
+        try:
+            return self.backend.health_check().get("status") == "healthy"
+        except Exception:
+            return False
+
+    def _requeue(self, rows: List[Dict[str, Any]], row_ids: List[str], attempts: List[int]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            self._rows[:0] = rows
+            self._row_ids[:0] = row_ids
+            self._attempts[:0] = attempts
+            self._oldest = self._oldest or time.monotonic()
+
+    def _dead_letter(self, row: Dict[str, Any], row_id: str, error: Exception) -> None:
+        log.error("Dead-lettering shift row %s: %s", row_id, error)
+        with self._lock:
+            self._dead.append({"row_id": row_id, "row": row, "error": str(error)[:300]})
+            self._stats["rows_dead_lettered"] += 1
+
+    def _record_error(self, error: Exception) -> None:
+        with self._lock:
+            self._stats["flush_errors"] += 1
+            self._stats["last_error"] = str(error)[:300]
+
+    def _record_flush(self, n_rows: int, elapsed_ms: float) -> None:
+        with self._lock:
+            s = self._stats
+            s["flushes"] += 1
+            s["rows_flushed"] += n_rows
+            s["last_flush_ms"] = round(elapsed_ms, 2)
+            s["max_flush_ms"] = round(max(s["max_flush_ms"], elapsed_ms), 2)
+            s["total_flush_ms"] = round(s["total_flush_ms"] + elapsed_ms, 2)
+        log.info("Bulk flushed %d shift rows in %.1f ms", n_rows, elapsed_ms)
+
+    # ------------------------------------------------------------------
+    # Writer thread: flushes by size (woken by add) or age
+    # ------------------------------------------------------------------
+    def _ensure_timer(self) -> None:
+        if self._timer is None and not self._stop.is_set():
+            with self._lock:
+                if self._timer is None:
+                    self._timer = threading.Thread(
+                        target=self._run_timer, name="bulk-shift-writer", daemon=True
+                    )
+                    self._timer.start()
+
+    def _run_timer(self) -> None:
+        interval = max(self.max_age_s / 2, 0.05)
+        while not self._stop.is_set():
+            self._due.wait(interval)
+            self._due.clear()
+            if self._stop.is_set():
+                break
+            with self._lock:
+                due = len(self._rows) >= self.max_rows or (
+                    self._oldest is not None and time.monotonic() - self._oldest >= self.max_age_s
+                )
+            if due:
+                try:
+                    self.flush()
+                except Exception:
+                    # Rows are re-queued; back off before the next attempt
+                    self._stop.wait(interval)
@@ -5,10 +5,37 @@ This allows switching between BigQuery (production) and PostgreSQL (local dev)
 without changing business logic.
 """
 
+import base64
+import json
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from datetime import datetime
 
+# Columns aggregate_shifts may group by ("period" is the truncated shift_date)
+AGGREGATE_DIMENSIONS = ("employee", "shift", "role", "category", "period")
+AGGREGATE_PERIODS = ("day", "week", "month", "quarter", "year")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque keyset cursor from the sort-key values of the last row returned."""
+    raw = json.dumps([str(v) if v is not None else None for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> List[Optional[str]]:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise ValueError(f"invalid cursor: {cursor!r}")
+
+
+def validate_aggregate_args(group_by: Sequence[str], period: str) -> None:
+    unknown = [g for g in group_by if g not in AGGREGATE_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"cannot group by {unknown}; allowed: {list(AGGREGATE_DIMENSIONS)}")
+    if period not in AGGREGATE_PERIODS:
+        raise ValueError(f"unknown period {period!r}; allowed: {list(AGGREGATE_PERIODS)}")
+
 
 class DatabaseBackend(ABC):
     """Abstract base class for database backends."""
@@ -47,6 +74,28 @@ class DatabaseBackend(ABC):
         """
         pass
 
+    def insert_shift_rows_bulk(
+        self,
+        rows: List[Dict[str, Any]],
+        row_ids: List[str],
+        batch_size: int = 500,
+    ) -> Dict[str, Any]:
+        """
+        Insert a large number of shift rows (backfills, batch re-parses).
+
+        Same row format and deduplication as insert_shift_rows. Backends
+        override this with their native bulk path; the default just chunks
+        insert_shift_rows.
+
+        Returns:
+            {"ok": True, "inserted": count, "batches": n}
+        """
+        batches = 0
+        for i in range(0, len(rows), batch_size):
+            self.insert_shift_rows(rows[i:i + batch_size], row_ids[i:i + batch_size])
+            batches += 1
+        return {"ok": True, "inserted": len(rows), "batches": batches}
+
     @abstractmethod
     def get_shifts(
         self,
@@ -69,6 +118,65 @@ class DatabaseBackend(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_shifts_page(
+        self,
+        employee: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Keyset-paginated shift query, newest first.
+
+        Args:
+            employee/start_date/end_date: Same filters as get_shifts
+            limit: Page size
+            cursor: next_cursor from the previous page (None for the first)
+
+        Returns:
+            {"rows": [...], "next_cursor": str | None}
+        """
+        pass
+
+    @abstractmethod
+    def aggregate_shifts(
+        self,
+        group_by: Sequence[str] = ("employee",),
+        period: str = "week",
+        employee: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Tip totals computed in the database.
+
+        Args:
+            group_by: Any of AGGREGATE_DIMENSIONS; "period" buckets shift_date
+            period: Bucket size when grouping by period (weeks start Monday)
+            employee/start_date/end_date: Same filters as get_shifts
+
+        Returns:
+            One dict per group: the group_by columns (period as
+            "period_start") plus total_amount and shift_count
+        """
+        pass
+
+    def warm_up(self) -> None:
+        """
+        Open connections/clients ahead of the first request.
+
+        Called once at service startup. The default does nothing.
+        """
+        pass
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Connection pool utilisation, or None for backends without a pool.
+        """
+        return None
+
     @abstractmethod
     def health_check(self) -> Dict[str, Any]:
         """
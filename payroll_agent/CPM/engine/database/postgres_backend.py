@@ -1,13 +1,32 @@
 """PostgreSQL database backend for local development."""
 
+import csv
+import io
+import logging
 import os
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Sequence
 from datetime import datetime
 import psycopg2
 import psycopg2.extras
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.pool import ThreadedConnectionPool
 
-from .interface import DatabaseBackend
+from .interface import (
+    DatabaseBackend,
+    decode_cursor,
+    encode_cursor,
+    validate_aggregate_args,
+)
+
+SHIFT_COLUMNS = (
+    "row_id", "shift_date", "shift", "employee", "role", "category",
+    "amount_final", "pool_hours", "food_sales", "filename", "file_id",
+    "parsed_confidence", "parser_version", "inserted_at",
+)
+
+log = logging.getLogger(__name__)
 
 
 class PostgresBackend(DatabaseBackend):
@@ -19,62 +38,253 @@ class PostgresBackend(DatabaseBackend):
         self.database = os.getenv("POSTGRES_DB", "payroll")
         self.user = os.getenv("POSTGRES_USER", "payroll_user")
         self.password = os.getenv("POSTGRES_PASSWORD", "payroll_pass")
-        self._pool = None
+        # Bulk inserts at or above this many rows go through COPY
+        self.copy_threshold = int(os.getenv("POSTGRES_COPY_THRESHOLD", "1000"))
+
+        # Pool sizing and connection lifecycle
+        self.pool_min = int(os.getenv("POSTGRES_POOL_MIN", "1"))
+        self.pool_max = int(os.getenv("POSTGRES_POOL_MAX", "10"))
+        self.pool_timeout_s = float(os.getenv("POSTGRES_POOL_TIMEOUT_S", "10"))
+        # Connections older than this are closed and replaced on checkout
+        self.conn_max_age_s = float(os.getenv("POSTGRES_CONN_MAX_AGE_S", "1800"))
+        # Connections idle longer than this get a SELECT 1 before reuse
+        self.conn_validate_idle_s = float(os.getenv("POSTGRES_CONN_VALIDATE_IDLE_S", "30"))
+
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # psycopg2 pools raise when exhausted; this makes callers wait instead
+        self._slots = threading.BoundedSemaphore(self.pool_max)
+        self._conn_meta: Dict[int, Dict[str, float]] = {}
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "in_use": 0,
+            "peak_in_use": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "timeouts": 0,
+            "recycled": 0,
+            "invalidated": 0,
+        }
 
-    def _get_pool(self) -> SimpleConnectionPool:
-        """Lazy-load connection pool."""
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Lazy-load the thread-safe connection pool."""
         if self._pool is None:
-            self._pool = SimpleConnectionPool(
-                minconn=1,
-                maxconn=10,
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-            )
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadedConnectionPool(
+                        minconn=self.pool_min,
+                        maxconn=self.pool_max,
+                        host=self.host,
+                        port=self.port,
+                        database=self.database,
+                        user=self.user,
+                        password=self.password,
+                    )
         return self._pool
 
+    def _checkout(self, pool: ThreadedConnectionPool):
+        """Get a connection, replacing ones that are too old or fail validation."""
+        while True:
+            conn = pool.getconn()
+            now = time.monotonic()
+            meta = self._conn_meta.setdefault(id(conn), {"created": now, "last_used": now})
+
+            if conn.closed or now - meta["created"] > self.conn_max_age_s:
+                self._discard(pool, conn, "recycled")
+                continue
+
+            if now - meta["last_used"] > self.conn_validate_idle_s:
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+                    conn.rollback()
+                except psycopg2.Error:
+                    self._discard(pool, conn, "invalidated")
+                    continue
+            return conn
+
+    def _discard(self, pool: ThreadedConnectionPool, conn, reason: str) -> None:
+        self._conn_meta.pop(id(conn), None)
+        pool.putconn(conn, close=True)
+        with self._stats_lock:
+            self._stats[reason] += 1
+
+    @contextmanager
+    def _connection(self):
+        """
+        Check a connection out of the pool for the duration of the block.
+
+        Blocks (up to POSTGRES_POOL_TIMEOUT_S) when all connections are in use,
+        rolls back on error, and drops connections that broke mid-request.
+        """
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.pool_timeout_s):
+            with self._stats_lock:
+                self._stats["timeouts"] += 1
+            raise Exception(f"PostgreSQL pool exhausted (max {self.pool_max}) after {self.pool_timeout_s}s")
+
+        pool = None
+        conn = None
+        try:
+            pool = self._get_pool()
+            conn = self._checkout(pool)
+            wait_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                s = self._stats
+                s["checkouts"] += 1
+                s["in_use"] += 1
+                s["peak_in_use"] = max(s["peak_in_use"], s["in_use"])
+                s["wait_ms_total"] += wait_ms
+                s["wait_ms_max"] = max(s["wait_ms_max"], wait_ms)
+
+            try:
+                yield conn
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                with self._stats_lock:
+                    self._stats["in_use"] -= 1
+        finally:
+            if conn is not None:
+                if conn.closed:
+                    self._discard(pool, conn, "invalidated")
+                else:
+                    meta = self._conn_meta.get(id(conn))
+                    if meta:
+                        meta["last_used"] = time.monotonic()
+                    pool.putconn(conn)
+            self._slots.release()
+
+    def warm_up(self) -> None:
+        """Open and validate POSTGRES_POOL_MIN connections ahead of the first request."""
+        held = []
+        try:
+            for _ in range(self.pool_min):
+                cm = self._connection()
+                conn = cm.__enter__()
+                held.append(cm)
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+        finally:
+            for cm in reversed(held):
+                cm.__exit__(None, None, None)
+        log.info("PostgreSQL pool warmed with %d connection(s)", len(held))
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Pool utilisation for /ping."""
+        with self._stats_lock:
+            s = dict(self._stats)
+        pool = self._pool
+        s.update(
+            min=self.pool_min,
+            max=self.pool_max,
+            idle=len(pool._pool) if pool is not None else 0,
+            open=len(pool._pool) + s["in_use"] if pool is not None else 0,
+            wait_ms_avg=round(s["wait_ms_total"] / s["checkouts"], 2) if s["checkouts"] else None,
+            wait_ms_total=round(s["wait_ms_total"], 2),
+            wait_ms_max=round(s["wait_ms_max"], 2),
+        )
+        return s
+
     def insert_shift_rows(
         self,
         rows: List[Dict[str, Any]],
         row_ids: List[str],
     ) -> Dict[str, Any]:
         """Insert shift rows into PostgreSQL with deduplication."""
-        pool = self._get_pool()
-        conn = pool.getconn()
+        with self._connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    # Prepare data with row_id for deduplication
+                    for row, row_id in zip(rows, row_ids):
+                        row["row_id"] = row_id
 
-        try:
-            with conn.cursor() as cur:
-                # Prepare data with row_id for deduplication
-                for row, row_id in zip(rows, row_ids):
-                    row["row_id"] = row_id
-
-                # Insert with ON CONFLICT DO NOTHING for deduplication
-                insert_query = """
-                    INSERT INTO shifts (
-                        row_id, shift_date, shift, employee, role, category,
-                        amount_final, pool_hours, food_sales, filename, file_id,
-                        parsed_confidence, parser_version, inserted_at
-                    ) VALUES (
-                        %(row_id)s, %(shift_date)s, %(shift)s, %(employee)s,
-                        %(role)s, %(category)s, %(amount_final)s, %(pool_hours)s,
-                        %(food_sales)s, %(filename)s, %(file_id)s,
-                        %(parsed_confidence)s, %(parser_version)s, %(inserted_at)s
-                    )
-                    ON CONFLICT (row_id) DO NOTHING
-                """
+                    # Insert with ON CONFLICT DO NOTHING for deduplication
+                    insert_query = """
+                        INSERT INTO shifts (
+                            row_id, shift_date, shift, employee, role, category,
+                            amount_final, pool_hours, food_sales, filename, file_id,
+                            parsed_confidence, parser_version, inserted_at
+                        ) VALUES (
+                            %(row_id)s, %(shift_date)s, %(shift)s, %(employee)s,
+                            %(role)s, %(category)s, %(amount_final)s, %(pool_hours)s,
+                            %(food_sales)s, %(filename)s, %(file_id)s,
+                            %(parsed_confidence)s, %(parser_version)s, %(inserted_at)s
+                        )
+                        ON CONFLICT (row_id) DO NOTHING
+                    """
 
-                psycopg2.extras.execute_batch(cur, insert_query, rows)
-                conn.commit()
+                    psycopg2.extras.execute_batch(cur, insert_query, rows)
+                    conn.commit()
 
-                return {"ok": True, "inserted": len(rows)}
+                    return {"ok": True, "inserted": len(rows)}
 
-        except Exception as e:
-            conn.rollback()
-            raise Exception(f"PostgreSQL insert error: {e}")
-        finally:
-            pool.putconn(conn)
+            except Exception as e:
+                conn.rollback()
+                raise Exception(f"PostgreSQL insert error: {e}")
+
+    def insert_shift_rows_bulk(
+        self,
+        rows: List[Dict[str, Any]],
+        row_ids: List[str],
+        batch_size: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Bulk insert with deduplication.
+
+        Uses multi-row INSERT (execute_values) for moderate batches and
+        COPY into a temp staging table for large ones; both end in
+        ON CONFLICT (row_id) DO NOTHING.
+        """
+        values = [
+            (row_id,) + tuple(row.get(col) for col in SHIFT_COLUMNS[1:])
+            for row, row_id in zip(rows, row_ids)
+        ]
+        if not values:
+            return {"ok": True, "inserted": 0, "method": "none"}
+
+        cols = ", ".join(SHIFT_COLUMNS)
+        with self._connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    if len(values) >= self.copy_threshold:
+                        method = "copy"
+                        buf = io.StringIO()
+                        writer = csv.writer(buf)
+                        for v in values:
+                            writer.writerow([r"\N" if x is None else x for x in v])
+                        buf.seek(0)
+
+                        cur.execute(
+                            "CREATE TEMP TABLE shifts_stage (LIKE shifts INCLUDING DEFAULTS) ON COMMIT DROP"
+                        )
+                        cur.copy_expert(
+                            f"COPY shifts_stage ({cols}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                            buf,
+                        )
+                        cur.execute(
+                            f"INSERT INTO shifts ({cols}) SELECT {cols} FROM shifts_stage "
+                            "ON CONFLICT (row_id) DO NOTHING"
+                        )
+                    else:
+                        method = "execute_values"
+                        psycopg2.extras.execute_values(
+                            cur,
+                            f"INSERT INTO shifts ({cols}) VALUES %s ON CONFLICT (row_id) DO NOTHING",
+                            values,
+                            page_size=batch_size,
+                        )
+                    conn.commit()
+
+                    return {"ok": True, "inserted": len(values), "method": method}
+
+            except Exception as e:
+                conn.rollback()
+                raise Exception(f"PostgreSQL bulk insert error: {e}")
 
     def get_shifts(
         self,
@@ -84,46 +294,103 @@ class PostgresBackend(DatabaseBackend):
         limit: int = 100,
     ) -> List[Dict[str, Any]]:
         """Query shifts from PostgreSQL."""
-        pool = self._get_pool()
-        conn = pool.getconn()
+        return self.get_shifts_page(employee, start_date, end_date, limit)["rows"]
 
-        try:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                query = "SELECT * FROM shifts WHERE 1=1"
-                params = []
-
-                if employee:
-                    query += " AND employee = %s"
-                    params.append(employee)
-                if start_date:
-                    query += " AND shift_date >= %s"
-                    params.append(start_date.date())
-                if end_date:
-                    query += " AND shift_date <= %s"
-                    params.append(end_date.date())
-
-                query += " ORDER BY shift_date DESC LIMIT %s"
-                params.append(limit)
+    @staticmethod
+    def _filters(employee, start_date, end_date):
+        clauses = []
+        params: List[Any] = []
+        if employee:
+            clauses.append("employee = %s")
+            params.append(employee)
+        if start_date:
+            clauses.append("shift_date >= %s")
+            params.append(start_date.date())
+        if end_date:
+            clauses.append("shift_date <= %s")
+            params.append(end_date.date())
+        return clauses, params
+
+    def get_shifts_page(
+        self,
+        employee: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Keyset pagination on (shift_date, row_id) DESC.
 
+        Served by idx_shifts_date_rowid / idx_shifts_employee_date_rowid, so
+        deep pages cost the same as the first one (no OFFSET scan).
+        """
+        clauses, params = self._filters(employee, start_date, end_date)
+        if cursor:
+            after_date, after_row_id = decode_cursor(cursor)
+            clauses.append("(shift_date, row_id) < (%s, %s)")
+            params.extend([after_date, after_row_id])
+
+        query = "SELECT * FROM shifts"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY shift_date DESC, row_id DESC LIMIT %s"
+        params.append(limit)
+
+        with self._connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
                 cur.execute(query, params)
-                results = cur.fetchall()
+                rows = [dict(row) for row in cur.fetchall()]
 
-                return [dict(row) for row in results]
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = encode_cursor([last["shift_date"].isoformat(), last["row_id"]])
+        return {"rows": rows, "next_cursor": next_cursor}
 
-        finally:
-            pool.putconn(conn)
+    def aggregate_shifts(
+        self,
+        group_by: Sequence[str] = ("employee",),
+        period: str = "week",
+        employee: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """SUM/COUNT tips in PostgreSQL grouped by employee/shift/period/etc."""
+        validate_aggregate_args(group_by, period)
+
+        # Only whitelisted identifiers are interpolated; values are parameters
+        select_cols = [
+            f"date_trunc('{period}', shift_date)::date AS period_start" if g == "period" else g
+            for g in group_by
+        ]
+        clauses, params = self._filters(employee, start_date, end_date)
+
+        query = "SELECT " + ", ".join(
+            select_cols + ["SUM(amount_final) AS total_amount", "COUNT(*) AS shift_count"]
+        ) + " FROM shifts"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if group_by:
+            positions = ", ".join(str(i + 1) for i in range(len(group_by)))
+            query += f" GROUP BY {positions} ORDER BY {positions}"
+
+        with self._connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                cur.execute(query, params)
+                results = [dict(row) for row in cur.fetchall()]
+
+        for r in results:
+            r["total_amount"] = float(r["total_amount"] or 0)
+        return results
 
     def health_check(self) -> Dict[str, Any]:
         """Check PostgreSQL connection health."""
         try:
-            pool = self._get_pool()
-            conn = pool.getconn()
-
-            with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM shifts")
-                row_count = cur.fetchone()[0]
-
-            pool.putconn(conn)
+            with self._connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT COUNT(*) FROM shifts")
+                    row_count = cur.fetchone()[0]
 
             return {
                 "status": "healthy",
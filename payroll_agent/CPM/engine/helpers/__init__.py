@@ -2,3 +2,5 @@
 
 Add shared helper functions or classes here to keep endpoints tidy.
 """
+
+from .rows import RowAccumulator, row_key  # noqa: F401
@@ -0,0 +1,59 @@
+"""Row accumulation with an (employee, date, shift) index.
+
+The transcript parser asks "do we already have a row for this person on this
+shift?" for nearly every candidate it finds. Scanning the row list for that
+made parsing quadratic in the number of names mentioned, so rows are kept
+alongside a keyed index instead.
+"""
+
+from typing import Dict, Generic, Iterator, List, Optional, Set, Tuple, TypeVar
+
+RowT = TypeVar("RowT")
+
+
+def row_key(row) -> Tuple:
+    """Return the de-dupe key for a parsed shift row."""
+    return (row.employee, row.date, row.shift)
+
+
+class RowAccumulator(Generic[RowT]):
+    """
+    Ordered list of shift rows plus an index keyed by (employee, date, shift).
+
+    Works with any row object exposing ``employee``, ``date`` and ``shift``
+    attributes (e.g. ``ShiftRow``). Iteration order is insertion order.
+    """
+
+    def __init__(self) -> None:
+        self.rows: List[RowT] = []
+        self._index: Dict[Tuple, RowT] = {}
+        self._employees: Set[str] = set()
+
+    def append(self, row: RowT) -> None:
+        """Add a row unconditionally (the first row for a key stays indexed)."""
+        self.rows.append(row)
+        self._index.setdefault(row_key(row), row)
+        self._employees.add(row.employee)
+
+    def add(self, row: RowT) -> bool:
+        """Add a row unless one already exists for its key. Returns True if added."""
+        if row_key(row) in self._index:
+            return False
+        self.append(row)
+        return True
+
+    def has(self, employee: str, date, shift: str) -> bool:
+        return (employee, date, shift) in self._index
+
+    def get(self, employee: str, date, shift: str) -> Optional[RowT]:
+        return self._index.get((employee, date, shift))
+
+    def has_employee(self, employee: str) -> bool:
+        """True if any row (any date/shift) exists for this employee."""
+        return employee in self._employees
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[RowT]:
+        return iter(self.rows)
@@ -0,0 +1,17 @@
+"""Request models shared by the payroll engine and its routers.
+
+Kept out of payroll_engine so routers can use them at import time without
+a circular import.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TranscriptIn(BaseModel):
+    filename: str
+    transcript: str
+    file_id: Optional[str] = None
+    date: Optional[str] = None
+    shift: Optional[str] = None
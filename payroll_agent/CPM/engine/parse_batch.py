@@ -0,0 +1,185 @@
+"""Batch transcript parsing for re-parses and audits.
+
+Parses many transcripts in a process pool (the parser is CPU-bound regex work,
+so threads would serialize on the GIL) and optionally commits every parsed
+row in one bulk database insert. Work that can't use the pool (single-worker
+parsing, zip extraction, the database insert) runs in the threadpool so the
+event loop stays free.
+"""
+
+import asyncio
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+from .models import TranscriptIn
+
+router = APIRouter()
+
+# Worker count for the parse pool (defaults to the machine's CPU count)
+PARSE_BATCH_WORKERS = int(os.getenv("PARSE_BATCH_WORKERS", "0")) or (os.cpu_count() or 1)
+# Reject batches larger than this to bound request memory/time
+PARSE_BATCH_MAX_FILES = int(os.getenv("PARSE_BATCH_MAX_FILES", "2000"))
+# Zip uploads: max archive size, and max total size of the transcripts inside
+PARSE_BATCH_MAX_ZIP_BYTES = int(os.getenv("PARSE_BATCH_MAX_ZIP_BYTES", str(50 * 1024 * 1024)))
+PARSE_BATCH_MAX_UNZIPPED_BYTES = int(os.getenv("PARSE_BATCH_MAX_UNZIPPED_BYTES", str(200 * 1024 * 1024)))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared parse process pool."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PARSE_BATCH_WORKERS)
+    return _pool
+
+
+def shutdown_parse_pool():
+    """Stop the parse pool (called from the engine app's lifespan)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _parse_one(payload: TranscriptIn) -> Dict[str, Any]:
+    """Parse a single transcript. Runs inside a pool worker."""
+    from .payroll_engine import parse_transcript_to_rows
+
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"filename": payload.filename, "ok": True, "rows": [], "error": None}
+    try:
+        result["rows"] = parse_transcript_to_rows(payload)
+    except HTTPException as e:
+        result.update(ok=False, error=e.detail)
+    except Exception as e:
+        result.update(ok=False, error=str(e))
+    result["parse_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+class BatchIn(BaseModel):
+    transcripts: List[TranscriptIn]
+    commit: bool = False
+
+
+def _parse_serial(payloads: List[TranscriptIn]) -> List[Dict[str, Any]]:
+    return [_parse_one(p) for p in payloads]
+
+
+async def _run_batch(payloads: List[TranscriptIn], commit: bool) -> Dict[str, Any]:
+    from .payroll_engine import insert_shift_rows
+
+    if not payloads:
+        raise HTTPException(status_code=400, detail="no transcripts in batch")
+    if len(payloads) > PARSE_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"batch has {len(payloads)} transcripts; max is {PARSE_BATCH_MAX_FILES}",
+        )
+
+    start = time.perf_counter()
+    if len(payloads) == 1 or PARSE_BATCH_WORKERS == 1:
+        results = await run_in_threadpool(_parse_serial, payloads)
+    else:
+        loop = asyncio.get_running_loop()
+        pool = get_parse_pool()
+        results = await asyncio.gather(*(loop.run_in_executor(pool, _parse_one, p) for p in payloads))
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    parse_times = [r["parse_ms"] for r in results]
+    response: Dict[str, Any] = {
+        "files": [
+            {
+                "filename": r["filename"],
+                "ok": r["ok"],
+                "error": r["error"],
+                "parse_ms": r["parse_ms"],
+                "rows": [row.model_dump() for row in r["rows"]],
+            }
+            for r in results
+        ],
+        "stats": {
+            "files": len(results),
+            "parsed": sum(1 for r in results if r["ok"]),
+            "failed": sum(1 for r in results if not r["ok"]),
+            "rows": sum(len(r["rows"]) for r in results),
+            "workers": 1 if len(payloads) == 1 else PARSE_BATCH_WORKERS,
+            "wall_ms": round(wall_ms, 2),
+            "parse_ms_total": round(sum(parse_times), 2),
+            "parse_ms_max": max(parse_times),
+        },
+    }
+
+    if commit:
+        all_rows = [row for r in results for row in r["rows"]]
+        if all_rows:
+            response["commit"] = await run_in_threadpool(insert_shift_rows, all_rows, bulk=True)
+        else:
+            response["commit"] = {"ok": True, "inserted": 0}
+
+    return response
+
+
+@router.post("/parse_batch")
+async def parse_batch(batch: BatchIn):
+    """Parse many transcripts in parallel; optionally bulk-commit all rows."""
+    return await _run_batch(batch.transcripts, batch.commit)
+
+
+@router.post("/parse_batch_zip")
+async def parse_batch_zip(
+    archive: UploadFile = File(...),
+    commit: bool = Form(False),
+):
+    """Parse every .txt transcript in a zip archive (filename drives date/shift)."""
+    data = await archive.read(PARSE_BATCH_MAX_ZIP_BYTES + 1)
+    if len(data) > PARSE_BATCH_MAX_ZIP_BYTES:
+        raise HTTPException(status_code=413, detail=f"archive is larger than {PARSE_BATCH_MAX_ZIP_BYTES} bytes")
+    payloads = await run_in_threadpool(_read_zip_transcripts, data)
+    return await _run_batch(payloads, commit)
+
+
+def _read_zip_transcripts(data: bytes) -> List[TranscriptIn]:
+    """Transcripts from a zip, refusing archives over the file-count or size caps."""
+    try:
+        zf = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="upload is not a zip archive")
+
+    with zf:
+        entries = []
+        for info in zf.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or not name.lower().endswith(".txt") or name.startswith("."):
+                continue
+            entries.append((name, info))
+
+        if len(entries) > PARSE_BATCH_MAX_FILES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"archive has {len(entries)} transcripts; max is {PARSE_BATCH_MAX_FILES}",
+            )
+        # zipfile never reads past an entry's declared size, so this bounds memory
+        unzipped = sum(info.file_size for _, info in entries)
+        if unzipped > PARSE_BATCH_MAX_UNZIPPED_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"archive expands to {unzipped} bytes; max is {PARSE_BATCH_MAX_UNZIPPED_BYTES}",
+            )
+
+        try:
+            return [
+                TranscriptIn(filename=name, transcript=zf.read(info).decode("utf-8", errors="replace"))
+                for name, info in entries
+            ]
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError) as e:
+            raise HTTPException(status_code=400, detail=f"unreadable zip entry: {e}")
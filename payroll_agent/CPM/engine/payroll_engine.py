@@ -10,25 +10,50 @@ logging.basicConfig(
     ],
 )
 log = logging.getLogger("payroll_engine")
+import asyncio
 import os
 import re
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import List, Optional
 from datetime import date, datetime
 
-import requests
+import httpx
 from fastapi import FastAPI, UploadFile, HTTPException, File
 from pydantic import BaseModel
 from google.cloud import bigquery
 
 from dateutil import parser as dtp
-from roster.loader import load_roster, normalize_employee_name, get_roster_path
+from roster.loader import load_roster, get_roster_path
+from roster.matcher import get_roster_matcher
 from .parse_shift import router as ParseShiftRouter
 from .commit_shift import router as CommitShiftRouter
-from .database import get_db
+from .parse_batch import router as ParseBatchRouter, shutdown_parse_pool
+from .query_shifts import router as QueryShiftsRouter
+from .database import close_bulk_writer, get_bulk_writer, get_db
+from .helpers import RowAccumulator
+from .models import TranscriptIn
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open DB connections before traffic arrives; a failure here is logged,
+    # not fatal, so the container still starts and /ping reports the problem.
+    try:
+        get_db().warm_up()
+    except Exception:
+        log.exception("Database warm-up failed")
+    yield
+    await close_transcribe_client()
+    close_bulk_writer()
+    shutdown_parse_pool()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(ParseShiftRouter)
 app.include_router(CommitShiftRouter)
+app.include_router(ParseBatchRouter)
+app.include_router(QueryShiftsRouter)
 log = logging.getLogger("uvicorn")
 
 
@@ -58,26 +83,71 @@ TRANSCRIBE_BASE = os.getenv(
     "https://payroll-transcribe-147422626167.us-central1.run.app",
 ).rstrip("/")
 
+TRANSCRIBE_TIMEOUT = float(os.getenv("TRANSCRIBE_TIMEOUT", "180"))
+# Max in-flight transcriber calls per worker; extra uploads wait their turn
+# instead of opening more upstream connections.
+TRANSCRIBE_MAX_CONCURRENCY = int(os.getenv("TRANSCRIBE_MAX_CONCURRENCY", "8"))
+
+# Shared keep-alive client (created lazily inside the running event loop)
+_transcribe_client: Optional[httpx.AsyncClient] = None
+_transcribe_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_transcribe_client() -> httpx.AsyncClient:
+    global _transcribe_client, _transcribe_slots
+    if _transcribe_client is None:
+        _transcribe_client = httpx.AsyncClient(
+            base_url=TRANSCRIBE_BASE,
+            timeout=httpx.Timeout(TRANSCRIBE_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=TRANSCRIBE_MAX_CONCURRENCY,
+                max_keepalive_connections=TRANSCRIBE_MAX_CONCURRENCY,
+            ),
+        )
+        _transcribe_slots = asyncio.Semaphore(TRANSCRIBE_MAX_CONCURRENCY)
+    return _transcribe_client
+
+
+async def close_transcribe_client():
+    global _transcribe_client, _transcribe_slots
+    if _transcribe_client is not None:
+        await _transcribe_client.aclose()
+        _transcribe_client = None
+        _transcribe_slots = None
+
+
 async def transcribe_audio(upload: UploadFile) -> str:
     """
     Send the uploaded audio file to the transcriber service and return the transcript text.
+
+    The upload is sent over a pooled connection. It is read with
+    ``await upload.read()`` (off the event loop) because httpx's async
+    multipart encoder can't stream from the upload's blocking file object.
     """
-    url = TRANSCRIBE_BASE + "/transcribe"
+    client = get_transcribe_client()
+    await upload.seek(0)
+    audio = await upload.read()
     files = {
         "audio": (
             upload.filename or "shift.wav",
-            await upload.read(),
+            audio,
             upload.content_type or "audio/wav",
         )
     }
     try:
-        resp = requests.post(url, files=files, timeout=180)
+        async with _transcribe_slots:
+            resp = await client.post("/transcribe", files=files)
         resp.raise_for_status()
-    except requests.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=502,
             detail=f"transcribe upstream error: {e.response.text[:300]}",
         )
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"transcribe upstream unreachable: {e!r}"[:300],
+        )
 
     data = resp.json()
     text = (data or {}).get("text", "").strip()
@@ -237,9 +307,14 @@ ROSTER = ROSTER_STANDALONE
 SUPPORT_STAFF = {"Ryan Alexander", "Coben Cross", "Maddox Porter", "Fiona Dodson", "Atticus Usseglio"}
 
 
+@lru_cache(maxsize=4096)
 def normalize_name(raw: str) -> Optional[str]:
     """
     Converts messy Whisper output into a known employee name.
+
+    The parser calls this for every token and name-like fragment of a
+    transcript, and the roster is fixed for the life of the process, so
+    results are memoized.
     """
     key = " ".join(raw.strip().lower().split())
     if not key:
@@ -248,47 +323,47 @@ def normalize_name(raw: str) -> Optional[str]:
     if "cov" in key or "ovid" in key:
         return "Coben Cross"
 
-    nm = normalize_employee_name(key)
-    if nm:
-        return nm
-
-    tokens = key.split()
-
-    # Match any individual word via canonical roster
-    for t in tokens:
-        nm = normalize_employee_name(t)
-        if nm:
-            return nm
-
-    # Match 2-word combos via canonical roster
-    for i in range(len(tokens) - 1):
-        combo = f"{tokens[i]} {tokens[i+1]}"
-        nm = normalize_employee_name(combo)
-        if nm:
-            return nm
-
-    return None
+    # Whole fragment, then any individual word, then 2-word combos — all
+    # resolved in one pass of the prebuilt roster automaton.
+    return get_roster_matcher().resolve(key)
 
 
 # ----------------------------------------------------
 # Amount Parsing — FULLY PATCHED
 # ----------------------------------------------------
+WORD_TO_DIGIT = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4,
+    "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9
+}
+
+# parse_amount_fragment runs for nearly every token in a transcript, so its
+# patterns are compiled once here instead of on every call.
+_DIGIT_WORD = r"(one|two|three|four|five|six|seven|eight|nine)"
+_AMT_SINGLE_INT = re.compile(r"\$?\s*(\d+)\.?")
+_AMT_NUMS = re.compile(r"(\d+)\.?")
+_AMT_DOT_WORD_CENTS = re.compile(rf"(\d+)\.\s+{_DIGIT_WORD}\s+cents")
+_AMT_IN_WORD_CENTS = re.compile(rf"(\d+(?:\.\d+)?)\s+in\s+{_DIGIT_WORD}\s+cents")
+_AMT_AND_WORD_CENTS = re.compile(rf"(\d+)\s+and\s+{_DIGIT_WORD}\s+cents")
+_AMT_AND_CENTS = re.compile(r"(\d+)\s+(?:dollars?\s+)?and\s+(\d+)\s+cents")
+_AMT_DOLLARS_WORD_CENTS = re.compile(r"(\d+)\s+dollars?\s+and\s+(?:\w+)\s+(\d{2})\s+cents")
+_AMT_SPACE_CENTS = re.compile(r"\b(\d+)\s+(\d{2})\b")
+_AMT_AND_NO_CENTS = re.compile(r"(\d+)\s+(?:dollars?\s+)?and\s+(\d{1,2})\b")
+_AMT_SHORT_SPACE_CENTS = re.compile(r"\b(\d{1,4})\s+(\d{2})\b")
+_AMT_RUN_ON = re.compile(r"\b(\d{3,})\b")
+_AMT_DECIMAL = re.compile(r"\d+\.\d+|\d+\.\d|\d+")
+
+
 def parse_amount_fragment(fragment: str) -> float:
     s = fragment.lower().replace(",", " ").replace("$", " ").strip()
     s = s.rstrip(" .")
 
-    word_to_digit = {
-        "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4,
-        "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9
-    }
-
     # NEW: "$120." → 120.00 (only when the entire fragment is a single integer amount)
-    m = re.fullmatch(r"\$?\s*(\d+)\.?", s)
+    m = _AMT_SINGLE_INT.fullmatch(s)
     if m:
         return float(f"{m.group(1)}.00")
 
     # 1) "$52. $03." → 52.03
-    two_nums = re.findall(r"(\d+)\.?", s)
+    two_nums = _AMT_NUMS.findall(s)
     if len(two_nums) == 2:
         dollars = two_nums[0]
         cents = two_nums[1]
@@ -297,74 +372,65 @@ def parse_amount_fragment(fragment: str) -> float:
         return float(f"{dollars}.{cents}")
 
     # 2) "39. four cents" → 39.04
-    m = re.search(r"(\d+)\.\s+(one|two|three|four|five|six|seven|eight|nine)\s+cents", s)
+    m = _AMT_DOT_WORD_CENTS.search(s)
     if m:
         dollars = int(m.group(1))
-        cents = word_to_digit[m.group(2)]
+        cents = WORD_TO_DIGIT[m.group(2)]
         return dollars + cents / 100.0
 
     # 3) "362.2 in two cents"
-    m = re.search(r"(\d+(?:\.\d+)?)\s+in\s+(one|two|three|four|five|six|seven|eight|nine)\s+cents", s)
+    m = _AMT_IN_WORD_CENTS.search(s)
     if m:
         dollars_str = m.group(1)
-        cents = word_to_digit[m.group(2)]
+        cents = WORD_TO_DIGIT[m.group(2)]
         if "." in dollars_str and len(dollars_str.split(".")[1]) == 1:
             whole = int(dollars_str.split(".")[0])
             return float(f"{whole}.0{cents}")
         return float(dollars_str) + cents / 100.0
 
     # 4) "362 and two cents"
-    m = re.search(r"(\d+)\s+and\s+(one|two|three|four|five|six|seven|eight|nine)\s+cents", s)
+    m = _AMT_AND_WORD_CENTS.search(s)
     if m:
-        return int(m.group(1)) + word_to_digit[m.group(2)] / 100.0
+        return int(m.group(1)) + WORD_TO_DIGIT[m.group(2)] / 100.0
 
-    # 5) "278 and 34 cents"
-    m = re.search(r"(\d+)\s+(?:dollars?\s+)?and\s+(\d+)\s+cents", s)
+    # 5) "278 and 34 cents" / "214 dollars and 38 cents" → 214.38
+    m = _AMT_AND_CENTS.search(s)
     if m:
         return int(m.group(1)) + int(m.group(2)) / 100.0
 
-    # Case: "214 dollars and 38 cents" → 214.38
-    m = re.search(r"(\d+)\s+(?:dollars?\s+)?and\s+(\d+)\s+cents", s)
-    if m:
-        dollars = int(m.group(1))
-        cents = int(m.group(2))
-        if cents < 10:
-            cents = int(f"0{cents}")
-        return float(f"{dollars}.{cents:02d}")
-
     # Case: "22 dollars and six 68 cents" → 22.68
-    m = re.search(r"(\d+)\s+dollars?\s+and\s+(?:\w+)\s+(\d{2})\s+cents", s)
+    m = _AMT_DOLLARS_WORD_CENTS.search(s)
     if m:
         dollars = int(m.group(1))
         cents = int(m.group(2))
         return float(f"{dollars}.{cents:02d}")
 
     # 6) "278 34"
-    m = re.search(r"\b(\d+)\s+(\d{2})\b", s)
+    m = _AMT_SPACE_CENTS.search(s)
     if m:
         return float(f"{m.group(1)}.{m.group(2)}")
 
     # NEW: "300 and 67" (no 'cents' word) → 300.67
-    m = re.search(r"(\d+)\s+(?:dollars?\s+)?and\s+(\d{1,2})\b", s)
+    m = _AMT_AND_NO_CENTS.search(s)
     if m:
         dollars = int(m.group(1))
         cents = int(m.group(2))
         return float(f"{dollars}.{cents:02d}")
 
     # Handle amounts like "219 68" (dollars then cents, spoken without 'and' or 'cents')
-    m = re.search(r"\b(\d{1,4})\s+(\d{2})\b", s)
+    m = _AMT_SHORT_SPACE_CENTS.search(s)
     if m:
         dollars, cents = m.groups()
         return float(f"{dollars}.{cents}")
 
     # Handle amounts like "7504" (should be $75.04)
-    m = re.search(r"\b(\d{3,})\b", s)
+    m = _AMT_RUN_ON.search(s)
     if m and len(m.group(1)) > 2:
         val = m.group(1)
         return float(f"{val[:-2]}.{val[-2:]}")
 
     # 7) Standard decimals
-    m = re.search(r"\d+\.\d+|\d+\.\d|\d+", s)
+    m = _AMT_DECIMAL.search(s)
     if m:
         return float(m.group(0))
 
@@ -388,7 +454,6 @@ def parse_spoken_numeric_date(text: str):
         "twenty five": "25", "twenty six": "26", "twenty seven": "27", 
         "twenty eight": "28", "twenty nine": "29", "thirty": "30", "thirty one": "31"
     }
-    import re
     words = text.lower().split()
     # Convert number-words to digits
     converted = []
@@ -409,31 +474,34 @@ def parse_spoken_numeric_date(text: str):
                 yy = int(yy)
             # Check if plausible date
             if 1 <= mm <= 12 and 1 <= dd <= 31 and 2020 <= yy <= 2099:
-                from datetime import date
                 try:
                     return date(yy, mm, dd)
                 except Exception:
                     continue
     return None
 
+_MONTH_DATE_RE = re.compile(
+    r"(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+(\d{2,4})"
+)
+_YEAR_RE = re.compile(r"\b(\d{2,4})\b")
+_FILENAME_DATE_RE = re.compile(r"(\d{6})")
+
+
 def extract_date_from_text(text: str) -> Optional[date]:
     lowered = text.lower()
-    m = re.search(
-        r"(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+(\d{2,4})",
-        lowered,
-    )
+    m = _MONTH_DATE_RE.search(lowered)
     if m:
         try:
             # m.group(2) is year, which may be 2 or 4 digits
             month_day = m.group(0)
             # Extract year from match
-            year_match = re.search(r"\b(\d{2,4})\b", month_day)
+            year_match = _YEAR_RE.search(month_day)
             if year_match:
                 year = year_match.group(1)
                 if len(year) == 2:
                     year = str(2000 + int(year))
                 # Rebuild date string with 4-digit year
-                month_day_fixed = re.sub(r"\b\d{2,4}\b", year, month_day)
+                month_day_fixed = _YEAR_RE.sub(year, month_day)
                 return dtp.parse(month_day_fixed).date()
             else:
                 return dtp.parse(month_day).date()
@@ -447,7 +515,7 @@ def extract_date_from_text(text: str) -> Optional[date]:
 
 
 def infer_date_from_filename(fn: str) -> Optional[date]:
-    m = re.search(r"(\d{6})", fn)
+    m = _FILENAME_DATE_RE.search(fn)
     if not m:
         return None
     mmddyy = m.group(1)
@@ -472,14 +540,6 @@ def infer_shift_from_filename(fn: str) -> Optional[str]:
 # ----------------------------------------------------
 # MODELS
 # ----------------------------------------------------
-class TranscriptIn(BaseModel):
-    filename: str
-    transcript: str
-    file_id: Optional[str] = None
-    date: Optional[str] = None
-    shift: Optional[str] = None
-
-
 class ShiftRow(BaseModel):
     date: date
     shift: str
@@ -493,6 +553,107 @@ class ShiftRow(BaseModel):
     parser_version: str = "v4"
 
 
+# ----------------------------------------------------
+# Transcript Patterns (compiled once at import)
+# ----------------------------------------------------
+HALLUC_KEYWORDS = (
+    "patreon", "subscribe", "contact us", "assistance",
+    "women assistance", "rome", "cole", "transcript",
+    "podcast",
+)
+
+# Everything from the first hallucination keyword to the end is dropped.
+_HALLUC_RE = re.compile(
+    r"(?:" + "|".join(re.escape(kw) for kw in HALLUC_KEYWORDS) + r").*$",
+    flags=re.IGNORECASE,
+)
+
+# Zero-width scan for every position an amount phrase starts at; the last one
+# marks where the spoken numbers end. Equivalent to the old greedy
+# "(.*(amount))" search without its quadratic backtracking on transcripts
+# that contain no amounts at all.
+_LAST_AMOUNT_RE = re.compile(
+    r"(?=(\d+\.\d+|\d+\s+\d{2}|\d+\.\s+[a-z]+ cents|\d+ cents))",
+    flags=re.IGNORECASE,
+)
+_TRAILING_JUNK_RE = re.compile(r"[^\w\$\.\s]+$")
+
+_NAME = r"[A-Za-z][A-Za-z.'\-]*(?:\s+[A-Za-z][A-Za-z.'\-]*){0,2}"
+
+# "<name> 58 dollars and 76 cents"
+_DOLLAR_CENT_RE = re.compile(
+    rf"({_NAME})\s+(\d{{1,4}})\s+dollars?\s+and\s+(\d{{1,2}})\s+cents",
+    flags=re.IGNORECASE,
+)
+
+# Support-staff sections: "utility Ryan Alexander ... $32.82"
+SUPPORT_SECTIONS = ("utility", "expo", "busser")
+_SECTION_RE = {role: re.compile(rf"{role}.*?(?:$|\n|\.|\!|\?)") for role in SUPPORT_SECTIONS}
+_SECTION_NAMES_RE = {
+    role: re.compile(rf"(?:{role}\s+)({_NAME})", flags=re.IGNORECASE) for role in SUPPORT_SECTIONS
+}
+_SECTION_AMOUNT_RE = {
+    role: re.compile(rf"{role}[^$]*\$(\d+)[^\d]+(\d{{2}})", flags=re.IGNORECASE)
+    for role in SUPPORT_SECTIONS
+}
+
+_SERVERS_WERE_RE = re.compile(r"servers were (.+?)[\.\n]")
+_EACH_MADE_RE = re.compile(r"they should have each made\s*([^\.\n]+)")
+_NAME_LIST_SPLIT_RE = re.compile(r",|\sand\s")
+_SERVERS_INLINE_RE = re.compile(r"servers (.+?)(?:utility|$)", flags=re.IGNORECASE)
+_INLINE_PAIR_RE = re.compile(rf"({_NAME})\s+([^,.;]+)", flags=re.IGNORECASE)
+_FALLBACK_RE = re.compile(rf"({_NAME})\s*[:\-–—]?\s*\$?\s*([^\n,;]+)")
+_HAS_DIGIT_RE = re.compile(r"\d")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+
+
+def _prepare_transcript(text: str):
+    """
+    Strip Whisper hallucinations and trailing noise, then tokenize once.
+
+    Returns (text, lowered, tokens); every section extractor works off these.
+    """
+    text = text.replace("\n", " ").strip()
+    text = _HALLUC_RE.sub("", text)
+
+    # Trim anything after last numeric phrase
+    last = None
+    for last in _LAST_AMOUNT_RE.finditer(text):
+        pass
+    if last is not None:
+        text = text[: last.end(1)].strip()
+
+    # Final clean
+    text = _TRAILING_JUNK_RE.sub("", text).strip()
+
+    return text, text.lower(), text.split()
+
+
+def _extract_support_section(role: str, text: str, lowered: str):
+    """
+    Find the "<role> <names> ... $<amount>" section for a support role.
+
+    Returns None when the role is never mentioned, otherwise
+    (normalized names in order of appearance, amount or None).
+    """
+    section = _SECTION_RE[role].search(lowered)
+    if not section:
+        return None
+
+    names: List[str] = []
+    for raw in _SECTION_NAMES_RE[role].findall(section.group(0)):
+        fixed = normalize_name(raw)
+        if fixed and fixed not in names:
+            names.append(fixed)
+
+    amount = None
+    amt_match = _SECTION_AMOUNT_RE[role].search(text)
+    if amt_match:
+        amount = float(f"{amt_match.group(1)}.{amt_match.group(2)}")
+
+    return names, amount
+
+
 # ----------------------------------------------------
 # Transcript Parsing — Fully Patched Version
 # ----------------------------------------------------
@@ -529,30 +690,8 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
     # ---------------------------------------------------
     # STRIP WHISPER HALLUCINATIONS (AFTER date extraction)
     # ---------------------------------------------------
-    text = text.replace("\n", " ").strip()
-
-    halluc_keywords = [
-        "patreon", "subscribe", "contact us", "assistance",
-        "women assistance", "rome", "cole", "transcript",
-        "podcast"
-    ]
-
-    for kw in halluc_keywords:
-        text = re.sub(rf"{kw}.*$", "", text, flags=re.IGNORECASE)
-
-    # Trim anything after last numeric phrase
-    m = re.search(
-        r"(.*(\d+\.\d+|\d+\s+\d{2}|\d+\.\s+[a-z]+ cents|\d+ cents))",
-        text, flags=re.IGNORECASE
-    )
-    if m:
-        text = m.group(1).strip()
-
-    # Final clean
-    text = re.sub(r"[^\w\$\.\s]+$", "", text).strip()
-
-    lowered = text.lower()
-    rows: List[ShiftRow] = []
+    text, lowered, tokens = _prepare_transcript(text)
+    rows: RowAccumulator[ShiftRow] = RowAccumulator()
 
     def resolve_role_category(name: str, default_role: str = "FOH"):
         role = default_role
@@ -569,11 +708,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
     # ------------------------------------------------------------------
     # STRONGLY-BIASED PATTERN: "<name> 58 dollars and 76 cents"
     # ------------------------------------------------------------------
-    dollar_cent_pattern = re.compile(
-        r"([A-Za-z][A-Za-z.'\-]*(?:\s+[A-Za-z][A-Za-z.'\-]*){0,2})\s+(\d{1,4})\s+dollars?\s+and\s+(\d{1,2})\s+cents",
-        flags=re.IGNORECASE,
-    )
-    for m in dollar_cent_pattern.finditer(text):
+    for m in _DOLLAR_CENT_RE.finditer(text):
         nm = normalize_name(m.group(1))
         if not nm:
             continue
@@ -581,7 +716,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
         cents = int(m.group(3))
         val = float(f"{dollars}.{cents:02d}")
         role, category = resolve_role_category(nm, "FOH")
-        already = any(r.employee == nm and r.date == d and r.shift == sh for r in rows)
+        already = rows.has(nm, d, sh)
         if not already:
             rows.append(
                 ShiftRow(
@@ -600,52 +735,13 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
     # -------------------------------
     # UTILITY SECTION FIRST
     # -------------------------------
-    utility_match = re.search(r"utility.*?(?:$|\n|\.|\!|\?)", lowered)
-    if utility_match:
-        util_txt = utility_match.group(0)
-
-        # NEW LOGIC: Handle 1 or 2 utility employees.
-        # Step 1: Extract ALL names that appear after “utility”
-        raw_names = re.findall(
-            r"(?:utility\s+)([A-Za-z][A-Za-z.'\-]*(?:\s+[A-Za-z][A-Za-z.'\-]*){0,2})",
-            util_txt,
-            flags=re.IGNORECASE
-        )
-
-        # Step 2: Normalize all valid utility names
-        util_names = []
-        for nm in raw_names:
-            fixed = normalize_name(nm)
-            if fixed and fixed not in util_names:
-                util_names.append(fixed)
-
-        # Step 3: Extract REAL utility amount from the transcript
-        amt_match = re.search(
-            r"utility[^$]*\$(\d+)[^\d]+(\d{2})",
-            text,
-            flags=re.IGNORECASE
-        )
-
-        util_val = None
-        if amt_match:
-            dollars = amt_match.group(1)
-            cents = amt_match.group(2)
-            try:
-                util_val = float(f"{dollars}.{cents}")
-            except:
-                util_val = None
-
-        # Step 4: If 2 utility employees, split amount evenly
-        if util_names and util_val is not None:
-            if len(util_names) == 2:
-                util_val = util_val  # already the per-person value in test cases
-                # If transcript gives total instead of per-person, uncomment below:
-                # util_val = util_val / 2.0
-
-        # Step 5: Add ShiftRow entries for each utility employee
+    utility = _extract_support_section("utility", text, lowered)
+    if utility:
+        # Handles 1 or 2 utility employees. With 2, the transcript amount is
+        # already the per-person value in test cases; if it ever gives the
+        # total instead, split it here.
+        util_names, util_val = utility
         for nm in util_names:
-            if nm == "Ryan Alexander":
-                role = "utility"
             category = "support" if nm in SUPPORT_STAFF else "foh"
             rows.append(
                 ShiftRow(
@@ -662,105 +758,24 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
             )
 
     # -------------------------------
-    # EXPO SUPPORT STAFF LOGIC
+    # EXPO / BUSSER SUPPORT STAFF LOGIC
     # -------------------------------
-    expo_match = re.search(r"expo.*?(?:$|\n|\.|\!|\?)", lowered)
-    expo_names = []
-    expo_val = None
-    if expo_match:
-        expo_txt = expo_match.group(0)
-
-        # Extract ALL names after "expo"
-        raw_names = re.findall(
-            r"(?:expo\s+)([A-Za-z][A-Za-z.'\-]*(?:\s+[A-Za-z][A-Za-z.'\-]*){0,2})",
-            expo_txt,
-            flags=re.IGNORECASE
-        )
-        for nm in raw_names:
-            fixed = normalize_name(nm)
-            if fixed and fixed not in expo_names:
-                expo_names.append(fixed)
-
-        amt_match = re.search(
-            r"expo[^$]*\$(\d+)[^\d]+(\d{2})",
-            text,
-            flags=re.IGNORECASE
-        )
-
-        if amt_match:
-            dollars = amt_match.group(1)
-            cents = amt_match.group(2)
-            try:
-                expo_val = float(f"{dollars}.{cents}")
-            except:
-                expo_val = None
-
-        if expo_names and expo_val is not None:
-            for nm in expo_names:
-                if nm == "Ryan Alexander":
-                    role = "utility"
-                category = "support" if nm in SUPPORT_STAFF else "foh"
-                rows.append(
-                    ShiftRow(
-                        date=d,
-                        shift=sh,
-                        employee=nm,
-                        role="expo",
-                        category=category,
-                        amount_final=expo_val,
-                        filename=payload.filename,
-                        file_id=payload.file_id,
-                        parsed_confidence=0.9,
-                    )
-                )
-
-    # -------------------------------
-    # BUSSER SUPPORT STAFF LOGIC
-    # -------------------------------
-    busser_match = re.search(r"busser.*?(?:$|\n|\.|\!|\?)", lowered)
-    if busser_match:
-        busser_txt = busser_match.group(0)
-
-        # Extract ALL names after "busser"
-        raw_names = re.findall(
-            r"(?:busser\s+)([A-Za-z][A-Za-z.'\-]*(?:\s+[A-Za-z][A-Za-z.'\-]*){0,2})",
-            busser_txt,
-            flags=re.IGNORECASE
-        )
-        busser_names = []
-        for nm in raw_names:
-            fixed = normalize_name(nm)
-            if fixed and fixed not in busser_names:
-                busser_names.append(fixed)
-
-        amt_match = re.search(
-            r"busser[^$]*\$(\d+)[^\d]+(\d{2})",
-            text,
-            flags=re.IGNORECASE
-        )
-
-        busser_val = None
-        if amt_match:
-            dollars = amt_match.group(1)
-            cents = amt_match.group(2)
-            try:
-                busser_val = float(f"{dollars}.{cents}")
-            except:
-                busser_val = None
-
-        if busser_names and busser_val is not None:
-            for nm in busser_names:
-                if nm == "Ryan Alexander":
-                    role = "utility"
+    for support_role in ("expo", "busser"):
+        section = _extract_support_section(support_role, text, lowered)
+        if not section:
+            continue
+        support_names, support_val = section
+        if support_names and support_val is not None:
+            for nm in support_names:
                 category = "support" if nm in SUPPORT_STAFF else "foh"
                 rows.append(
                     ShiftRow(
                         date=d,
                         shift=sh,
                         employee=nm,
-                        role="busser",
+                        role=support_role,
                         category=category,
-                        amount_final=busser_val,
+                        amount_final=support_val,
                         filename=payload.filename,
                         file_id=payload.file_id,
                         parsed_confidence=0.9,
@@ -771,8 +786,8 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
     # -------------------------------
     # GROUP SERVER LOGIC
     # -------------------------------
-    m_names = re.search(r"servers were (.+?)[\.\n]", lowered)
-    m_amt = re.search(r"they should have each made\s*([^\.\n]+)", lowered)
+    m_names = _SERVERS_WERE_RE.search(lowered)
+    m_amt = _EACH_MADE_RE.search(lowered)
 
     if m_names and m_amt:
         names_part = m_names.group(1)
@@ -784,7 +799,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
             per_server = None
 
         if per_server is not None:
-            raw_names = re.split(r",|\sand\s", names_part)
+            raw_names = _NAME_LIST_SPLIT_RE.split(names_part)
             seen = set()
 
             for raw in raw_names:
@@ -811,17 +826,13 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
     # -------------------------------
     # INLINE SERVERS LOGIC ("servers Mike Walton $300 and 67 cents ...")
     # -------------------------------
-    servers_inline = re.search(r"servers (.+?)(?:utility|$)", text, flags=re.IGNORECASE)
+    servers_inline = _SERVERS_INLINE_RE.search(text)
     if servers_inline:
         servers_segment = servers_inline.group(1)
 
         # NEW UNIVERSAL INLINE SERVER PARSER
         # Match NAME + amount fragment (handles ANY amount format Whisper produces)
-        for m in re.finditer(
-            r"([A-Za-z][A-Za-z.'\-]*(?:\s+[A-Za-z][A-Za-z.'\-]*){0,2})\s+([^,.;]+)",
-            servers_segment,
-            flags=re.IGNORECASE,
-        ):
+        for m in _INLINE_PAIR_RE.finditer(servers_segment):
             raw_nm, raw_amt = m.groups()
             nm = normalize_name(raw_nm)
             if not nm:
@@ -834,7 +845,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
                 continue
 
             # Avoid duplicating rows
-            already = any(r.employee == nm and r.date == d and r.shift == sh for r in rows)
+            already = rows.has(nm, d, sh)
             if already:
                 continue
 
@@ -862,9 +873,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
     # -------------------------------
     # NEW: DIRECT NAME + AMOUNT PATTERN ("Kevin 219 68", "Ryan 7504")
     # -------------------------------
-    tokens = text.split()
-    print(f"TOKENS: {tokens}")
-    log.debug(f"TOKENS: {tokens}")
+    log.debug("TOKENS: %s", tokens)
     for i in range(len(tokens)):
         val = None
         raw_nm = tokens[i]
@@ -872,13 +881,12 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
         if not nm:
             continue
 
-        print(f"DEBUG: Fallback candidate: '{raw_nm}' normalized as '{nm}', tokens: {tokens[i:i+4]}")
-        log.debug(f"DEBUG: Fallback candidate: '{raw_nm}' normalized as '{nm}', tokens: {tokens[i:i+4]}")
+        log.debug("Fallback candidate: %r normalized as %r, tokens: %s", raw_nm, nm, tokens[i:i+4])
 
         # Case 0: token after name includes a $-amount (e.g., "$16.80" or "$16.86.")
         if (
             i + 1 < len(tokens)
-            and re.search(r"\d", tokens[i + 1])
+            and _HAS_DIGIT_RE.search(tokens[i + 1])
             and not (i + 2 < len(tokens) and "dollar" in tokens[i + 2].lower())
         ):
             raw_amt_token = tokens[i + 1].strip(",.")
@@ -889,7 +897,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
                     val = None
         if val is not None:
             role, category = resolve_role_category(nm, "FOH")
-            already = any(r.employee == nm and r.date == d and r.shift == sh for r in rows)
+            already = rows.has(nm, d, sh)
             if not already:
                 rows.append(
                     ShiftRow(
@@ -907,14 +915,14 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
             continue
 
         # Case 0b: amount appears two tokens after name (e.g., "lost him $364.30")
-        if i + 2 < len(tokens) and re.search(r"\d", tokens[i + 2]) and tokens[i + 2].startswith("$"):
+        if i + 2 < len(tokens) and _HAS_DIGIT_RE.search(tokens[i + 2]) and tokens[i + 2].startswith("$"):
             try:
                 val = parse_amount_fragment(tokens[i + 2])
             except Exception:
                 val = None
             if val is not None:
                 role, category = resolve_role_category(nm, "FOH")
-                already = any(r.employee == nm and r.date == d and r.shift == sh for r in rows)
+                already = rows.has(nm, d, sh)
                 if not already:
                     rows.append(
                         ShiftRow(
@@ -939,7 +947,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
             val = None
         if val is not None:
             role, category = resolve_role_category(nm, "FOH")
-            already = any(r.employee == nm and r.date == d and r.shift == sh for r in rows)
+            already = rows.has(nm, d, sh)
             if not already:
                 rows.append(
                     ShiftRow(
@@ -969,7 +977,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
                 val = None
             if val is not None:
                 role, category = resolve_role_category(nm, "FOH")
-                already = any(r.employee == nm and r.date == d and r.shift == sh for r in rows)
+                already = rows.has(nm, d, sh)
                 if not already:
                     rows.append(
                         ShiftRow(
@@ -994,7 +1002,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
                 val = float(f"{dollars}.{cents}")
                 role = "utility" if nm in ("Coben Cross", "Maddox Porter", "Ryan Alexander") else "FOH"
 
-                already = any(r.employee == nm and r.date == d and r.shift == sh for r in rows)
+                already = rows.has(nm, d, sh)
                 if not already:
                     if nm == "Ryan Alexander":
                         role = "utility"
@@ -1019,14 +1027,14 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
         # Case 2: amount like "7504" (→ 75.04), even at end of transcript
         if i + 1 < len(tokens) and tokens[i+1].isdigit() and len(tokens[i+1]) >= 3:
             try:
-                raw = re.sub(r"[^\d]", "", tokens[i+1])  # remove punctuation
+                raw = _NON_DIGIT_RE.sub("", tokens[i+1])  # remove punctuation
                 if len(raw) >= 3:
                     dollars = raw[:-2]
                     cents = raw[-2:]
                     val = float(f"{dollars}.{cents}")
                     role = "utility" if nm in ("Coben Cross", "Maddox Porter", "Ryan Alexander") else "FOH"
 
-                    already = any(r.employee == nm and r.date == d and r.shift == sh for r in rows)
+                    already = rows.has(nm, d, sh)
                     if not already:
                         if nm == "Ryan Alexander":
                             role = "utility"
@@ -1058,7 +1066,7 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
                     val = float(f"{dollars}.{cents}")
                     role = "utility" if nm in ("Coben Cross", "Maddox Porter", "Ryan Alexander") else "FOH"
 
-                    already = any(r.employee == nm and r.date == d and r.shift == sh for r in rows)
+                    already = rows.has(nm, d, sh)
                     if not already:
                         if nm == "Ryan Alexander":
                             role = "utility"
@@ -1080,18 +1088,12 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
                 except:
                     pass
 
-    fallback_pattern = (
-        r"([A-Za-z][A-Za-z.'\-]*(?:\s+[A-Za-z][A-Za-z.'\-]*){0,2})"
-        r"\s*[:\-–—]?\s*\$?\s*([^\n,;]+)"
-    )
-
-    found = re.findall(fallback_pattern, text)
+    found = _FALLBACK_RE.findall(text)
 
     if found:
-        existing = {r.employee for r in rows}
         for raw_nm, raw_amt in found:
             nm = normalize_name(raw_nm)
-            if not nm or nm in existing:
+            if not nm or rows.has_employee(nm):
                 continue
 
             try:
@@ -1116,22 +1118,18 @@ def parse_transcript_to_rows(payload: TranscriptIn) -> List[ShiftRow]:
                     parsed_confidence=0.85,
                 )
             )
-            existing.add(nm)
 
     if not rows:
         raise HTTPException(status_code=422, detail="could not parse any name/amount pairs from transcript")
 
-    return rows
+    return rows.rows
 
 
 # ----------------------------------------------------
 # Database Insert with De-dupe (uses abstraction layer)
 # ----------------------------------------------------
-def insert_shift_rows(rows: List[ShiftRow]):
-    """
-    Insert shift rows using database abstraction.
-    Supports both BigQuery (production) and PostgreSQL (local dev).
-    """
+def shift_rows_to_records(rows: List[ShiftRow]):
+    """Map parsed rows to database records and their de-dupe row ids."""
     to_insert = []
     row_ids = []
 
@@ -1158,9 +1156,24 @@ def insert_shift_rows(rows: List[ShiftRow]):
             }
         )
 
+    return to_insert, row_ids
+
+
+def insert_shift_rows(rows: List[ShiftRow], bulk: bool = False):
+    """
+    Insert shift rows using database abstraction.
+    Supports both BigQuery (production) and PostgreSQL (local dev).
+
+    bulk=True uses the backend's bulk path (COPY / chunked streaming
+    inserts), for batches of many shifties at once.
+    """
+    to_insert, row_ids = shift_rows_to_records(rows)
+
     try:
-        result = get_db().insert_shift_rows(to_insert, row_ids)
-        return result
+        db = get_db()
+        if bulk:
+            return db.insert_shift_rows_bulk(to_insert, row_ids)
+        return db.insert_shift_rows(to_insert, row_ids)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1177,22 +1190,7 @@ async def transcribe_and_ingest(
 ):
     try:
         # Send file to transcriber
-        url = TRANSCRIBE_BASE + "/transcribe"
-        files = {
-            "audio": (
-                audio.filename or "shift.wav",
-                await audio.read(),
-                audio.content_type or "audio/wav",
-            )
-        }
-
-        resp = requests.post(url, files=files, timeout=180)
-        resp.raise_for_status()
-
-        data = resp.json()
-        text = (data or {}).get("text", "").strip()
-        if not text:
-            raise HTTPException(status_code=422, detail="transcriber returned empty text")
+        text = await transcribe_audio(audio)
 
         # Build payload
         payload = TranscriptIn(
@@ -1206,11 +1204,6 @@ async def transcribe_and_ingest(
         # Insert into BigQuery
         return insert_shift_rows(rows)
 
-    except requests.HTTPError as e:
-        raise HTTPException(
-            status_code=502,
-            detail=f"transcribe upstream error: {e.response.text[:300]}",
-        )
     except HTTPException:
         raise
     except Exception as e:
@@ -1230,4 +1223,6 @@ def ping():
         "project": PROJECT_ID,
         "dataset": BQ_DATASET,
         "database": db_health,
+        "pool": get_db().pool_stats(),
+        "bulk_writer": get_bulk_writer().stats(),
     }
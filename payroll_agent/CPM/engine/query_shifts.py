@@ -0,0 +1,61 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from .database import get_db
+
+router = APIRouter()
+
+
+def _as_datetime(d: Optional[date]) -> Optional[datetime]:
+    return datetime.combine(d, datetime.min.time()) if d else None
+
+
+@router.get("/shifts")
+def list_shifts(
+    employee: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    """
+    Page through committed shift rows, newest first.
+    Pass the returned next_cursor to get the following page.
+    """
+    try:
+        return get_db().get_shifts_page(
+            employee=employee,
+            start_date=_as_datetime(start_date),
+            end_date=_as_datetime(end_date),
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/shifts/totals")
+def shift_totals(
+    group_by: List[str] = Query(["employee"]),
+    period: str = "week",
+    employee: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    Tip totals computed in the database, e.g.
+    /shifts/totals?group_by=employee&group_by=period&period=month&start_date=2025-01-01
+    """
+    try:
+        rows = get_db().aggregate_shifts(
+            group_by=group_by,
+            period=period,
+            employee=employee,
+            start_date=_as_datetime(start_date),
+            end_date=_as_datetime(end_date),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"group_by": group_by, "period": period, "rows": rows}
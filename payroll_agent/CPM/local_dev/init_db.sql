@@ -30,6 +30,16 @@ CREATE INDEX IF NOT EXISTS idx_shifts_date ON shifts(shift_date);
 CREATE INDEX IF NOT EXISTS idx_shifts_employee ON shifts(employee);
 CREATE INDEX IF NOT EXISTS idx_shifts_date_employee ON shifts(shift_date, employee);
 
+-- Keyset pagination (get_shifts_page): ORDER BY shift_date DESC, row_id DESC,
+-- optionally filtered by employee
+CREATE INDEX IF NOT EXISTS idx_shifts_date_rowid ON shifts(shift_date DESC, row_id DESC);
+CREATE INDEX IF NOT EXISTS idx_shifts_employee_date_rowid ON shifts(employee, shift_date DESC, row_id DESC);
+
+-- Covering index so aggregate_shifts (totals by employee/shift/period over a
+-- date range) can be answered with an index-only scan
+CREATE INDEX IF NOT EXISTS idx_shifts_date_totals ON shifts(shift_date)
+    INCLUDE (employee, shift, role, category, amount_final);
+
 -- View for human-readable queries
 CREATE OR REPLACE VIEW shifts_summary AS
 SELECT
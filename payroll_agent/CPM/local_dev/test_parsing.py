@@ -178,5 +178,30 @@ class TestComplexRoles:
             temp_wav.unlink()
 
 
+class TestBatchParsing:
+    """Test /parse_batch over several fixture transcripts."""
+
+    def test_parse_batch_returns_rows_per_file(self, fixtures):
+        """Every fixture parses in one call, in order, without committing."""
+        names = ["monday_am_simple", "complex_roles", "edge_case_amounts"]
+        transcripts = [
+            {"filename": fixtures[n]["filename"], "transcript": fixtures[n]["transcript"]}
+            for n in names
+        ]
+
+        ping_before = requests.get(f"{BASE_URL}/ping").json()
+        response = requests.post(f"{BASE_URL}/parse_batch", json={"transcripts": transcripts})
+        ping_after = requests.get(f"{BASE_URL}/ping").json()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [f["filename"] for f in data["files"]] == [t["filename"] for t in transcripts]
+        assert data["stats"]["files"] == 3
+        assert data["stats"]["rows"] == sum(len(f["rows"]) for f in data["files"])
+        assert all(f["parse_ms"] >= 0 for f in data["files"])
+        assert "commit" not in data
+        assert ping_before["database"]["row_count"] == ping_after["database"]["row_count"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
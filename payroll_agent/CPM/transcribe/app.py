@@ -1,6 +1,7 @@
 from fastapi import FastAPI, UploadFile, HTTPException
 from typing import Optional
-import os, tempfile, logging
+import os, subprocess, tempfile, logging
+import numpy as np
 import whisper
 
 from transcribe.cleanup.llm_cleanup import LlmCleanupClient
@@ -25,6 +26,38 @@ def load_model():
     return _model
 
 
+# Memory-backed spool directory for inputs ffmpeg can't read from a pipe
+SPOOL_DIR = "/dev/shm" if os.access("/dev/shm", os.W_OK) else "/tmp"
+
+
+def _ffmpeg_pcm(source: str, data: Optional[bytes]) -> subprocess.CompletedProcess:
+    cmd = ["ffmpeg", "-hide_banner"] + (["-nostdin"] if data is None else []) + [
+        "-threads", "0", "-i", source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(whisper.audio.SAMPLE_RATE), "-",
+    ]
+    return subprocess.run(cmd, input=data, capture_output=True)
+
+
+def decode_audio(data: bytes, suffix: str) -> np.ndarray:
+    """Decode uploaded bytes to Whisper's 16 kHz mono float32 input.
+
+    Pipes the bytes through ffmpeg; formats that need a seekable input
+    (e.g. M4A with the index at the end) are spooled to tmpfs first.
+    """
+    result = _ffmpeg_pcm("pipe:0", data)
+    if result.returncode != 0 or not result.stdout:
+        fd, path = tempfile.mkstemp(dir=SPOOL_DIR, suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            result = _ffmpeg_pcm(path, None)
+        finally:
+            os.remove(path)
+        if result.returncode != 0:
+            raise RuntimeError(f"audio decode failed: {result.stderr.decode(errors='replace')[-500:]}")
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
 def cleanup_transcript(raw_text: str) -> str:
     """Run the LLM cleanup layer between Whisper and the engine.
 
@@ -42,17 +75,14 @@ def ping():
 
 @app.post("/transcribe")
 async def transcribe(audio: UploadFile, lang: Optional[str] = None):
-    path = None
     try:
         suffix = (os.path.splitext(getattr(audio, "filename", "") or "")[1]) or ".wav"
-        with tempfile.NamedTemporaryFile(delete=False, dir="/tmp", suffix=suffix) as tmp:
-            tmp.write(await audio.read())
-            path = tmp.name
+        samples = decode_audio(await audio.read(), suffix)
 
         model = load_model()
 
         result = model.transcribe(
-            path,
+            samples,
             language=(lang or None),
             fp16=False,
             verbose=False,
@@ -73,10 +103,3 @@ async def transcribe(audio: UploadFile, lang: Optional[str] = None):
     except Exception as e:
         log.exception("transcribe failed")
         raise HTTPException(status_code=500, detail=f"transcribe error: {e}")
-
-    finally:
-        if path:
-            try:
-                os.remove(path)
-            except Exception:
-                pass
@@ -1 +1,2 @@
 from .loader import load_roster, normalize_employee_name, get_roster_path  # noqa: F401
+from .matcher import RosterMatch, RosterMatcher, get_roster_matcher  # noqa: F401
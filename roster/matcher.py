@@ -0,0 +1,169 @@
+"""Multi-pattern roster name matcher (token-level Aho-Corasick).
+
+Every roster variant ("brooke neal", "lost him", "covid-19", ...) and every
+unambiguous first name is compiled once into an automaton over word tokens.
+A transcript is then scanned in one pass, yielding every roster mention with
+its character span and canonical name, instead of re-normalizing and looking
+up each token, then each bigram, per fragment.
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .loader import _first_name_index, load_roster
+
+# Word tokens as they appear in roster variants: letters/digits with inner
+# apostrophes or hyphens ("all's", "co-bin", "covid-19").
+_TOKEN_RE = re.compile(r"[\w'\-]+")
+
+
+class RosterMatch(NamedTuple):
+    start: int       # character offset in the scanned text
+    end: int         # character offset (exclusive)
+    variant: str     # normalized roster key that matched
+    name: str        # canonical "First Last"
+    tokens: int      # number of word tokens the variant spans
+
+
+def _normalize_key(raw: str) -> str:
+    return " ".join(raw.strip().lower().split())
+
+
+class _Node:
+    __slots__ = ("goto", "fail", "out")
+
+    def __init__(self) -> None:
+        self.goto: Dict[str, "_Node"] = {}
+        self.fail: Optional["_Node"] = None
+        # (token length, variant) for every pattern ending here, incl. via fail links
+        self.out: List[Tuple[int, str]] = []
+
+
+class RosterMatcher:
+    """
+    Aho-Corasick automaton whose alphabet is word tokens.
+
+    Matching is exact per token, so "austin" never matches inside "austins";
+    variants are matched case- and whitespace-insensitively.
+    """
+
+    def __init__(self, variants: Dict[str, str]):
+        self._names: Dict[str, str] = {}
+        self._root = _Node()
+        for raw_key, name in variants.items():
+            key = _normalize_key(raw_key)
+            if not key or not name or key in self._names:
+                continue
+            self._names[key] = name
+            self._insert(key)
+        self._build_fail_links()
+
+    def _insert(self, key: str) -> None:
+        node = self._root
+        tokens = key.split()
+        for tok in tokens:
+            node = node.goto.setdefault(tok, _Node())
+        node.out.append((len(tokens), key))
+
+    def _build_fail_links(self) -> None:
+        root = self._root
+        root.fail = root
+        queue = deque()
+        for child in root.goto.values():
+            child.fail = root
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for tok, child in node.goto.items():
+                fail = node.fail
+                while fail is not root and tok not in fail.goto:
+                    fail = fail.fail
+                child.fail = fail.goto.get(tok, root) if fail.goto.get(tok) is not child else root
+                child.out.extend(child.fail.out)
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def lookup(self, raw: str) -> Optional[str]:
+        """Exact (normalized) variant lookup."""
+        return self._names.get(_normalize_key(raw))
+
+    def _scan(self, tokens: Iterable[str]):
+        """Yield (end_token_index, token_length, variant) for every match."""
+        root = self._root
+        node = root
+        for i, tok in enumerate(tokens):
+            while node is not root and tok not in node.goto:
+                node = node.fail
+            node = node.goto.get(tok, root)
+            for length, variant in node.out:
+                yield i, length, variant
+
+    def find_all(self, text: str) -> List[RosterMatch]:
+        """Every roster mention in text, including overlapping ones, in scan order."""
+        spans = [(m.start(), m.end()) for m in _TOKEN_RE.finditer(text)]
+        tokens = [text[s:e].lower() for s, e in spans]
+        matches = []
+        for end_idx, length, variant in self._scan(tokens):
+            start = spans[end_idx - length + 1][0]
+            matches.append(
+                RosterMatch(start, spans[end_idx][1], variant, self._names[variant], length)
+            )
+        return matches
+
+    def find_mentions(self, text: str) -> List[RosterMatch]:
+        """Non-overlapping roster mentions, leftmost-longest, ordered by position."""
+        candidates = sorted(self.find_all(text), key=lambda m: (m.start, -m.end))
+        mentions: List[RosterMatch] = []
+        last_end = -1
+        for m in candidates:
+            if m.start >= last_end:
+                mentions.append(m)
+                last_end = m.end
+        return mentions
+
+    def resolve(self, raw: str) -> Optional[str]:
+        """
+        Resolve a name fragment to one employee.
+
+        Preference order: the whole fragment, then the first single word that
+        is a roster variant, then the first two-word variant.
+        """
+        key = _normalize_key(raw)
+        if not key:
+            return None
+        name = self._names.get(key)
+        if name:
+            return name
+
+        first_single = None
+        first_pair = None
+        for end_idx, length, variant in self._scan(key.split()):
+            if length == 1:
+                if first_single is None or end_idx < first_single[0]:
+                    first_single = (end_idx, variant)
+            elif length == 2:
+                if first_pair is None or end_idx < first_pair[0]:
+                    first_pair = (end_idx, variant)
+        if first_single:
+            return self._names[first_single[1]]
+        if first_pair:
+            return self._names[first_pair[1]]
+        return None
+
+
+def roster_variants(roster: Optional[dict] = None) -> Dict[str, str]:
+    """Roster variants plus unambiguous first names (roster entries win)."""
+    roster = roster if roster is not None else load_roster()
+    variants = {k: v for k, v in _first_name_index().items() if v}
+    variants.update({_normalize_key(k): v for k, v in roster.items()})
+    return variants
+
+
+@lru_cache(maxsize=1)
+def get_roster_matcher() -> RosterMatcher:
+    """Process-wide matcher over the canonical roster."""
+    return RosterMatcher(roster_variants())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark CPM parse_transcript_to_rows over the LPM weekly transcripts.
+
+Usage:
+    python scripts/bench_payroll_parser.py [--repeat N] [--glob PATTERN] [--dump FILE]
+
+Reports per-transcript parse latency (best/mean of N runs) so parser changes
+can be compared before and after. --dump writes the parsed rows as JSON so two
+runs can be diffed to confirm the output did not change.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from payroll_agent.CPM.engine.payroll_engine import TranscriptIn, parse_transcript_to_rows  # noqa: E402
+
+
+def _parse(path: Path):
+    payload = TranscriptIn(filename=path.name, transcript=path.read_text(encoding="utf-8"))
+    try:
+        return [r.model_dump() for r in parse_transcript_to_rows(payload)]
+    except Exception as e:  # HTTPException for transcripts with no name/amount pairs
+        return {"error": str(getattr(e, "detail", e))}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=20, help="Runs per transcript (default: 20)")
+    ap.add_argument(
+        "--glob",
+        default=str(project_root / "payroll_agent" / "LPM" / "*.txt"),
+        help="Transcript glob (default: payroll_agent/LPM/*.txt)",
+    )
+    ap.add_argument("--dump", help="Write parsed rows per transcript to this JSON file")
+    args = ap.parse_args()
+
+    # The engine logs every token at DEBUG; keep the benchmark about parsing.
+    logging.disable(logging.CRITICAL)
+
+    paths = sorted(Path(p) for p in glob.glob(args.glob))
+    if not paths:
+        print(f"No transcripts match {args.glob}")
+        return 1
+
+    results = {}
+    total_best = 0.0
+    print(f"{'transcript':<36} {'chars':>7} {'rows':>5} {'best ms':>9} {'mean ms':>9}")
+    for path in paths:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            out = _parse(path)
+            timings.append((time.perf_counter() - start) * 1000)
+        results[path.name] = out
+        best = min(timings)
+        total_best += best
+        n_rows = len(out) if isinstance(out, list) else 0
+        print(
+            f"{path.name:<36} {len(path.read_text(encoding='utf-8')):>7} {n_rows:>5} "
+            f"{best:>9.2f} {statistics.mean(timings):>9.2f}"
+        )
+
+    print(f"\n{len(paths)} transcripts, total best {total_best:.1f} ms, "
+          f"avg {total_best / len(paths):.2f} ms/transcript")
+
+    if args.dump:
+        with open(args.dump, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True, default=str)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,16 +31,14 @@ from inventory_agent.catalog_loader import load_catalog
 def collect_unmatched(transcript_path: Path, catalog: Dict) -> List[str]:
     """Run the parser and return unmatched lines."""
     global_rules = catalog.get("global_rules", {})
-    unmatched: List[str] = []
     with transcript_path.open("r") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            cat, canonical, qty, score, kw = inv_parser.parse_line(line, catalog, global_rules)
-            if not (cat and canonical and qty is not None):
-                unmatched.append(line)
-    return unmatched
+        lines = [line.strip() for line in f if line.strip()]
+    parsed = inv_parser.parse_lines(lines, catalog, global_rules)
+    return [
+        line
+        for line, (cat, canonical, qty, score, kw) in zip(lines, parsed)
+        if not (cat and canonical and qty is not None)
+    ]
 
 
 def flatten_items(catalog: Dict) -> List[Tuple[str, str]]:
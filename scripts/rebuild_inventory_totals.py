@@ -0,0 +1,33 @@
+"""
+Rebuild the stored inventory totals for one or more periods.
+
+approve/update/delete keep periods/{period_id}/totals.json current as they
+go; run this to repair a period whose totals drifted (e.g. after editing
+shelfy objects by hand in the bucket).
+
+Usage:
+    python -m scripts.rebuild_inventory_totals 2026-01-31 2026-02-28
+    python -m scripts.rebuild_inventory_totals --bucket my-project_inventory 2026-01-31
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from mise_app.shelfy_storage import INVENTORY_BUCKET, ShelfyStorage
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Rebuild stored inventory totals from shelfies")
+    ap.add_argument("period_ids", nargs="+", help="Period IDs (YYYY-MM-DD, last day of month)")
+    ap.add_argument("--bucket", default=INVENTORY_BUCKET, help=f"GCS bucket (default: {INVENTORY_BUCKET})")
+    args = ap.parse_args()
+
+    storage = ShelfyStorage(bucket_name=args.bucket)
+    for period_id in args.period_ids:
+        agg = storage.rebuild_aggregate(period_id)
+        print(f"✔ {period_id}: {len(agg['shelfies'])} approved shelfies, {len(agg['all'])} products")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import pytest
+
+from inventory_agent.catalog_index import CatalogIndex, SynonymTable, get_catalog_index, get_synonym_table
+from inventory_agent.parser import normalize_line_with_catalog, parse_line, parse_lines
+
+
+CATALOG = {
+    "global_rules": {"fuzzy_match_threshold": 0.78},
+    "beer": [
+        {"item": "Coors Light 12oz Can", "keywords": ["coors", "light", "can"], "case_size": 24},
+        {"item": "Miller Lite 12oz Can", "keywords": ["miller", "lite", "can"]},
+    ],
+    "wine": [
+        {"item": "Justin Cabernet", "keywords": ["cabernet", "justin"], "phonetic": ["cab"]},
+    ],
+}
+
+
+def test_duplicate_keywords_resolve_to_first_item():
+    index = CatalogIndex(CATALOG)
+
+    score, match = index.best_match("two cans")
+
+    assert score == 1.0
+    assert match.item == "Coors Light 12oz Can"
+    assert index.choices.count("can") == 1
+
+
+def test_parse_line_returns_catalog_tuple():
+    rules = CATALOG["global_rules"]
+    assert parse_line("two cases of miller", CATALOG, rules) == (
+        "beer", "Miller Lite 12oz Can", 24.0, 1.0, "miller",
+    )
+    assert parse_line("three zzz", CATALOG, rules)[:3] == (None, None, None)
+
+
+def test_index_is_cached_and_rebuilt_when_catalog_grows():
+    catalog = {k: list(v) if isinstance(v, list) else v for k, v in CATALOG.items()}
+    first = get_catalog_index(catalog)
+    assert get_catalog_index(catalog) is first
+
+    catalog["wine"].append({"item": "Meiomi Pinot Noir", "keywords": ["meiomi"]})
+    rebuilt = get_catalog_index(catalog)
+
+    assert rebuilt is not first
+    assert rebuilt.best_match("one meiomi")[1].item == "Meiomi Pinot Noir"
+
+
+def test_parse_lines_matches_parse_line_on_both_paths():
+    pytest.importorskip("numpy")
+    rules = CATALOG["global_rules"]
+    lines = ["two cases of miller", "half a cab", "three zzz", "no quantity here", "one coors light"]
+    expected = [parse_line(line, CATALOG, rules) for line in lines]
+
+    assert parse_lines(lines, CATALOG, rules) == expected
+    assert parse_lines(lines, CATALOG, rules, workers=-1) == expected
+
+
+def test_synonyms_replace_whole_words_in_one_pass():
+    table = SynonymTable(CATALOG)
+
+    # "justin" expands to a name containing "cabernet", which must not be re-matched
+    assert table.replace("two justin") == ("two justin cabernet", 1)
+    # longest synonym wins; words merely containing one are left alone
+    assert table.replace("coors light 12oz can and coorsy") == ("coors light 12oz can and coorsy", 1)
+    assert table.canonical["miller"] == "Miller Lite 12oz Can"
+    assert "cab" not in table.canonical
+
+
+def test_normalize_line_falls_back_to_fuzzy_match():
+    assert normalize_line_with_catalog("two Justin", CATALOG) == "two justin cabernet"
+    assert normalize_line_with_catalog("cabernett", CATALOG) == "justin cabernett"
+    assert normalize_line_with_catalog("zzz", CATALOG) == "zzz"
+
+
+def test_synonym_table_is_cached_per_catalog():
+    catalog = {k: list(v) if isinstance(v, list) else v for k, v in CATALOG.items()}
+    first = get_synonym_table(catalog)
+    assert get_synonym_table(catalog) is first
+
+    catalog["wine"].append({"item": "Meiomi Pinot Noir", "keywords": ["meiomi"]})
+
+    assert get_synonym_table(catalog) is not first
+    assert get_synonym_table(catalog).canonical["meiomi"] == "Meiomi Pinot Noir"
@@ -0,0 +1,101 @@
+"""Tests for the shared, hot-reloading inventory catalog store."""
+
+import copy
+import json
+import os
+
+import pytest
+
+from inventory_agent.catalog_store import CatalogStore, FrozenDict, get_catalog_store
+
+
+def _write(path, catalog, mtime_ns=None):
+    path.write_text(json.dumps(catalog))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+CATALOG = {
+    "global_rules": {"fuzzy_match_threshold": 0.65},
+    "beer_cost": [{"item": "Coors Light 12oz Can", "report_by_unit": "Can"}],
+    "grocery_and_dry_goods": [{"item": "Seasoning, Tajin", "report_by_unit": "Pound"}],
+}
+
+
+def test_parses_once_and_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "catalog.json"
+    _write(path, CATALOG, mtime_ns=1_000_000_000)
+    store = CatalogStore(path)
+
+    first = store.get()
+    assert store.get() is first
+    assert store.version == 1
+
+    updated = dict(CATALOG, wine_cost=[{"item": "Justin Cabernet"}])
+    _write(path, updated, mtime_ns=2_000_000_000)
+
+    assert "wine_cost" in store.get()
+    assert store.version == 2
+
+
+def test_views_are_read_only_and_copies_are_mutable(tmp_path):
+    path = tmp_path / "catalog.json"
+    _write(path, CATALOG)
+    catalog = CatalogStore(path).get()
+
+    assert isinstance(catalog["beer_cost"], list)
+    with pytest.raises(TypeError):
+        catalog["beer_cost"].append({"item": "x"})
+    with pytest.raises(TypeError):
+        catalog["beer_cost"][0]["item"] = "x"
+
+    mutable = copy.deepcopy(catalog)
+    mutable["beer_cost"].append({"item": "x"})
+    assert type(mutable) is dict
+    assert len(catalog["beer_cost"]) == 1
+
+
+def test_slices_and_cached_values_follow_the_version(tmp_path):
+    path = tmp_path / "catalog.json"
+    _write(path, CATALOG, mtime_ns=1_000_000_000)
+    store = CatalogStore(path)
+
+    bar = store.slice("bar")
+    assert list(bar) == ["beer_cost"]
+    assert store.slice("bar") is bar
+    assert "global_rules" not in store.slice("all")
+
+    builds = []
+    store.cached("n", lambda: builds.append(1) or len(store.get()))
+    store.cached("n", lambda: builds.append(1) or len(store.get()))
+    assert len(builds) == 1
+
+    _write(path, dict(CATALOG, wine_cost=[]), mtime_ns=2_000_000_000)
+    assert list(store.slice("bar")) == ["beer_cost", "wine_cost"]
+    assert store.cached("n", lambda: builds.append(1) or len(store.get())) == 4
+    assert len(builds) == 2
+
+
+def test_bad_reload_keeps_last_good_catalog(tmp_path):
+    path = tmp_path / "catalog.json"
+    _write(path, CATALOG, mtime_ns=1_000_000_000)
+    store = CatalogStore(path)
+    good = store.get()
+
+    path.write_text("{not json")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+
+    assert store.get() is good
+    assert store.version == 1
+
+
+def test_missing_file_is_empty(tmp_path):
+    store = CatalogStore(tmp_path / "missing.json")
+    assert store.get() == {}
+    assert isinstance(store.get(), FrozenDict)
+
+
+def test_store_is_shared_per_path(tmp_path):
+    path = tmp_path / "catalog.json"
+    _write(path, CATALOG)
+    assert get_catalog_store(path) is get_catalog_store(str(path))
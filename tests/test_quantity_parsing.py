@@ -1,6 +1,7 @@
 import pytest
 
 from inventory_agent.parser import parse_quantity
+from inventory_agent.quantity import QuantityToken, scan_quantities
 
 
 @pytest.mark.parametrize(
@@ -21,3 +22,22 @@ def test_parse_quantity_fraction_and_percent(text, expected):
 
 def test_parse_quantity_word_number():
     assert parse_quantity("two bottles", {"fraction_words": {}}) == 2.0
+
+
+def test_scan_quantities_returns_structured_tokens():
+    tokens = scan_quantities("4 six packs of coors and 80% of a bottle")
+
+    assert tokens[0] == QuantityToken("pack", 4.0, "pack", 6, (0, 10))
+    assert [t.kind for t in tokens] == ["pack", "percent", "unit"]
+    assert tokens[1].value == pytest.approx(0.8)
+    assert tokens[2].unit == "bottle"
+
+
+def test_parse_quantity_precedence():
+    rules = {"fraction_words": {"sliver": 0.1}}
+
+    assert parse_quantity("3 bottles half full", rules) == 0.5
+    assert parse_quantity("quarter bottle and half a can", rules) == 0.5
+    assert parse_quantity("two bottles 50%", rules) == 0.5
+    assert parse_quantity("a sliver left", rules) == 0.1
+    assert parse_quantity("one, two bottles", rules) is None
@@ -0,0 +1,285 @@
+"""Tests for ShelfyStorage's per-shelfy object layout."""
+
+import json
+
+import pytest
+
+pytest.importorskip("google.cloud.storage")
+
+from google.api_core.exceptions import NotFound, PreconditionFailed  # noqa: E402
+
+from mise_app.shelfy_storage import ShelfyStorage  # noqa: E402
+from mise_app.storage_backend import WriteConflict  # noqa: E402
+
+PERIOD = "2026-01-31"
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.generation = None
+
+    def download_as_text(self):
+        self.bucket.downloads.append(self.name)
+        if self.name not in self.bucket.objects:
+            raise NotFound(self.name)
+        self.generation = self.bucket.generations[self.name]
+        return self.bucket.objects[self.name]
+
+    def upload_from_string(self, content, content_type=None, if_generation_match=None):
+        if self.bucket.before_upload:
+            self.bucket.before_upload.pop(0)(self.name)
+        current = self.bucket.generations.get(self.name, 0)
+        if if_generation_match is not None and if_generation_match != current:
+            raise PreconditionFailed(self.name)
+        self.bucket.uploads.append(self.name)
+        self.bucket.objects[self.name] = content
+        self.bucket.generation += 1
+        self.generation = self.bucket.generations[self.name] = self.bucket.generation
+
+    def delete(self):
+        if self.bucket.objects.pop(self.name, None) is None:
+            raise NotFound(self.name)
+        del self.bucket.generations[self.name]
+
+
+class FakeBucket:
+    """In-memory stand-in for a GCS bucket with object generations."""
+
+    def __init__(self):
+        self.objects = {}
+        self.generations = {}
+        self.generation = 0
+        self.downloads = []
+        self.uploads = []
+        # Callbacks run (once each) just before the next uploads, to simulate
+        # another instance writing between our read and write
+        self.before_upload = []
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+def _storage():
+    storage = ShelfyStorage(bucket_name="test")
+    storage._bucket = FakeBucket()
+    return storage
+
+
+def _items(*quantities):
+    return {"items": [{"product_name": f"Item {i}", "quantity": q, "unit": "each"} for i, q in enumerate(quantities)]}
+
+
+def test_single_shelfy_operations_touch_one_object():
+    storage = _storage()
+    storage.add_shelfy(PERIOD, "s1", "Walk-in", "kitchen", "long transcript", "a.wav", _items(1))
+    storage.add_shelfy(PERIOD, "s2", "Back Bar", "bar", "another transcript", "b.wav")
+    bucket = storage.bucket
+
+    bucket.downloads.clear()
+    assert storage.get_shelfy(PERIOD, "s2")["transcript"] == "another transcript"
+    assert bucket.downloads == [f"periods/{PERIOD}/shelfies/s2.json"]
+
+    index = json.loads(bucket.objects[f"periods/{PERIOD}/index.json"])
+    assert [e["shelfy_id"] for e in index["shelfies"]] == ["s1", "s2"]
+    assert "transcript" not in index["shelfies"][0]
+    assert index["shelfies"][0]["item_count"] == 1
+
+
+def test_approve_update_and_delete_keep_manifest_in_sync():
+    storage = _storage()
+    storage.add_shelfy(PERIOD, "s1", "Walk-in", "kitchen", "t", "a.wav", _items(1))
+    storage.add_shelfy(PERIOD, "s2", "Back Bar", "bar", "t", "b.wav", _items(2))
+
+    assert storage.approve_shelfy(PERIOD, "s1")
+    assert storage.update_shelfy_inventory(PERIOD, "s2", _items(2, 3))
+    assert not storage.approve_shelfy(PERIOD, "missing")
+
+    entries = {e["shelfy_id"]: e for e in storage.list_shelfies(PERIOD)}
+    assert entries["s1"]["status"] == "approved"
+    assert entries["s2"]["item_count"] == 2
+    assert storage.get_shelfy(PERIOD, "s2")["inventory_json"] == _items(2, 3)
+
+    assert storage.delete_shelfy(PERIOD, "s2")
+    assert not storage.delete_shelfy(PERIOD, "s2")
+    assert [s["shelfy_id"] for s in storage.get_all_shelfies(PERIOD)] == ["s1"]
+    assert f"periods/{PERIOD}/shelfies/s2.json" not in storage.bucket.objects
+
+
+def test_summary_reads_only_the_manifest():
+    storage = _storage()
+    for i in range(5):
+        storage.add_shelfy(PERIOD, f"s{i}", "Walk-in", "kitchen" if i % 2 else "bar", "t", "a.wav")
+    storage.approve_shelfy(PERIOD, "s0")
+
+    storage.bucket.downloads.clear()
+    summary = storage.get_period_summary(PERIOD)
+
+    assert storage.bucket.downloads == [f"periods/{PERIOD}/index.json"]
+    assert summary["total_shelfies"] == 5
+    assert summary["approved_count"] == 1
+    assert summary["bar_count"] == 3
+
+
+def test_aggregated_totals_read_only_the_stored_aggregate():
+    storage = _storage()
+    storage.add_shelfy(PERIOD, "s1", "Walk-in", "bar", "t", "a.wav", _items(2))
+    storage.add_shelfy(PERIOD, "s2", "Back Bar", "bar", "t", "b.wav", _items(3))
+    storage.add_shelfy(PERIOD, "s3", "Back Bar", "bar", "t", "c.wav", _items(5))
+    storage.approve_shelfy(PERIOD, "s1")
+    storage.approve_shelfy(PERIOD, "s2")
+
+    storage.bucket.downloads.clear()
+    totals = storage.get_aggregated_totals(PERIOD, category="bar")
+
+    assert storage.bucket.downloads == [f"periods/{PERIOD}/totals.json"]
+    assert totals["shelfies_count"] == 2
+    assert totals["items"][0]["total_quantity"] == 5
+    assert [b["shelfy_id"] for b in totals["items"][0]["breakdown"]] == ["s1", "s2"]
+
+
+def test_aggregate_follows_approve_edit_and_delete():
+    storage = _storage()
+    storage.add_shelfy(PERIOD, "s1", "Walk-in", "kitchen", "t", "a.wav", _items(2))
+    storage.add_shelfy(PERIOD, "s2", "Back Bar", "bar", "t", "b.wav", _items(3, 1))
+    storage.approve_shelfy(PERIOD, "s1")
+    storage.approve_shelfy(PERIOD, "s2")
+
+    def totals(category=None):
+        return {i["product_name"]: i["total_quantity"] for i in storage.get_aggregated_totals(PERIOD, category)["items"]}
+
+    assert totals() == {"Item 0": 5, "Item 1": 1}
+    assert totals("kitchen") == {"Item 0": 2}
+
+    storage.update_shelfy_inventory(PERIOD, "s2", _items(10))
+    assert totals() == {"Item 0": 12}
+    assert totals("bar") == {"Item 0": 10}
+
+    storage.delete_shelfy(PERIOD, "s1")
+    assert totals() == {"Item 0": 10}
+    assert totals("kitchen") == {}
+    assert storage.get_aggregated_totals(PERIOD, "kitchen")["shelfies_count"] == 0
+
+
+def test_rebuild_aggregate_repairs_drift():
+    storage = _storage()
+    storage.add_shelfy(PERIOD, "s1", "Walk-in", "bar", "t", "a.wav", _items(2))
+    storage.approve_shelfy(PERIOD, "s1")
+    expected = storage.get_aggregated_totals(PERIOD)
+
+    storage.bucket.objects[f"periods/{PERIOD}/totals.json"] = json.dumps(
+        {"shelfies": {}, "all": {}, "by_category": {}}
+    )
+    assert storage.get_aggregated_totals(PERIOD)["items"] == []
+
+    storage.rebuild_aggregate(PERIOD)
+    assert storage.get_aggregated_totals(PERIOD) == expected
+
+
+def test_legacy_period_blob_is_migrated():
+    storage = _storage()
+    legacy = [
+        {"shelfy_id": "old1", "area": "Walk-in", "category": "kitchen", "status": "approved",
+         "transcript": "t", "inventory_json": _items(4)},
+        {"shelfy_id": "old2", "area": "Misc", "category": "bar", "status": "pending_approval", "transcript": "t"},
+    ]
+    storage.bucket.blob(f"periods/{PERIOD}/shelfies.json").upload_from_string(json.dumps(legacy))
+
+    assert storage.get_shelfy(PERIOD, "old2")["area"] == "Misc"
+    assert [e["shelfy_id"] for e in storage.list_shelfies(PERIOD)] == ["old1", "old2"]
+    assert storage.get_all_shelfies(PERIOD) == legacy
+    assert storage.get_aggregated_totals(PERIOD)["items"][0]["total_quantity"] == 4
+
+
+def test_concurrent_adds_are_merged_into_the_manifest():
+    storage = _storage()
+    storage.add_shelfy(PERIOD, "s1", "Walk-in", "kitchen", "t", "a.wav")
+    other = ShelfyStorage(bucket_name="test")
+    other._bucket = storage.bucket
+
+    index_path = f"periods/{PERIOD}/index.json"
+
+    def race(name):
+        if name == index_path:
+            other.add_shelfy(PERIOD, "s3", "Misc", "bar", "t", "c.wav")
+        else:
+            storage.bucket.before_upload.append(race)
+
+    storage.bucket.before_upload.append(race)
+    storage.add_shelfy(PERIOD, "s2", "Back Bar", "bar", "t", "b.wav")
+
+    assert [e["shelfy_id"] for e in storage.list_shelfies(PERIOD)] == ["s1", "s3", "s2"]
+
+
+def test_concurrent_approve_and_edit_both_survive():
+    storage = _storage()
+    storage.add_shelfy(PERIOD, "s1", "Walk-in", "kitchen", "t", "a.wav", _items(1))
+    shelfy_path = f"periods/{PERIOD}/shelfies/s1.json"
+
+    def race(name):
+        assert name == shelfy_path
+        storage.update_shelfy_inventory(PERIOD, "s1", _items(1, 2, 3))
+
+    storage.bucket.before_upload.append(race)
+    assert storage.approve_shelfy(PERIOD, "s1")
+
+    shelfy = storage.get_shelfy(PERIOD, "s1")
+    assert shelfy["status"] == "approved"
+    assert len(shelfy["inventory_json"]["items"]) == 3
+    entry = storage.list_shelfies(PERIOD)[0]
+    assert entry["status"] == "approved"
+    assert entry["item_count"] == 3
+
+
+def test_persistent_conflicts_give_up():
+    storage = _storage()
+    storage.add_shelfy(PERIOD, "s1", "Walk-in", "kitchen", "t", "a.wav")
+    bucket = storage.bucket
+
+    def bump(name):
+        bucket.generations[name] = bucket.generation = bucket.generation + 1
+
+    bucket.before_upload.extend([bump] * 10)
+    with pytest.raises(WriteConflict):
+        storage.approve_shelfy(PERIOD, "s1")
+
+
+def test_updates_skip_the_pre_read():
+    storage = _storage()
+    storage.add_shelfy(PERIOD, "s1", "Walk-in", "kitchen", "t", "a.wav", _items(1))
+    storage.approve_shelfy(PERIOD, "s1")
+    bucket = storage.bucket
+
+    bucket.downloads.clear()
+    storage.update_shelfy_inventory(PERIOD, "s1", _items(2))
+
+    # CAS reads only, plus the shelfy re-reads that refresh the manifest and totals
+    shelfy, index, totals = (f"periods/{PERIOD}/{name}" for name in ("shelfies/s1.json", "index.json", "totals.json"))
+    assert bucket.downloads == [shelfy, index, shelfy, totals, shelfy]
+
+
+def test_legacy_migration_keeps_already_migrated_shelfies():
+    storage = _storage()
+    legacy = [
+        {"shelfy_id": "old1", "area": "Walk-in", "category": "kitchen", "status": "pending_approval", "transcript": "t"},
+    ]
+    bucket = storage.bucket
+    bucket.blob(f"periods/{PERIOD}/shelfies.json").upload_from_string(json.dumps(legacy))
+    # Another instance migrated the object and approved it before writing the manifest
+    migrated = dict(legacy[0], status="approved")
+    bucket.blob(f"periods/{PERIOD}/shelfies/old1.json").upload_from_string(json.dumps(migrated))
+
+    assert storage.list_shelfies(PERIOD)[0]["shelfy_id"] == "old1"
+    assert storage.get_shelfy(PERIOD, "old1")["status"] == "approved"
+
+
+def test_legacy_period_can_be_updated_before_it_is_read():
+    storage = _storage()
+    legacy = [{"shelfy_id": "old1", "area": "Walk-in", "category": "kitchen", "status": "pending_approval",
+               "transcript": "t", "inventory_json": _items(4)}]
+    storage.bucket.blob(f"periods/{PERIOD}/shelfies.json").upload_from_string(json.dumps(legacy))
+
+    assert storage.approve_shelfy(PERIOD, "old1")
+    assert storage.list_shelfies(PERIOD)[0]["status"] == "approved"
+    assert storage.get_aggregated_totals(PERIOD)["items"][0]["total_quantity"] == 4
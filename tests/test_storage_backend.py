@@ -0,0 +1,51 @@
+"""Tests for versioned writes in the local storage backend."""
+
+import pytest
+
+from mise_app.storage_backend import LocalStorage, WriteConflict
+
+
+def test_versioned_write_rejects_stale_version(tmp_path):
+    backend = LocalStorage(tmp_path)
+    assert backend.read_json_versioned("a/state.json") == (None, 0)
+
+    v1 = backend.write_json("a/state.json", {"n": 1}, if_version=0)
+    data, version = backend.read_json_versioned("a/state.json")
+    assert data == {"n": 1} and version == v1
+
+    with pytest.raises(WriteConflict):
+        backend.write_json("a/state.json", {"n": 2}, if_version=0)
+
+    backend.write_json("a/state.json", {"n": 3})
+    with pytest.raises(WriteConflict):
+        backend.write_json("a/state.json", {"n": 4}, if_version=v1)
+    assert backend.read_json("a/state.json") == {"n": 3}
+
+
+def test_update_json_reapplies_after_conflict(tmp_path):
+    backend = LocalStorage(tmp_path)
+    backend.write_json("queue.json", ["a"])
+    calls = []
+
+    def append_b(data):
+        calls.append(list(data))
+        if len(calls) == 1:
+            # Another writer appends between our read and write
+            backend.write_json("queue.json", data + ["c"])
+        return data + ["b"]
+
+    assert backend.update_json("queue.json", append_b, default=list) == ["a", "c", "b"]
+    assert calls == [["a"], ["a", "c"]]
+    assert backend.read_json("queue.json") == ["a", "c", "b"]
+
+
+def test_update_json_gives_up_when_always_contended(tmp_path):
+    backend = LocalStorage(tmp_path)
+    races = iter(range(100))
+
+    def always_race(data):
+        backend.write_json("n.json", {"n": next(races)})
+        return {"n": -1}
+
+    with pytest.raises(WriteConflict):
+        backend.update_json("n.json", always_race, default=dict, attempts=3)
@@ -73,6 +73,25 @@ class TestPayrollProcessAudio:
         result = agent.process_audio(b"fake-audio-bytes", shift_code="ThPM")
         assert result["status"] == "success"
 
+    @patch("transrouter.src.agents.payroll_agent.get_asr_provider")
+    def test_async_pipeline_matches_sync(self, mock_get_asr):
+        import asyncio
+        from unittest.mock import AsyncMock
+        from transrouter.src.claude_client import ClaudeResponse
+
+        mock_get_asr.return_value = self._mock_asr()
+        agent = self._make_agent(SAMPLE_PAYROLL_APPROVAL_JSON)
+        async_client = MagicMock()
+        async_client.call = AsyncMock(return_value=agent.claude_client.call.return_value)
+        agent._async_claude_client = async_client
+
+        result = asyncio.run(agent.process_audio_async(b"fake-audio-bytes", shift_code="ThPM"))
+
+        assert result["status"] == "success"
+        assert result["approval_json"] == SAMPLE_PAYROLL_APPROVAL_JSON
+        async_client.call.assert_awaited_once()
+        agent.claude_client.call.assert_not_called()
+
 
 # ============================================================================
 # PayrollAgent.process_with_clarification_dict (mocked)
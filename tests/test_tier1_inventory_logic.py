@@ -142,6 +142,63 @@ class TestConversionDisplay:
         assert result is None
 
 
+# ============================================================================
+# Catalog Unit Lookup
+# ============================================================================
+
+
+class TestCatalogLookup:
+    """Test CatalogLookup / _find_catalog_unit()."""
+
+    CATALOG = {
+        "global_rules": {"fuzzy_match_threshold": 0.65},
+        "n_a_beverage_cost": [
+            {"item": "Juice, Orange", "report_by_unit": "0.5 Gallons"},
+            {"item": "Juice, Orange 32oz", "report_by_unit": "32 Fluid Ounces"},
+        ],
+        "beer_cost": [
+            {"name": "Coors Light 12oz Can", "report_by_unit": "Can"},
+            {"name": "High Rise Blueberry 12oz Can", "report_by_unit": "Can (12 Fluid Ounces)"},
+        ],
+    }
+
+    def _lookup(self):
+        from transrouter.src.agents.inventory_agent import CatalogLookup
+        return CatalogLookup(self.CATALOG)
+
+    def test_exact_name_beats_earlier_partial_match(self):
+        assert self._lookup().report_by_unit("juice, orange 32oz") == "32 Fluid Ounces"
+
+    def test_normalized_name_ignores_punctuation(self):
+        assert self._lookup().report_by_unit("Juice Orange") == "0.5 Gallons"
+
+    def test_containment_in_either_direction(self):
+        lookup = self._lookup()
+        assert lookup.report_by_unit("high rise blueberry") == "Can (12 Fluid Ounces)"
+        assert lookup.report_by_unit("Coors Light 12oz Can (case)") == "Can"
+
+    def test_name_key_entries_are_indexed(self):
+        from transrouter.src.agents.inventory_agent import _find_catalog_unit
+        assert _find_catalog_unit("Coors Light", self.CATALOG) == "Can"
+
+    def test_unknown_product(self):
+        lookup = self._lookup()
+        assert lookup.report_by_unit("Tito's") is None
+        assert lookup.report_by_unit("") is None
+
+    def test_enrichment_uses_catalog_unit(self):
+        from transrouter.src.agents.inventory_agent import InventoryAgent
+        from unittest.mock import MagicMock
+        agent = InventoryAgent(claude_client=MagicMock())
+        agent._catalog = self.CATALOG
+        data = {"category": "bar", "items": [{"product_name": "High Rise Blueberry", "quantity": 6, "unit": "4-packs"}]}
+
+        item = agent._enrich_with_conversions(data)["items"][0]
+
+        assert item["base_unit"] == "cans"
+        assert item["conversion_display"] == "6 × 4 = 24 cans"
+
+
 # ============================================================================
 # Enrichment (Conversion Fields Added to Items)
 # ============================================================================
@@ -0,0 +1,176 @@
+"""Unit tests for the CPM BulkShiftWriter."""
+
+import time
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("google.cloud.bigquery")
+
+from payroll_agent.CPM.engine.database import BufferFull, BulkShiftWriter  # noqa: E402
+
+
+class FakeBackend:
+    def __init__(self, fail=False, poison=()):
+        self.calls = []
+        self.fail = fail
+        self.poison = set(poison)
+
+    def insert_shift_rows_bulk(self, rows, row_ids, batch_size=500):
+        if self.fail:
+            raise Exception("db down")
+        if self.poison.intersection(row_ids):
+            raise Exception("bad row")
+        self.calls.append(list(row_ids))
+        return {"ok": True, "inserted": len(rows)}
+
+    def health_check(self):
+        return {"status": "unhealthy" if self.fail else "healthy"}
+
+
+def _rows(n, prefix="r"):
+    return [{"employee": f"e{i}"} for i in range(n)], [f"{prefix}{i}" for i in range(n)]
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+
+def test_flushes_when_size_limit_reached():
+    backend = FakeBackend()
+    writer = BulkShiftWriter(backend, max_rows=5, max_age_s=60)
+
+    writer.add(*_rows(3, "a"))
+    assert backend.calls == []
+    writer.add(*_rows(3, "b"))
+    _wait_for(lambda: backend.calls)
+
+    assert backend.calls == [["a0", "a1", "a2", "b0", "b1", "b2"]]
+    stats = writer.stats()
+    assert stats["flushes"] == 1
+    assert stats["rows_flushed"] == 6
+    assert stats["buffered"] == 0
+    assert stats["last_flush_ms"] is not None
+    writer.close()
+
+
+def test_flushes_when_age_limit_reached():
+    backend = FakeBackend()
+    writer = BulkShiftWriter(backend, max_rows=1000, max_age_s=0.1)
+
+    writer.add(*_rows(2))
+    _wait_for(lambda: backend.calls)
+
+    assert backend.calls == [["r0", "r1"]]
+    writer.close()
+
+
+def test_failed_flush_requeues_rows():
+    backend = FakeBackend(fail=True)
+    writer = BulkShiftWriter(backend, max_rows=1000, max_age_s=60)
+    writer.add(*_rows(2))
+
+    with pytest.raises(Exception):
+        writer.flush()
+    assert writer.stats()["buffered"] == 2
+    assert writer.stats()["flush_errors"] == 1
+
+    backend.fail = False
+    writer.close()
+    assert backend.calls == [["r0", "r1"]]
+
+
+def test_add_never_writes_on_the_callers_thread():
+    import threading
+
+    class RecordingBackend(FakeBackend):
+        def insert_shift_rows_bulk(self, rows, row_ids, batch_size=500):
+            self.thread = threading.current_thread()
+            return super().insert_shift_rows_bulk(rows, row_ids, batch_size)
+
+    backend = RecordingBackend(fail=True)
+    writer = BulkShiftWriter(backend, max_rows=3, max_age_s=60)
+
+    assert writer.add(*_rows(3)) == 3  # accepted; no error for the caller to retry on
+    _wait_for(lambda: writer.stats()["flush_errors"])
+    assert backend.thread is not threading.current_thread()
+    assert writer.stats()["buffered"] == 3
+
+    backend.fail = False
+    writer.close()
+    assert backend.calls == [["r0", "r1", "r2"]]
+
+
+def test_poison_row_is_dead_lettered_after_max_attempts():
+    backend = FakeBackend(poison={"r1"})
+    writer = BulkShiftWriter(backend, max_rows=1000, max_age_s=60, max_attempts=2)
+    writer.add(*_rows(3))
+
+    with pytest.raises(Exception):
+        writer.flush()
+    assert writer.stats()["buffered"] == 3
+
+    result = writer.flush()
+    assert result == {"ok": False, "inserted": 2, "dead_lettered": 1, "requeued": 0}
+    assert backend.calls == [["r0"], ["r2"]]
+    stats = writer.stats()
+    assert stats["buffered"] == 0
+    assert stats["rows_dead_lettered"] == 1
+    assert stats["dead_letter_ids"] == ["r1"]
+    assert writer.dead_letters()[0]["error"] == "bad row"
+    writer.close()
+
+
+def test_rows_are_kept_while_database_is_unhealthy():
+    backend = FakeBackend(fail=True)
+    writer = BulkShiftWriter(backend, max_rows=1000, max_age_s=60, max_attempts=1)
+    writer.add(*_rows(2))
+
+    for _ in range(3):
+        with pytest.raises(Exception):
+            writer.flush()
+    assert writer.stats()["buffered"] == 2
+    assert writer.stats()["rows_dead_lettered"] == 0
+    writer.close()
+
+
+def test_close_logs_instead_of_raising():
+    writer = BulkShiftWriter(FakeBackend(fail=True), max_rows=1000, max_age_s=60)
+    writer.add(*_rows(2))
+
+    writer.close()
+    assert writer.stats()["buffered"] == 2
+
+
+def test_full_buffer_rejects_new_rows_only():
+    backend = FakeBackend(fail=True)
+    writer = BulkShiftWriter(backend, max_rows=1000, max_age_s=60, max_buffered=4)
+    writer.add(*_rows(2, "a"))
+    writer.add(*_rows(2, "b"))
+
+    with pytest.raises(BufferFull):
+        writer.add(*_rows(1, "c"))
+    stats = writer.stats()
+    assert stats["buffered"] == 4
+    assert stats["rows_rejected"] == 1
+
+    backend.fail = False
+    writer.close()
+    assert backend.calls == [["a0", "a1", "b0", "b1"]]
+
+
+def test_deferred_commit_reports_queued_or_retry(monkeypatch):
+    import asyncio
+
+    from payroll_agent.CPM.engine import commit_shift
+
+    writer = BulkShiftWriter(FakeBackend(fail=True), max_rows=1000, max_age_s=60, max_buffered=1)
+    monkeypatch.setattr(commit_shift, "get_bulk_writer", lambda: writer)
+    payload = {"filename": "f.wav", "defer": True, "rows": [{"employee": "Kevin Worley", "date": "2026-01-05"}]}
+
+    assert asyncio.run(commit_shift.commit_shift(payload)) == {"ok": True, "inserted": 0, "queued": 1}
+    second = asyncio.run(commit_shift.commit_shift(payload))
+    assert second["ok"] is False and second["retry"] is True
+    assert writer.stats()["buffered"] == 1
@@ -0,0 +1,98 @@
+"""Unit tests for the CPM batch parsing endpoints."""
+
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("google.cloud.bigquery")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from payroll_agent.CPM.engine import parse_batch, payroll_engine  # noqa: E402
+
+MONDAY = {
+    "filename": "monday_am_120925.wav",
+    "transcript": "Monday December 9th, 2025. AM shift. Servers Mike Walton $300.67, "
+    "John Neal $250.45, Kevin Worley $275.30.",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Serial parsing keeps the test in-process (no pool workers)
+    monkeypatch.setattr(parse_batch, "PARSE_BATCH_WORKERS", 1)
+    app = FastAPI()
+    app.include_router(parse_batch.router)
+    return TestClient(app)
+
+
+def _zip(files):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, text in files.items():
+            zf.writestr(name, text)
+    return buf.getvalue()
+
+
+def test_batch_parses_each_transcript_in_order(client):
+    bad = {"filename": "garbage.wav", "transcript": "nothing useful here"}
+    response = client.post("/parse_batch", json={"transcripts": [MONDAY, bad]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [f["filename"] for f in data["files"]] == ["monday_am_120925.wav", "garbage.wav"]
+    assert len(data["files"][0]["rows"]) == 3
+    assert data["stats"]["files"] == 2
+    assert "commit" not in data
+
+
+def test_batch_validates_transcripts(client):
+    response = client.post("/parse_batch", json={"transcripts": [{"filename": "no_transcript.wav"}]})
+    assert response.status_code == 422
+
+    assert client.post("/parse_batch", json={"transcripts": []}).status_code == 400
+
+
+def test_commit_inserts_all_rows_in_one_bulk_call(client, monkeypatch):
+    calls = []
+
+    def fake_insert(rows, bulk=False):
+        calls.append((len(rows), bulk))
+        return {"ok": True, "inserted": len(rows)}
+
+    monkeypatch.setattr(payroll_engine, "insert_shift_rows", fake_insert)
+    response = client.post("/parse_batch", json={"transcripts": [MONDAY, MONDAY], "commit": True})
+
+    assert response.json()["commit"] == {"ok": True, "inserted": 6}
+    assert calls == [(6, True)]
+
+
+def test_zip_parses_txt_entries_only(client):
+    archive = _zip({"monday_am_120925.txt": MONDAY["transcript"], "notes.md": "skip", ".hidden.txt": "skip"})
+
+    response = client.post("/parse_batch_zip", files={"archive": ("batch.zip", archive)})
+
+    assert response.status_code == 200
+    files = response.json()["files"]
+    assert [f["filename"] for f in files] == ["monday_am_120925.txt"]
+    assert len(files[0]["rows"]) == 3
+
+
+def test_zip_limits(client, monkeypatch):
+    assert client.post("/parse_batch_zip", files={"archive": ("x.zip", b"not a zip")}).status_code == 400
+
+    monkeypatch.setattr(parse_batch, "PARSE_BATCH_MAX_FILES", 2)
+    archive = _zip({f"f{i}.txt": "x" for i in range(3)})
+    assert client.post("/parse_batch_zip", files={"archive": ("x.zip", archive)}).status_code == 413
+
+    # Highly compressible payload: small archive, large expansion
+    monkeypatch.setattr(parse_batch, "PARSE_BATCH_MAX_UNZIPPED_BYTES", 10_000)
+    archive = _zip({"big.txt": "a" * 100_000})
+    assert len(archive) < 10_000
+    assert client.post("/parse_batch_zip", files={"archive": ("x.zip", archive)}).status_code == 413
+
+    monkeypatch.setattr(parse_batch, "PARSE_BATCH_MAX_ZIP_BYTES", 100)
+    assert client.post("/parse_batch_zip", files={"archive": ("x.zip", archive)}).status_code == 413
@@ -0,0 +1,125 @@
+"""Unit tests for PostgresBackend connection pool handling."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+pytest.importorskip("google.cloud.bigquery")
+
+from payroll_agent.CPM.engine.database.postgres_backend import PostgresBackend  # noqa: E402
+
+
+class FakePool:
+    """Stands in for ThreadedConnectionPool; hands out MagicMock connections."""
+
+    def __init__(self):
+        self._pool = []
+        self.opened = 0
+        self.closed = []
+
+    def getconn(self):
+        if self._pool:
+            return self._pool.pop()
+        self.opened += 1
+        return mock.MagicMock(closed=0)
+
+    def putconn(self, conn, close=False):
+        if close:
+            self.closed.append(conn)
+        else:
+            self._pool.append(conn)
+
+
+def _backend(**env):
+    with mock.patch.dict("os.environ", env):
+        backend = PostgresBackend()
+    backend._pool = FakePool()
+    return backend
+
+
+def test_connections_are_reused_and_counted():
+    backend = _backend()
+    with backend._connection() as first:
+        pass
+    with backend._connection() as second:
+        pass
+
+    assert first is second
+    stats = backend.pool_stats()
+    assert stats["checkouts"] == 2
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 1
+    assert stats["wait_ms_avg"] is not None
+
+
+def test_error_rolls_back_and_broken_connection_is_dropped():
+    backend = _backend()
+    with pytest.raises(RuntimeError):
+        with backend._connection() as conn:
+            raise RuntimeError("boom")
+    conn.rollback.assert_called_once()
+    assert backend._pool._pool == [conn]
+
+    with pytest.raises(RuntimeError):
+        with backend._connection() as conn:
+            conn.closed = 1
+            raise RuntimeError("server went away")
+    assert backend._pool.closed == [conn]
+    assert backend.pool_stats()["invalidated"] == 1
+
+
+def test_old_connections_are_recycled():
+    backend = _backend(POSTGRES_CONN_MAX_AGE_S="0")
+    with backend._connection() as first:
+        pass
+    with backend._connection() as second:
+        pass
+
+    assert first is not second
+    assert first in backend._pool.closed
+    assert backend.pool_stats()["recycled"] >= 1
+
+
+def test_idle_connection_failing_validation_is_replaced():
+    backend = _backend(POSTGRES_CONN_VALIDATE_IDLE_S="0")
+    with backend._connection() as stale:
+        pass
+    stale.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError()
+
+    with backend._connection() as fresh:
+        pass
+
+    assert fresh is not stale
+    assert backend._pool.closed == [stale]
+
+
+def test_exhausted_pool_times_out():
+    backend = _backend(POSTGRES_POOL_MAX="1", POSTGRES_POOL_TIMEOUT_S="0.05")
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with backend._connection():
+            entered.set()
+            release.wait(2)
+
+    t = threading.Thread(target=hold)
+    t.start()
+    entered.wait(2)
+    with pytest.raises(Exception, match="pool exhausted"):
+        with backend._connection():
+            pass
+    release.set()
+    t.join()
+
+    assert backend.pool_stats()["timeouts"] == 1
+
+
+def test_warm_up_opens_min_connections():
+    backend = _backend(POSTGRES_POOL_MIN="3")
+    backend.warm_up()
+
+    assert backend._pool.opened == 3
+    assert backend.pool_stats()["idle"] == 3
@@ -0,0 +1,63 @@
+"""Unit tests for the roster Aho-Corasick matcher."""
+
+from pathlib import Path
+
+from roster import get_roster_matcher, normalize_employee_name
+from roster.matcher import RosterMatcher
+
+
+def _cascade_resolve(raw):
+    """Reference: full key, then each word, then each bigram."""
+    key = " ".join(raw.strip().lower().split())
+    if not key:
+        return None
+    nm = normalize_employee_name(key)
+    if nm:
+        return nm
+    tokens = key.split()
+    for t in tokens:
+        nm = normalize_employee_name(t)
+        if nm:
+            return nm
+    for i in range(len(tokens) - 1):
+        nm = normalize_employee_name(f"{tokens[i]} {tokens[i + 1]}")
+        if nm:
+            return nm
+    return None
+
+
+def test_find_mentions_returns_spans_and_canonical_names():
+    matcher = get_roster_matcher()
+    text = "Servers were Brooke Neil, lost him and Kevin. Utility Ryan $32.82"
+
+    mentions = matcher.find_mentions(text)
+
+    assert [m.name for m in mentions] == [
+        "Brooke Neal", "Austin Kelley", "Kevin Worley", "Ryan Alexander",
+    ]
+    assert [text[m.start:m.end] for m in mentions] == ["Brooke Neil", "lost him", "Kevin", "Ryan"]
+
+
+def test_longest_variant_wins_and_tokens_are_exact():
+    matcher = RosterMatcher({"austin": "Austin Kelley", "austin kelly": "Austin Kelley", "kelly": "Kelly X"})
+
+    mentions = matcher.find_mentions("austin kelly and austins")
+
+    assert len(mentions) == 1
+    assert mentions[0].variant == "austin kelly"
+    assert mentions[0].tokens == 2
+    # find_all keeps the overlapping shorter matches
+    assert {m.variant for m in matcher.find_all("austin kelly")} == {"austin", "austin kelly", "kelly"}
+
+
+def test_resolve_matches_lookup_cascade_on_real_transcripts():
+    matcher = get_roster_matcher()
+    lpm = Path(__file__).resolve().parents[2] / "payroll_agent" / "LPM"
+    fragments = []
+    for path in sorted(lpm.glob("1*.txt"))[:4]:
+        words = path.read_text(encoding="utf-8").split()
+        fragments += [" ".join(words[i:i + 3]) for i in range(len(words))]
+
+    assert fragments
+    for frag in fragments:
+        assert matcher.resolve(frag) == _cascade_resolve(frag), frag
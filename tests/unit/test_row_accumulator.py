@@ -0,0 +1,39 @@
+"""Unit tests for the CPM engine RowAccumulator."""
+
+from collections import namedtuple
+from datetime import date
+
+from payroll_agent.CPM.engine.helpers import RowAccumulator
+
+Row = namedtuple("Row", "employee date shift amount_final")
+
+
+def test_add_skips_duplicate_key():
+    """Second row for the same employee/date/shift is not added."""
+    rows = RowAccumulator()
+    d = date(2026, 1, 5)
+
+    assert rows.add(Row("Kevin Worley", d, "PM", 100.0)) is True
+    assert rows.add(Row("Kevin Worley", d, "PM", 200.0)) is False
+    assert rows.add(Row("Kevin Worley", d, "AM", 50.0)) is True
+
+    assert len(rows) == 2
+    assert rows.get("Kevin Worley", d, "PM").amount_final == 100.0
+    assert rows.has("Kevin Worley", d, "AM")
+    assert not rows.has("Mike Walton", d, "PM")
+
+
+def test_append_keeps_order_and_employee_index():
+    """append() never de-dupes; iteration follows insertion order."""
+    rows = RowAccumulator()
+    d = date(2026, 1, 5)
+
+    rows.append(Row("Ryan Alexander", d, "AM", 30.0))
+    rows.append(Row("Ryan Alexander", d, "AM", 40.0))
+    rows.append(Row("Brooke Neal", d, "AM", 150.0))
+
+    assert [r.amount_final for r in rows] == [30.0, 40.0, 150.0]
+    assert rows.get("Ryan Alexander", d, "AM").amount_final == 30.0
+    assert rows.has_employee("Brooke Neal")
+    assert not rows.has_employee("Austin Kelley")
+    assert not RowAccumulator()
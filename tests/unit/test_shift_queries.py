@@ -0,0 +1,90 @@
+"""Unit tests for CPM shift pagination and aggregation queries."""
+
+from datetime import date, datetime
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("google.cloud.bigquery")
+
+from payroll_agent.CPM.engine.database.bigquery_backend import BigQueryBackend  # noqa: E402
+from payroll_agent.CPM.engine.database.interface import decode_cursor, encode_cursor  # noqa: E402
+from payroll_agent.CPM.engine.database.postgres_backend import PostgresBackend  # noqa: E402
+
+
+def _postgres_with_rows(rows):
+    backend = PostgresBackend()
+    conn = mock.MagicMock(closed=0)
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = rows
+    backend._pool = mock.Mock(getconn=mock.Mock(return_value=conn))
+    return backend, cur
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(["2026-01-05", "f.wav-Kevin Worley-2026-01-05"])
+    assert decode_cursor(cursor) == ["2026-01-05", "f.wav-Kevin Worley-2026-01-05"]
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_postgres_page_uses_keyset_and_returns_next_cursor():
+    rows = [
+        {"shift_date": date(2026, 1, 6), "row_id": "b"},
+        {"shift_date": date(2026, 1, 5), "row_id": "a"},
+    ]
+    backend, cur = _postgres_with_rows(rows)
+
+    first = backend.get_shifts_page(employee="Kevin Worley", limit=2)
+    backend.get_shifts_page(employee="Kevin Worley", limit=2, cursor=first["next_cursor"])
+
+    query, params = cur.execute.call_args[0]
+    assert "(shift_date, row_id) < (%s, %s)" in query
+    assert "ORDER BY shift_date DESC, row_id DESC" in query
+    assert "OFFSET" not in query
+    assert params == ["Kevin Worley", "2026-01-05", "a", 2]
+
+
+def test_postgres_last_page_has_no_cursor():
+    backend, _ = _postgres_with_rows([{"shift_date": date(2026, 1, 5), "row_id": "a"}])
+    assert backend.get_shifts_page(limit=10)["next_cursor"] is None
+
+
+def test_postgres_aggregate_groups_in_database():
+    backend, cur = _postgres_with_rows([{"employee": "Kevin Worley", "total_amount": None, "shift_count": 0}])
+
+    result = backend.aggregate_shifts(
+        group_by=["employee", "period"], period="month", start_date=datetime(2025, 1, 1)
+    )
+
+    query, params = cur.execute.call_args[0]
+    assert "SUM(amount_final)" in query
+    assert "date_trunc('month', shift_date)::date AS period_start" in query
+    assert "GROUP BY 1, 2" in query
+    assert params == [date(2025, 1, 1)]
+    assert result[0]["total_amount"] == 0.0
+
+
+def test_aggregate_rejects_unknown_columns():
+    backend, _ = _postgres_with_rows([])
+    with pytest.raises(ValueError):
+        backend.aggregate_shifts(group_by=["employee; DROP TABLE shifts"])
+    with pytest.raises(ValueError):
+        backend.aggregate_shifts(period="fortnight")
+
+
+def test_bigquery_filters_are_query_parameters():
+    backend = BigQueryBackend()
+    client = mock.Mock()
+    client.query.return_value.result.return_value = []
+    backend._client = client
+
+    backend.get_shifts(employee="O'Brien", start_date=datetime(2025, 1, 1), limit=5)
+
+    query = client.query.call_args[0][0]
+    job_config = client.query.call_args[1]["job_config"]
+    assert "O'Brien" not in query
+    assert "employee = @employee" in query
+    names = {p.name: p.value for p in job_config.query_parameters}
+    assert names == {"employee": "O'Brien", "start_date": date(2025, 1, 1), "limit": 5}
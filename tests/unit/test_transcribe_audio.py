@@ -0,0 +1,35 @@
+"""Unit tests for the CPM engine's transcriber call."""
+
+import asyncio
+import io
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("google.cloud.bigquery")
+
+import httpx  # noqa: E402
+from fastapi import UploadFile  # noqa: E402
+
+from payroll_agent.CPM.engine import payroll_engine  # noqa: E402
+
+
+def test_upload_is_sent_to_the_transcriber(monkeypatch):
+    received = []
+
+    def handler(request):
+        received.append(request.read())
+        return httpx.Response(200, json={"text": " Monday AM shift "})
+
+    async def run():
+        client = httpx.AsyncClient(base_url="http://transcriber", transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(payroll_engine, "_transcribe_client", client)
+        monkeypatch.setattr(payroll_engine, "_transcribe_slots", asyncio.Semaphore(1))
+        upload = UploadFile(file=io.BytesIO(b"RIFF-audio-bytes"), filename="shift.wav")
+        try:
+            return await payroll_engine.transcribe_audio(upload)
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == "Monday AM shift"
+    assert b"RIFF-audio-bytes" in received[0]
@@ -17,13 +17,16 @@ import logging
 import os
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+from ..src.app_config import get_config
+from ..src.asr_adapter import asr_status, warm_asr_provider
 from ..src.brain_sync import get_brain
+from ..src.claude_client import get_latency_stats
 from ..src.logging_utils import configure_logging, get_logger
 from .routes import payroll_router, audio_router
 
@@ -62,6 +65,10 @@ async def lifespan(app: FastAPI):
         log.error("Failed to load brain on startup: %s", e)
         # Don't crash - health endpoint will report unhealthy
 
+    # Parse config and load the ASR model / client now rather than on the first recording
+    get_config()
+    warm_asr_provider()
+
     yield  # Server is running
 
     # Shutdown
@@ -105,6 +112,8 @@ class HealthResponse(BaseModel):
     timestamp: str
     brain_loaded: bool
     domains: list[str]
+    claude: Optional[Dict[str, Any]] = None  # Call latency histograms and retries
+    asr: Optional[list[Dict[str, Any]]] = None  # ASR providers and whether they're warm
 
 
 class ErrorResponse(BaseModel):
@@ -141,6 +150,8 @@ async def health_check() -> HealthResponse:
         timestamp=datetime.utcnow().isoformat() + "Z",
         brain_loaded=brain_loaded,
         domains=domains,
+        claude=get_latency_stats(),
+        asr=asr_status(),
     )
 
 
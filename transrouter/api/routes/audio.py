@@ -10,6 +10,7 @@ import logging
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
 from ...src.schemas import AudioRequest
@@ -180,7 +181,7 @@ async def process_audio(
 
     # Process through orchestrator
     try:
-        response = handle_audio_request(audio_request)
+        response = await run_in_threadpool(handle_audio_request, audio_request)
     except Exception as e:
         log.exception("Error processing audio")
         raise HTTPException(status_code=500, detail=f"Processing error: {e}")
@@ -267,8 +268,8 @@ async def transcribe_audio(
 
     try:
         provider = get_asr_provider()
-        result: TranscriptResult = provider.transcribe(
-            audio_bytes, audio_format, actual_sample_rate
+        result: TranscriptResult = await run_in_threadpool(
+            provider.transcribe, audio_bytes, audio_format, actual_sample_rate
         )
     except Exception as e:
         log.exception("Transcription failed")
@@ -9,6 +9,7 @@ import logging
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
 from ...src.transrouter_orchestrator import handle_text_request
@@ -112,8 +113,10 @@ async def parse_payroll(
 
     try:
         # Route through the transrouter orchestrator
-        # This handles intent classification and calls the payroll agent
-        response = handle_text_request(
+        # This handles intent classification and calls the payroll agent.
+        # The pipeline is synchronous; run it off the event loop.
+        response = await run_in_threadpool(
+            handle_text_request,
             request.transcript,
             {"transcript": request.transcript, "pay_period_hint": request.pay_period_hint}
         )
@@ -15,8 +15,11 @@ from pathlib import Path
 from typing import Any, Dict, Optional, List
 
 from ..asr_adapter import get_asr_provider
+from ..audio_io import sniff_audio_format
+from inventory_agent.catalog_store import get_catalog_store
 from ..claude_client import ClaudeClient, ClaudeConfig, ClaudeResponse
 from ..prompts.inventory_prompt import (
+    build_inventory_catalog_context,
     build_inventory_system_prompt,
     build_inventory_user_prompt,
 )
@@ -31,24 +34,14 @@ class InventoryAgentError(Exception):
 
 
 def _load_catalog() -> Dict[str, Any]:
-    """Load the inventory catalog JSON.
+    """The inventory catalog from the shared CatalogStore (read-only).
 
-    Tries two paths:
-    1. inventory_agent/inventory_catalog.json (local dev)
-    2. data/inventory_catalog.json (Docker / production)
+    Uses data/inventory_catalog.json (what the prompt builder sends to
+    Claude; Docker copies the catalog there), falling back to
+    inventory_agent/inventory_catalog.json.
     """
-    primary_path = Path(__file__).parent.parent.parent.parent / "inventory_agent" / "inventory_catalog.json"
-    fallback_path = Path(__file__).parent.parent.parent.parent / "data" / "inventory_catalog.json"
-
-    catalog_path = primary_path if primary_path.exists() else fallback_path
-
-    if not catalog_path.exists():
-        log.warning("Inventory catalog not found at %s or %s", primary_path, fallback_path)
-        return {}
-
     try:
-        with open(catalog_path, "r") as f:
-            return json.load(f)
+        return get_catalog_store().get()
     except Exception as e:
         log.error("Failed to load inventory catalog: %s", e)
         return {}
@@ -77,44 +70,122 @@ def _extract_pack_multiplier(unit: str) -> Optional[tuple[int, str]]:
     return None
 
 
-def _find_catalog_unit(product_name: str, catalog: Dict[str, Any]) -> Optional[str]:
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_BASE_UNIT_RE = re.compile(r"(can|bottle|each|keg|gallon|pound|case)")
+
+
+def _name_tokens(name: str) -> tuple[str, ...]:
+    return tuple(_TOKEN_RE.findall(name.lower()))
+
+
+class CatalogLookup:
+    """Product-name index over the catalog for report_by_unit lookups.
+
+    Built once per catalog so enriching a long count is a few dict lookups
+    per item instead of a scan over every catalog product:
+
+    - exact lowercase name
+    - normalized name (word tokens, ignoring punctuation and spacing)
+    - every contiguous token run of every name, for containment matches in
+      either direction ("coors light" within "Coors Light 12oz Can", or
+      "Tito's" within "tito's vodka 750ml")
+
+    Containment ties go to the product that comes first in the catalog.
+    Entries may name the product under "item" or "name".
+    """
+
+    def __init__(self, catalog: Dict[str, Any]):
+        self.units: List[Optional[str]] = []
+        self._exact: Dict[str, int] = {}
+        self._names: Dict[tuple[str, ...], int] = {}
+        self._runs: Dict[tuple[str, ...], int] = {}
+
+        for category_name, category_items in catalog.items():
+            if category_name == "global_rules" or not isinstance(category_items, list):
+                continue
+            for item in category_items:
+                if not isinstance(item, dict):
+                    continue
+                name = item.get("item") or item.get("name") or ""
+                tokens = _name_tokens(name)
+                if not tokens:
+                    continue
+
+                pos = len(self.units)
+                self.units.append(item.get("report_by_unit"))
+                self._exact.setdefault(name.lower(), pos)
+                self._names.setdefault(tokens, pos)
+                for i in range(len(tokens)):
+                    for j in range(i + 1, len(tokens) + 1):
+                        self._runs.setdefault(tokens[i:j], pos)
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def find(self, product_name: str) -> Optional[int]:
+        """Catalog position of the product best matching product_name, or None."""
+        pos = self._exact.get(product_name.lower())
+        if pos is not None:
+            return pos
+
+        tokens = _name_tokens(product_name)
+        if not tokens:
+            return None
+        pos = self._names.get(tokens)
+        if pos is not None:
+            return pos
+
+        # Catalog name containing the product name
+        best = self._runs.get(tokens)
+        # Catalog name contained in the product name
+        for i in range(len(tokens)):
+            for j in range(i + 1, len(tokens) + 1):
+                pos = self._names.get(tokens[i:j])
+                if pos is not None and (best is None or pos < best):
+                    best = pos
+        return best
+
+    def report_by_unit(self, product_name: str) -> Optional[str]:
+        """The catalog's report_by_unit for a product, or None if not found."""
+        pos = self.find(product_name)
+        return self.units[pos] if pos is not None else None
+
+
+def _find_catalog_unit(
+    product_name: str,
+    catalog: Dict[str, Any],
+    lookup: Optional[CatalogLookup] = None,
+) -> Optional[str]:
     """Find the catalog's report_by_unit for a product.
 
     Args:
         product_name: Product name to search for.
         catalog: Full catalog dict.
+        lookup: Prebuilt CatalogLookup for catalog (built on the fly if omitted).
 
     Returns:
         The report_by_unit string, or None if not found.
     """
-    product_lower = product_name.lower()
-
-    # Search all categories
-    for category_name, category_items in catalog.items():
-        if category_name == "global_rules":
-            continue
-
-        if not isinstance(category_items, list):
-            continue
-
-        for item in category_items:
-            if not isinstance(item, dict):
-                continue
+    if lookup is None:
+        lookup = CatalogLookup(catalog)
+    return lookup.report_by_unit(product_name)
 
-            item_name = item.get("item", "").lower()
 
-            # Exact match or fuzzy match
-            if item_name == product_lower or product_lower in item_name or item_name in product_lower:
-                return item.get("report_by_unit")
-
-    return None
+def _base_unit(catalog_unit: Optional[str]) -> str:
+    """Plural base unit for a catalog unit (e.g., "Can (12 Fluid Ounces)" -> "cans")."""
+    if catalog_unit:
+        base_unit_match = _BASE_UNIT_RE.search(catalog_unit.lower())
+        if base_unit_match:
+            return base_unit_match.group(1) + "s" if not base_unit_match.group(1).endswith("s") else base_unit_match.group(1)
+    return "units"
 
 
 def _calculate_conversion_display(
     quantity: Optional[float],
     unit: str,
     product_name: str,
-    catalog: Dict[str, Any]
+    catalog: Dict[str, Any],
+    lookup: Optional[CatalogLookup] = None,
 ) -> Optional[str]:
     """Calculate conversion display string for an inventory item.
 
@@ -123,6 +194,7 @@ def _calculate_conversion_display(
         unit: The unit string (e.g., "4-packs")
         product_name: Product name to look up in catalog
         catalog: Full catalog
+        lookup: Prebuilt CatalogLookup for catalog (built on the fly if omitted).
 
     Returns:
         Conversion display string like "6 × 4 = 24 cans" or None if no conversion needed.
@@ -140,19 +212,7 @@ def _calculate_conversion_display(
     # Calculate total
     total = int(quantity * multiplier)
 
-    # Try to find the catalog unit
-    catalog_unit = _find_catalog_unit(product_name, catalog)
-
-    if catalog_unit:
-        # Extract base unit from catalog (e.g., "Can (12 Fluid Ounces)" -> "cans")
-        base_unit_match = re.search(r"(can|bottle|each|keg|gallon|pound|case)", catalog_unit.lower())
-        if base_unit_match:
-            base_unit = base_unit_match.group(1) + "s" if not base_unit_match.group(1).endswith("s") else base_unit_match.group(1)
-        else:
-            base_unit = "units"
-    else:
-        # Default to generic unit
-        base_unit = "units"
+    base_unit = _base_unit(_find_catalog_unit(product_name, catalog, lookup))
 
     return f"{int(quantity)} × {multiplier} = {total} {base_unit}"
 
@@ -188,14 +248,26 @@ class InventoryAgent:
             self.claude_client = ClaudeClient(config=claude_config)
 
         self._system_prompt_cache: Dict[str, str] = {}
+        # Explicit catalog override; None means the shared CatalogStore
         self._catalog: Optional[Dict[str, Any]] = None
+        self._catalog_lookup: Optional[CatalogLookup] = None
+        self._catalog_lookup_source: Optional[Dict[str, Any]] = None
 
     @property
     def catalog(self) -> Dict[str, Any]:
-        """Lazy-load and cache the inventory catalog."""
-        if self._catalog is None:
-            self._catalog = _load_catalog()
-        return self._catalog
+        """The inventory catalog (shared, reloaded when the file changes)."""
+        if self._catalog is not None:
+            return self._catalog
+        return _load_catalog()
+
+    @property
+    def catalog_lookup(self) -> CatalogLookup:
+        """Name index over the catalog, rebuilt only when the catalog changes."""
+        catalog = self.catalog
+        if self._catalog_lookup is None or self._catalog_lookup_source is not catalog:
+            self._catalog_lookup = CatalogLookup(catalog)
+            self._catalog_lookup_source = catalog
+        return self._catalog_lookup
 
     def system_prompt(self, category: str) -> str:
         """Get cached system prompt for category."""
@@ -234,6 +306,7 @@ class InventoryAgent:
 
         response: ClaudeResponse = self.claude_client.call(
             system_prompt=self.system_prompt(category),
+            system_suffix=build_inventory_catalog_context(transcript, category),
             user_content=user_prompt,
             extract_json=True,
         )
@@ -338,6 +411,7 @@ class InventoryAgent:
             Enriched inventory JSON with conversion fields added to items.
         """
         items = inventory_json.get("items", [])
+        lookup = self.catalog_lookup
 
         for item in items:
             if not isinstance(item, dict):
@@ -349,7 +423,7 @@ class InventoryAgent:
 
             # Calculate conversion display
             conversion_display = _calculate_conversion_display(
-                quantity, unit, product_name, self.catalog
+                quantity, unit, product_name, self.catalog, lookup
             )
 
             # Calculate converted quantity and base unit for aggregation
@@ -360,15 +434,7 @@ class InventoryAgent:
                 item["converted_quantity"] = converted_quantity
 
                 # Extract base unit from catalog
-                catalog_unit = _find_catalog_unit(product_name, self.catalog)
-                if catalog_unit:
-                    base_unit_match = re.search(r"(can|bottle|each|keg|gallon|pound|case)", catalog_unit.lower())
-                    if base_unit_match:
-                        base_unit = base_unit_match.group(1) + "s" if not base_unit_match.group(1).endswith("s") else base_unit_match.group(1)
-                    else:
-                        base_unit = "units"
-                else:
-                    base_unit = "units"
+                base_unit = _base_unit(lookup.report_by_unit(product_name))
 
                 item["base_unit"] = base_unit
                 log.debug("Converted %s %s → %d %s", quantity, unit, converted_quantity, base_unit)
@@ -407,7 +473,8 @@ class InventoryAgent:
 
         # Step 1: Transcribe
         asr = get_asr_provider()
-        asr_result = asr.transcribe(audio_bytes, "wav", sample_rate_hz=16000)
+        audio_format = sniff_audio_format(audio_bytes) or "wav"
+        asr_result = asr.transcribe(audio_bytes, audio_format, sample_rate_hz=16000)
         transcript = asr_result.transcript
 
         if not transcript:
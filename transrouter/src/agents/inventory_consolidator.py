@@ -115,12 +115,13 @@ class InventoryConsolidator:
                 return aggregated_totals
 
             log.info(
-                "Consolidation complete: %d → %d items, %d issues found (input=%d, output=%d tokens)",
+                "Consolidation complete: %d → %d items, %d issues found (input=%d, output=%d, cache_read=%d tokens)",
                 len(items),
                 len(consolidated_items),
                 len(issues),
                 response.usage.get("input_tokens", 0) if response.usage else 0,
                 response.usage.get("output_tokens", 0) if response.usage else 0,
+                response.usage.get("cache_read_input_tokens", 0) if response.usage else 0,
             )
 
             # Build merge_log from issues for display
@@ -8,12 +8,14 @@ UPDATED (Phase 1): Added multi-turn clarification support.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 import uuid
 
 from ..asr_adapter import get_asr_provider
-from ..claude_client import ClaudeClient, ClaudeConfig, ClaudeResponse
+from ..audio_io import sniff_audio_format
+from ..claude_client import AsyncClaudeClient, ClaudeClient, ClaudeConfig, ClaudeResponse
 from ..prompts.payroll_prompt import (
     build_payroll_system_prompt,
     build_payroll_user_prompt,
@@ -53,6 +55,7 @@ class PayrollAgent:
         claude_client: Optional[ClaudeClient] = None,
         config: Optional[Dict[str, Any]] = None,
         conversation_manager: Optional[ConversationManager] = None,
+        async_claude_client: Optional[AsyncClaudeClient] = None,
     ):
         """Initialize payroll agent.
 
@@ -60,18 +63,28 @@ class PayrollAgent:
             claude_client: Optional pre-configured Claude client.
             config: Optional configuration dict (used if claude_client not provided).
             conversation_manager: Optional conversation manager for multi-turn flows.
+            async_claude_client: Optional client for parse_transcript_async.
         """
         if claude_client:
             self.claude_client = claude_client
         else:
             claude_config = ClaudeConfig.from_dict(config or {})
             self.claude_client = ClaudeClient(config=claude_config)
+        self._async_claude_client = async_claude_client
 
         self._system_prompt: Optional[str] = None
 
         # NEW (Phase 1): Conversation manager for clarification flows
         self.conversation_manager = conversation_manager or ConversationManager()
 
+    @property
+    def async_claude_client(self) -> AsyncClaudeClient:
+        """Lazy-create an async client with the same config as claude_client."""
+        if self._async_claude_client is None:
+            config = getattr(self.claude_client, "config", None)
+            self._async_claude_client = AsyncClaudeClient(config=config)
+        return self._async_claude_client
+
     @property
     def system_prompt(self) -> str:
         """Lazy-load and cache the system prompt."""
@@ -111,7 +124,32 @@ class PayrollAgent:
             user_content=user_prompt,
             extract_json=True,
         )
+        return self._parse_response_to_result(response)
+
+    async def parse_transcript_async(
+        self,
+        transcript: str,
+        pay_period_hint: str = "",
+        shift_code: str = "",
+    ) -> Dict[str, Any]:
+        """Async version of parse_transcript for use from async routes.
+
+        Uses AsyncClaudeClient so the event loop is not blocked while Claude
+        responds. Returns the same dict as parse_transcript.
+        """
+        log.info("Parsing payroll transcript async (%d chars, shift_code=%s)", len(transcript), shift_code or "none")
 
+        user_prompt = build_payroll_user_prompt(transcript, pay_period_hint, shift_code)
+
+        response: ClaudeResponse = await self.async_claude_client.call(
+            system_prompt=self.system_prompt,
+            user_content=user_prompt,
+            extract_json=True,
+        )
+        return self._parse_response_to_result(response)
+
+    def _parse_response_to_result(self, response: ClaudeResponse) -> Dict[str, Any]:
+        """Validate and auto-correct a Claude response into the parse result dict."""
         if not response.success:
             log.error("Claude API call failed: %s", response.error)
             return {
@@ -192,6 +230,61 @@ class PayrollAgent:
         Returns:
             ParseResult with status (success/needs_clarification/error)
         """
+        early, conversation_id, state, user_prompt = self._begin_clarification_turn(
+            transcript, pay_period_hint, shift_code, clarifications, conversation_id
+        )
+        if early is not None:
+            return early
+
+        response: ClaudeResponse = self.claude_client.call(
+            system_prompt=self.system_prompt,
+            user_content=user_prompt,
+            extract_json=True,
+        )
+        return self._finish_clarification_turn(response, transcript, state, conversation_id)
+
+    async def parse_with_clarification_async(
+        self,
+        transcript: str,
+        pay_period_hint: str = "",
+        shift_code: str = "",
+        clarifications: Optional[List[ClarificationResponse]] = None,
+        conversation_id: Optional[str] = None,
+    ) -> ParseResult:
+        """Async version of parse_with_clarification (same arguments and result).
+
+        The Claude call goes through AsyncClaudeClient; conversation state
+        (stored on disk) is read and written in a worker thread.
+        """
+        early, conversation_id, state, user_prompt = await asyncio.to_thread(
+            self._begin_clarification_turn,
+            transcript, pay_period_hint, shift_code, clarifications, conversation_id,
+        )
+        if early is not None:
+            return early
+
+        response: ClaudeResponse = await self.async_claude_client.call(
+            system_prompt=self.system_prompt,
+            user_content=user_prompt,
+            extract_json=True,
+        )
+        return await asyncio.to_thread(
+            self._finish_clarification_turn, response, transcript, state, conversation_id
+        )
+
+    def _begin_clarification_turn(
+        self,
+        transcript: str,
+        pay_period_hint: str,
+        shift_code: str,
+        clarifications: Optional[List[ClarificationResponse]],
+        conversation_id: Optional[str],
+    ) -> Tuple[Optional[ParseResult], Optional[str], Any, str]:
+        """Load or create the conversation and build the user prompt.
+
+        Returns (early_result, conversation_id, state, user_prompt); early_result
+        is set when parsing can't proceed (unknown conversation).
+        """
         # Create or load conversation
         if conversation_id:
             state = self.conversation_manager.load_conversation(conversation_id)
@@ -201,7 +294,7 @@ class PayrollAgent:
                     status="error",
                     conversation_id=conversation_id,
                     error=f"Conversation {conversation_id} not found"
-                )
+                ), conversation_id, None, ""
         else:
             # New conversation
             state = self.conversation_manager.create_conversation(
@@ -232,14 +325,17 @@ class PayrollAgent:
         else:
             user_prompt = build_payroll_user_prompt(transcript, pay_period_hint, shift_code)
 
-        # Call Claude API
         log.info(f"Parsing payroll (conversation={conversation_id}, iteration={state.iteration})")
-        response: ClaudeResponse = self.claude_client.call(
-            system_prompt=self.system_prompt,
-            user_content=user_prompt,
-            extract_json=True,
-        )
+        return None, conversation_id, state, user_prompt
 
+    def _finish_clarification_turn(
+        self,
+        response: ClaudeResponse,
+        transcript: str,
+        state,
+        conversation_id: str,
+    ) -> ParseResult:
+        """Validate Claude's answer and decide: success, clarification or error."""
         # Handle API failure
         if not response.success:
             return ParseResult(
@@ -448,15 +544,10 @@ class PayrollAgent:
         log.info("PayrollAgent.process_audio: processing %d bytes", len(audio_bytes))
 
         # Step 1: Transcribe
-        asr = get_asr_provider()
-        asr_result = asr.transcribe(audio_bytes, "wav", sample_rate_hz=16000)
-        transcript = asr_result.transcript
-
+        transcript = self._transcribe(audio_bytes)
         if not transcript:
             return {"status": "error", "error": "Transcription returned empty result"}
 
-        log.info("PayrollAgent.process_audio: transcript (%d chars): %s", len(transcript), transcript[:200])
-
         # Step 2: Parse with clarification support
         result = self.parse_with_clarification(
             transcript=transcript,
@@ -465,6 +556,44 @@ class PayrollAgent:
         )
 
         # Step 3: Convert ParseResult → dict format expected by routes
+        return self._process_result_dict(result, transcript)
+
+    async def process_audio_async(
+        self,
+        audio_bytes: bytes,
+        pay_period_hint: str = "",
+        shift_code: str = "",
+    ) -> Dict[str, Any]:
+        """Async version of process_audio for async routes (same result dict).
+
+        ASR runs in a worker thread; the Claude call is awaited on the event
+        loop instead of occupying a thread while Claude responds.
+        """
+        log.info("PayrollAgent.process_audio_async: processing %d bytes", len(audio_bytes))
+
+        transcript = await asyncio.to_thread(self._transcribe, audio_bytes)
+        if not transcript:
+            return {"status": "error", "error": "Transcription returned empty result"}
+
+        result = await self.parse_with_clarification_async(
+            transcript=transcript,
+            pay_period_hint=pay_period_hint,
+            shift_code=shift_code,
+        )
+        return self._process_result_dict(result, transcript)
+
+    @staticmethod
+    def _transcribe(audio_bytes: bytes) -> str:
+        asr = get_asr_provider()
+        audio_format = sniff_audio_format(audio_bytes) or "wav"
+        transcript = asr.transcribe(audio_bytes, audio_format, sample_rate_hz=16000).transcript
+        if transcript:
+            log.info("PayrollAgent: transcript (%d chars): %s", len(transcript), transcript[:200])
+        return transcript
+
+    @staticmethod
+    def _process_result_dict(result: ParseResult, transcript: str) -> Dict[str, Any]:
+        """ParseResult → the dict format the routes expect."""
         if result.status == "needs_clarification":
             return {
                 "status": "needs_clarification",
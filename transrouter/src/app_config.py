@@ -0,0 +1,110 @@
+"""Process-wide Transrouter configuration.
+
+``transrouter/config/default.yaml`` merged over ``DEFAULT_CONFIG`` is parsed
+once and shared by the orchestrator, the ASR provider registry and
+``ClaudeConfig``. Like the catalog store, ``get_config()`` only stats the
+file on each call and re-parses it when its mtime or size changes;
+``reload_config()`` forces a re-read.
+
+If the file becomes unreadable after a successful load, the last good
+config is kept (like the catalog store); a missing file means defaults.
+
+The returned config is read-only (see ``inventory_agent.catalog_store.FrozenDict``);
+copy it before modifying.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from inventory_agent.catalog_store import FrozenDict, freeze
+
+log = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "default.yaml"
+
+DEFAULT_CONFIG = {
+    "asr": {
+        "provider": "auto",
+        "language": "en",
+        "timeout_seconds": 120,
+        "whisper_model": "base",
+        "normalize": True,
+        "chunk_seconds": 120,
+    },
+    "routing": {"default_domain": "payroll", "fallback_intent": "unknown"},
+    "logging": {"level": "INFO"},
+}
+
+
+class AppConfig:
+    """Cached, mtime-reloaded view of one YAML config file."""
+
+    def __init__(self, path: Path = CONFIG_PATH):
+        self.path = Path(path)
+        self.version = 0
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._config: Optional[FrozenDict] = None
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def get(self) -> FrozenDict:
+        """The merged config, re-parsed if the file changed since the last call."""
+        stamp = self._file_stamp()
+        if self._config is None or stamp != self._stamp:
+            with self._lock:
+                if self._config is None or stamp != self._stamp:
+                    self._load(stamp)
+        return self._config
+
+    def reload(self) -> FrozenDict:
+        """Re-read the file now, even if it looks unchanged."""
+        with self._lock:
+            self._load(self._file_stamp())
+        return self._config
+
+    def _load(self, stamp: Optional[Tuple[int, int]]) -> None:
+        config = DEFAULT_CONFIG
+        if stamp is not None:
+            try:
+                import yaml  # type: ignore
+
+                with self.path.open("r", encoding="utf-8") as f:
+                    loaded = yaml.safe_load(f) or {}
+                config = {**DEFAULT_CONFIG, **loaded}
+            except Exception as e:
+                if self._config is not None:
+                    # e.g. a half-written edit: keep serving the last good config
+                    log.error("Keeping config version %d; failed to reload %s: %s", self.version, self.path, e)
+                    self._stamp = stamp
+                    return
+                # Fall back to defaults if PyYAML is missing or file malformed.
+                log.warning("Using default config; failed to load %s: %s", self.path, e)
+
+        self._config = freeze(config)
+        self._stamp = stamp
+        self.version += 1
+        log.info("Loaded config %s (version=%d)", self.path, self.version)
+
+
+_app_config = AppConfig()
+
+
+def get_config() -> FrozenDict:
+    """The shared Transrouter config."""
+    return _app_config.get()
+
+
+def reload_config() -> FrozenDict:
+    """Force the shared config to be re-read from disk."""
+    return _app_config.reload()
@@ -1,51 +1,149 @@
 """ASR adapter interface for Transrouter.
 
 Provides a pluggable API to different transcription providers (Whisper, Amazon Transcribe, etc.).
+
+Adapters are held in a process-wide registry: ``get_asr_provider`` returns
+the same instance for the same settings, so a local Whisper model is loaded
+once and the OpenAI client (and its connection pool) is reused across
+requests. ``warm_asr_provider`` does that loading at app startup, and
+``asr_status`` reports it for health checks.
+
+Registered adapters are wrapped as
+``NormalizingASRAdapter(ChunkingASRAdapter(provider))``: audio is decoded and
+trimmed once, then long recordings are split at pauses and the chunks
+transcribed concurrently (up to the provider's ``max_concurrency``). The
+wrappers pass decoded samples down via ``transcribe_samples``; they are only
+encoded again at the network boundary, for providers that upload files.
 """
 
 import importlib
-import tempfile
-from typing import Any, Dict, Optional
-
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .app_config import get_config
+from .audio_io import SAMPLE_RATE, decode_pcm, ffmpeg_available, upload_file
 from .schemas import TranscriptResult
 
+log = logging.getLogger(__name__)
+
 
 class ASRAdapter:
     """Abstract adapter for ASR providers."""
 
+    name = "unknown"
+    # Concurrent transcribe() calls this adapter can usefully serve
+    max_concurrency = 1
+    # True if the provider works on decoded samples, so passing them skips a decode
+    takes_samples = False
+
     def transcribe(self, audio_bytes: bytes, audio_format: str, sample_rate_hz: int) -> TranscriptResult:
         """Transcribe audio into a TranscriptResult."""
         raise NotImplementedError
 
+    def transcribe_samples(
+        self, samples, original: Optional[Tuple[bytes, str, int]] = None
+    ) -> TranscriptResult:
+        """Transcribe 16 kHz mono float samples.
+
+        The default encodes them compactly and calls ``transcribe``. If
+        ``original`` (the upload the samples came from, as transcribe()
+        arguments) is given and the encoding isn't smaller, it is sent instead.
+        """
+        from .audio_normalize import encode_compact
+
+        audio_bytes, audio_format = encode_compact(samples)
+        if original is not None and len(audio_bytes) >= len(original[0]):
+            log.info("Encoded audio isn't smaller, sending original audio")
+            return self.transcribe(*original)
+        return self.transcribe(audio_bytes, audio_format, SAMPLE_RATE)
+
+    def warm(self) -> None:
+        """Load models / open clients ahead of the first request."""
+
+    @property
+    def is_warm(self) -> bool:
+        """True once the first transcribe won't pay a load cost."""
+        return True
+
 
 class WhisperAdapter(ASRAdapter):
     """Whisper implementation with optional dependency on openai/whisper."""
 
-    def __init__(self, model_name: str = "base", language: str = "en"):
+    name = "whisper"
+    takes_samples = True
+
+    def __init__(self, model_name: str = "base", language: str = "en", workers: int = 1):
         self.model_name = model_name
         self.language = language
+        # Whisper installs per-call hooks on the model, so concurrent
+        # transcriptions each need their own copy; up to `workers` are loaded.
+        self.max_concurrency = max(1, workers)
         self._model = None
+        self._lock = threading.Lock()
+        self._idle: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._loaded = 0
+
+    def _new_model(self):
+        whisper = importlib.import_module("whisper")
+        log.info("Loading Whisper model %r (%d/%d)", self.model_name, self._loaded + 1, self.max_concurrency)
+        model = whisper.load_model(self.model_name)
+        self._loaded += 1
+        return model
 
     def _load_model(self):
         """Lazily import whisper to avoid hard dependency when unused."""
         if self._model is not None:
             return self._model
-        whisper = importlib.import_module("whisper")
-        self._model = whisper.load_model(self.model_name)
+        # Concurrent first requests share one load
+        with self._lock:
+            if self._model is None:
+                self._model = self._new_model()
+                self._idle.put(self._model)
         return self._model
 
+    @contextmanager
+    def _checkout(self) -> Iterator[Any]:
+        """Borrow an idle model, loading another if under max_concurrency."""
+        self._load_model()
+        try:
+            model = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                model = self._new_model() if self._loaded < self.max_concurrency else None
+            if model is None:
+                model = self._idle.get()
+        try:
+            yield model
+        finally:
+            self._idle.put(model)
+
+    def warm(self) -> None:
+        self._load_model()
+
+    @property
+    def is_warm(self) -> bool:
+        return self._model is not None
+
     def transcribe(self, audio_bytes: bytes, audio_format: str, sample_rate_hz: int) -> TranscriptResult:
+        # Whisper takes decoded samples in place of a path
+        return self.transcribe_samples(decode_pcm(audio_bytes, audio_format))
+
+    def transcribe_samples(
+        self, samples, original: Optional[Tuple[bytes, str, int]] = None
+    ) -> TranscriptResult:
         try:
-            model = self._load_model()
+            self._load_model()
         except ModuleNotFoundError as exc:
             raise RuntimeError(
                 "Whisper provider requires the 'whisper' package. Install openai-whisper to enable."
             ) from exc
 
-        with tempfile.NamedTemporaryFile(suffix=f".{audio_format}") as tmp:
-            tmp.write(audio_bytes)
-            tmp.flush()
-            result = model.transcribe(tmp.name, language=self.language)
+        with self._checkout() as model:
+            result = model.transcribe(samples, language=self.language)
 
         transcript = (result.get("text") or "").strip()
         words = result.get("segments")
@@ -61,8 +159,12 @@ class WhisperAdapter(ASRAdapter):
 class OpenAIWhisperAdapter(ASRAdapter):
     """OpenAI Whisper API implementation (cloud-based, no local model needed)."""
 
-    def __init__(self, model: str = "whisper-1"):
+    name = "openai"
+
+    def __init__(self, model: str = "whisper-1", max_concurrency: int = 4):
         self.model = model
+        # The client is thread-safe and pools connections across calls
+        self.max_concurrency = max(1, max_concurrency)
         self._client = None
 
     def _get_client(self):
@@ -84,33 +186,173 @@ class OpenAIWhisperAdapter(ASRAdapter):
         self._client = OpenAI(api_key=api_key)
         return self._client
 
+    def warm(self) -> None:
+        self._get_client()
+
+    @property
+    def is_warm(self) -> bool:
+        return self._client is not None
+
     def transcribe(self, audio_bytes: bytes, audio_format: str, sample_rate_hz: int) -> TranscriptResult:
         client = self._get_client()
 
-        # Write to temp file (OpenAI API requires file-like object)
-        with tempfile.NamedTemporaryFile(suffix=f".{audio_format}", delete=False) as tmp:
-            tmp.write(audio_bytes)
-            tmp.flush()
-            tmp_path = tmp.name
+        # Upload straight from memory; the filename tells the API the format
+        response = client.audio.transcriptions.create(
+            model=self.model,
+            file=upload_file(audio_bytes, audio_format),
+            response_format="text"
+        )
+
+        transcript = response.strip() if isinstance(response, str) else str(response).strip()
+        return TranscriptResult(transcript=transcript, confidence=None, words=None)
+
+
+class _WrappingASRAdapter(ASRAdapter):
+    """Base for adapters that preprocess audio for another adapter."""
+
+    def __init__(self, inner: ASRAdapter):
+        self.inner = inner
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.inner.max_concurrency
+
+    @property
+    def takes_samples(self) -> bool:
+        return self.inner.takes_samples
+
+    def warm(self) -> None:
+        self.inner.warm()
+
+    @property
+    def is_warm(self) -> bool:
+        return self.inner.is_warm
+
+
+class NormalizingASRAdapter(_WrappingASRAdapter):
+    """Decodes and trims silence (see ``audio_normalize``) before another adapter.
+
+    The trimmed samples go to the inner adapter's ``transcribe_samples``. If
+    the audio can't be decoded (e.g. ffmpeg missing for a webm upload), or
+    re-encoding it wouldn't make it smaller, the original is passed through.
+    """
+
+    def transcribe(self, audio_bytes: bytes, audio_format: str, sample_rate_hz: int) -> TranscriptResult:
+        from .audio_io import sniff_audio_format
+        from .audio_normalize import trim_silence
 
         try:
-            with open(tmp_path, "rb") as audio_file:
-                response = client.audio.transcriptions.create(
-                    model=self.model,
-                    file=audio_file,
-                    response_format="text"
-                )
-
-            transcript = response.strip() if isinstance(response, str) else str(response).strip()
-            return TranscriptResult(transcript=transcript, confidence=None, words=None)
-        finally:
-            import os
-            os.unlink(tmp_path)
+            samples = decode_pcm(audio_bytes, sniff_audio_format(audio_bytes) or audio_format or "wav")
+        except Exception as exc:
+            log.warning("Audio normalization failed, sending original audio: %s", exc)
+            return self.inner.transcribe(audio_bytes, audio_format, sample_rate_hz)
+        trimmed = trim_silence(samples)
+        log.info(
+            "Normalized %s audio for ASR: %.1fs -> %.1fs",
+            audio_format, len(samples) / SAMPLE_RATE, len(trimmed) / SAMPLE_RATE,
+        )
+        return self.inner.transcribe_samples(trimmed, original=(audio_bytes, audio_format, sample_rate_hz))
+
+    def transcribe_samples(
+        self, samples, original: Optional[Tuple[bytes, str, int]] = None
+    ) -> TranscriptResult:
+        from .audio_normalize import trim_silence
+
+        return self.inner.transcribe_samples(trim_silence(samples), original)
+
+
+class ChunkingASRAdapter(_WrappingASRAdapter):
+    """Splits long audio at pauses and transcribes the chunks concurrently.
+
+    Chunks are at most ``chunk_seconds`` long and cut in silences (see
+    ``audio_normalize.chunk_bounds``); up to ``workers`` run at once (default:
+    the inner adapter's ``max_concurrency``). Audio that fits in one chunk,
+    or can't be decoded, goes straight to the inner adapter. Chunks are
+    passed on as samples (``transcribe_samples``), so each is encoded at
+    most once, by a provider that uploads files.
+    """
+
+    def __init__(self, inner: ASRAdapter, chunk_seconds: float = 120.0, workers: Optional[int] = None):
+        super().__init__(inner)
+        self.chunk_seconds = chunk_seconds
+        self.workers = workers
+
+    def transcribe(self, audio_bytes: bytes, audio_format: str, sample_rate_hz: int) -> TranscriptResult:
+        try:
+            samples = decode_pcm(audio_bytes, audio_format)
+        except Exception as exc:
+            log.warning("Can't decode audio for chunking, transcribing whole: %s", exc)
+            return self.inner.transcribe(audio_bytes, audio_format, sample_rate_hz)
+
+        if len(samples) <= self.chunk_seconds * SAMPLE_RATE and not self.inner.takes_samples:
+            return self.inner.transcribe(audio_bytes, audio_format, sample_rate_hz)
+        return self.transcribe_samples(samples, original=(audio_bytes, audio_format, sample_rate_hz))
+
+    def transcribe_samples(
+        self, samples, original: Optional[Tuple[bytes, str, int]] = None
+    ) -> TranscriptResult:
+        from .audio_normalize import chunk_bounds
+
+        bounds = chunk_bounds(samples, self.chunk_seconds)
+        if len(bounds) == 1:
+            return self.inner.transcribe_samples(samples, original)
+
+        chunks = [samples[start:end] for start, end in bounds]
+        workers = min(self.workers or self.inner.max_concurrency, len(chunks))
+        log.info(
+            "Transcribing %.0fs of audio as %d chunks on %d workers",
+            len(samples) / SAMPLE_RATE, len(chunks), workers,
+        )
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asr-chunk") as pool:
+            results = list(pool.map(self.inner.transcribe_samples, chunks))
+
+        spans = [(start / SAMPLE_RATE, end / SAMPLE_RATE) for start, end in bounds]
+        return stitch_transcripts(results, spans)
+
+
+def stitch_transcripts(results: Sequence[TranscriptResult], spans: Sequence[Tuple[float, float]]) -> TranscriptResult:
+    """Join chunk transcripts in order, with timestamps on the whole-recording timeline.
+
+    Segments a provider returned are shifted by their chunk's start time;
+    chunks without segments become one segment each. Confidence is the
+    duration-weighted mean over chunks that report one.
+    """
+    texts = []
+    segments: List[Dict[str, Any]] = []
+    weighted, total = 0.0, 0.0
+    for result, (start, end) in zip(results, spans):
+        text = (result.transcript or "").strip()
+        if text:
+            texts.append(text)
+        if result.words:
+            for seg in result.words:
+                seg = dict(seg)
+                for key in ("start", "end"):
+                    if isinstance(seg.get(key), (int, float)):
+                        seg[key] = seg[key] + start
+                segments.append(seg)
+        else:
+            segments.append({"start": start, "end": end, "text": text})
+        if result.confidence is not None:
+            weighted += result.confidence * (end - start)
+            total += end - start
+
+    return TranscriptResult(
+        transcript=" ".join(texts),
+        confidence=weighted / total if total else None,
+        words=segments,
+    )
 
 
 class AmazonTranscribeAdapter(ASRAdapter):
     """Placeholder Amazon Transcribe implementation."""
 
+    name = "amazon_transcribe"
+
     def transcribe(self, audio_bytes: bytes, audio_format: str, sample_rate_hz: int) -> TranscriptResult:
         raise NotImplementedError("Amazon Transcribe provider not implemented")
 
@@ -118,6 +360,8 @@ class AmazonTranscribeAdapter(ASRAdapter):
 class GoogleASRAdapter(ASRAdapter):
     """Placeholder Google ASR implementation."""
 
+    name = "google"
+
     def transcribe(self, audio_bytes: bytes, audio_format: str, sample_rate_hz: int) -> TranscriptResult:
         raise NotImplementedError("Google ASR provider not implemented")
 
@@ -125,37 +369,134 @@ class GoogleASRAdapter(ASRAdapter):
 class AzureASRAdapter(ASRAdapter):
     """Placeholder Azure Speech implementation."""
 
+    name = "azure"
+
     def transcribe(self, audio_bytes: bytes, audio_format: str, sample_rate_hz: int) -> TranscriptResult:
         raise NotImplementedError("Azure ASR provider not implemented")
 
 
-def get_asr_provider(config: Optional[Dict[str, Any]] = None) -> ASRAdapter:
-    """Return a configured ASR adapter.
+class ASRSettings(NamedTuple):
+    """Resolved ``asr`` config section; also the registry key."""
 
-    Default is 'openai' (OpenAI Whisper API) for cloud deployment.
-    Use 'whisper' for local Whisper model.
-    Set 'auto' to auto-detect based on OPENAI_API_KEY environment variable.
-    """
+    provider: str
+    whisper_model: str
+    language: str
+    normalize: bool
+    chunk_seconds: float  # 0 disables chunking
+    workers: int  # concurrent chunk transcriptions (Whisper: models loaded)
+
+
+def _resolve_settings(config: Optional[Dict[str, Any]]) -> ASRSettings:
+    """ASR settings for a config (the shared config if None)."""
     import os
-    cfg = (config or {}).get("asr", {})
+    cfg = (config if config is not None else get_config()).get("asr", {})
 
     provider = (cfg.get("provider") or "auto").lower()
 
     # Auto-detect: use openai if OPENAI_API_KEY is set, otherwise whisper
     if provider == "auto":
         provider = "openai" if os.environ.get("OPENAI_API_KEY") else "whisper"
-    language = cfg.get("language", "en")
-    model_name = cfg.get("whisper_model", "base")
-
-    if provider in ("openai", "openai_whisper"):
-        return OpenAIWhisperAdapter()
-    if provider == "whisper":
-        return WhisperAdapter(model_name=model_name, language=language)
-    if provider in ("amazon", "amazon_transcribe"):
-        return AmazonTranscribeAdapter()
-    if provider in ("google", "google_asr"):
-        return GoogleASRAdapter()
-    if provider in ("azure", "azure_speech"):
-        return AzureASRAdapter()
-
-    raise ValueError(f"Unknown ASR provider: {provider}")
+    provider = {
+        "openai_whisper": "openai",
+        "amazon": "amazon_transcribe",
+        "google_asr": "google",
+        "azure_speech": "azure",
+    }.get(provider, provider)
+    return ASRSettings(
+        provider=provider,
+        whisper_model=cfg.get("whisper_model", "base"),
+        language=cfg.get("language", "en"),
+        normalize=bool(cfg.get("normalize", True)),
+        chunk_seconds=float(cfg.get("chunk_seconds", 120)),
+        workers=int(cfg.get("workers", 1 if provider == "whisper" else 4)),
+    )
+
+
+def create_asr_provider(config: Optional[Dict[str, Any]] = None) -> ASRAdapter:
+    """Construct a new ASR adapter (not shared; see get_asr_provider).
+
+    The provider is wrapped in ``ChunkingASRAdapter`` unless
+    ``asr.chunk_seconds`` is 0, and in ``NormalizingASRAdapter`` unless
+    ``asr.normalize`` is false.
+    """
+    settings = _resolve_settings(config)
+    provider = settings.provider
+
+    if provider == "openai":
+        adapter: ASRAdapter = OpenAIWhisperAdapter(max_concurrency=settings.workers)
+    elif provider == "whisper":
+        adapter = WhisperAdapter(
+            model_name=settings.whisper_model, language=settings.language, workers=settings.workers
+        )
+    elif provider == "amazon_transcribe":
+        adapter = AmazonTranscribeAdapter()
+    elif provider == "google":
+        adapter = GoogleASRAdapter()
+    elif provider == "azure":
+        adapter = AzureASRAdapter()
+    else:
+        raise ValueError(f"Unknown ASR provider: {provider}")
+
+    if settings.chunk_seconds > 0:
+        adapter = ChunkingASRAdapter(adapter, chunk_seconds=settings.chunk_seconds)
+    return NormalizingASRAdapter(adapter) if settings.normalize else adapter
+
+
+_PROVIDERS: Dict[ASRSettings, ASRAdapter] = {}
+_PROVIDERS_LOCK = threading.Lock()
+
+
+def get_asr_provider(config: Optional[Dict[str, Any]] = None) -> ASRAdapter:
+    """Return the shared ASR adapter for this config.
+
+    Default is 'openai' (OpenAI Whisper API) for cloud deployment.
+    Use 'whisper' for local Whisper model.
+    Set 'auto' to auto-detect based on OPENAI_API_KEY environment variable.
+    """
+    key = _resolve_settings(config)
+    adapter = _PROVIDERS.get(key)
+    if adapter is None:
+        with _PROVIDERS_LOCK:
+            adapter = _PROVIDERS.get(key)
+            if adapter is None:
+                adapter = _PROVIDERS[key] = create_asr_provider(config)
+    return adapter
+
+
+def asr_chunks_long_audio(config: Optional[Dict[str, Any]] = None) -> bool:
+    """Whether the shared adapter can split long recordings.
+
+    Needs asr.chunk_seconds > 0 and ffmpeg to decode the upload; without
+    either, a long recording would reach the provider as one request.
+    """
+    return _resolve_settings(config).chunk_seconds > 0 and ffmpeg_available()
+
+
+def warm_asr_provider(config: Optional[Dict[str, Any]] = None) -> Optional[ASRAdapter]:
+    """Create and warm the shared adapter at startup; failures are logged, not raised."""
+    try:
+        adapter = get_asr_provider(config)
+        adapter.warm()
+    except Exception as exc:
+        log.error("Failed to warm ASR provider: %s", exc)
+        return None
+    log.info("ASR provider %s warm", adapter.name)
+    return adapter
+
+
+def asr_status() -> List[Dict[str, Any]]:
+    """Registered adapters and whether each is warm (for health endpoints)."""
+    return [
+        {
+            "provider": settings.provider,
+            "model": settings.whisper_model if settings.provider == "whisper" else None,
+            "warm": adapter.is_warm,
+        }
+        for settings, adapter in list(_PROVIDERS.items())
+    ]
+
+
+def reset_asr_providers() -> None:
+    """Drop all shared adapters (tests, or after changing credentials)."""
+    with _PROVIDERS_LOCK:
+        _PROVIDERS.clear()
@@ -0,0 +1,152 @@
+"""In-memory audio handoff for the ASR adapters.
+
+Uploads arrive as bytes. Rather than copying them to a temp file for each
+provider to read back:
+
+- ``upload_file`` wraps them as a ``(filename, bytes)`` pair, which the
+  OpenAI SDK accepts directly as a multipart file.
+- ``decode_pcm`` turns them into the 16 kHz mono float32 array local Whisper
+  takes in place of a path. 16 kHz mono 16-bit WAV is read in-process;
+  anything else is piped through ffmpeg's stdin. Containers ffmpeg can't
+  decode from a pipe (e.g. MP4/M4A with the index at the end) fall back to a
+  spool file on tmpfs (``/dev/shm``) when available.
+- ``encode_opus`` goes the other way, packing 16 kHz mono samples into a
+  small Ogg/Opus file for upload.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import wave
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Whisper's expected input
+SAMPLE_RATE = 16000
+
+# Speech-tuned Opus bitrate for re-encoded uploads (~240 KB per minute)
+OPUS_BITRATE = "32k"
+
+# Memory-backed spool directory for decoders that need a seekable path
+SPOOL_DIR: Optional[str] = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
+
+def sniff_audio_format(audio_bytes: bytes) -> Optional[str]:
+    """Container format from the file's magic bytes, or None if unrecognized."""
+    head = audio_bytes[:12]
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if head[4:8] == b"ftyp":
+        return "m4a"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:3] == b"ID3" or head[:2] in (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2"):
+        return "mp3"
+    return None
+
+
+def upload_file(audio_bytes: bytes, audio_format: str) -> Tuple[str, bytes]:
+    """(filename, content) pair for HTTP upload APIs; the extension sets the format."""
+    return f"audio.{audio_format or 'wav'}", audio_bytes
+
+
+@contextmanager
+def spooled_audio_file(audio_bytes: bytes, audio_format: str) -> Iterator[str]:
+    """Path to a short-lived copy of the audio, on tmpfs when available."""
+    fd, path = tempfile.mkstemp(suffix=f".{audio_format or 'wav'}", dir=SPOOL_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio_bytes)
+        yield path
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _pcm16_to_float(pcm: bytes):
+    import numpy as np
+
+    return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+
+def _decode_wav(audio_bytes: bytes):
+    """Samples of a 16 kHz mono 16-bit PCM WAV, or None if it needs resampling/decoding."""
+    try:
+        with wave.open(io.BytesIO(audio_bytes)) as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (SAMPLE_RATE, 1, 2):
+                return None
+            return _pcm16_to_float(wav.readframes(wav.getnframes()))
+    except (wave.Error, EOFError):
+        return None
+
+
+def _ffmpeg(source: str, audio_bytes: Optional[bytes]) -> subprocess.CompletedProcess:
+    """Run ffmpeg on a path (audio_bytes None) or on audio_bytes via stdin ("pipe:0")."""
+    cmd = ["ffmpeg", "-hide_banner"]
+    if audio_bytes is None:
+        cmd.append("-nostdin")
+    cmd += [
+        "-threads", "0",
+        "-i", source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+    return subprocess.run(cmd, input=audio_bytes, capture_output=True)
+
+
+def ffmpeg_available() -> bool:
+    """Whether ffmpeg is on PATH (needed to decode anything but plain WAV)."""
+    return shutil.which("ffmpeg") is not None
+
+
+def decode_pcm(audio_bytes: bytes, audio_format: str = "wav"):
+    """Decode audio to a 16 kHz mono float32 numpy array (Whisper's input)."""
+    if audio_format.lower() == "wav":
+        samples = _decode_wav(audio_bytes)
+        if samples is not None:
+            return samples
+
+    try:
+        result = _ffmpeg("pipe:0", audio_bytes)
+    except FileNotFoundError as exc:
+        raise RuntimeError("Decoding audio requires ffmpeg on PATH") from exc
+    if result.returncode != 0 or not result.stdout:
+        log.info("ffmpeg could not decode %s from a pipe; spooling to %s", audio_format, SPOOL_DIR or "temp dir")
+        with spooled_audio_file(audio_bytes, audio_format) as path:
+            result = _ffmpeg(path, None)
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to decode audio: {result.stderr.decode(errors='replace')[-500:]}")
+    return _pcm16_to_float(result.stdout)
+
+
+def encode_opus(samples, bitrate: str = OPUS_BITRATE) -> bytes:
+    """Ogg/Opus bytes for 16 kHz mono float samples, encoded by ffmpeg."""
+    import numpy as np
+
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    cmd = [
+        "ffmpeg", "-hide_banner",
+        "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-i", "pipe:0",
+        "-c:a", "libopus", "-b:a", bitrate, "-application", "voip",
+        "-f", "ogg", "-",
+    ]
+    try:
+        result = subprocess.run(cmd, input=pcm, capture_output=True)
+    except FileNotFoundError as exc:
+        raise RuntimeError("Encoding Opus requires ffmpeg on PATH") from exc
+    if result.returncode != 0 or not result.stdout:
+        raise RuntimeError(f"Failed to encode Opus: {result.stderr.decode(errors='replace')[-500:]}")
+    return result.stdout
@@ -0,0 +1,202 @@
+"""Audio normalization stage in front of the ASR providers.
+
+Browser uploads arrive as webm/m4a/wav at up to 48 kHz stereo, often with
+long pauses while staff walk between shelves. ``normalize_audio`` decodes
+once (see ``audio_io.decode_pcm``), which also downmixes to mono and
+resamples to 16 kHz, then:
+
+- trims leading/trailing silence, keeping ``EDGE_PAD_MS`` of context;
+- shortens internal silences longer than ``MAX_PAUSE_MS`` to that length;
+- re-encodes compactly as Ogg/Opus (``audio_io.encode_opus``, ~240 KB per
+  minute), or as 16 kHz mono 16-bit WAV (~1.9 MB per minute) if ffmpeg
+  can't encode.
+
+Browser webm/opus and m4a uploads are often already smaller than that, so
+callers should keep the original whenever ``bytes_saved`` isn't positive.
+
+Silence is found with a frame-energy VAD: a 30 ms frame is speech if it is
+``SPEECH_MARGIN_DB`` above the recording's noise floor (its quietest frames)
+and louder than ``SILENCE_DBFS``, so a noisy walk-in cooler doesn't count as
+all speech and a quiet office doesn't count as all silence.
+
+``asr_adapter.NormalizingASRAdapter`` wraps any adapter with the decode and
+trim steps, handing the samples on so they are encoded only where a provider
+uploads them; ``get_asr_provider`` applies it unless ``asr.normalize`` is false.
+``chunk_bounds`` uses the same VAD to pick pause-aligned cut points for
+``asr_adapter.ChunkingASRAdapter``.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import wave
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .audio_io import SAMPLE_RATE, decode_pcm, encode_opus, sniff_audio_format
+
+log = logging.getLogger(__name__)
+
+FRAME_MS = 30
+EDGE_PAD_MS = 200
+MAX_PAUSE_MS = 700
+SILENCE_DBFS = -50.0
+SPEECH_MARGIN_DB = 10.0
+NOISE_FLOOR_PERCENTILE = 10
+
+
+@dataclass
+class NormalizedAudio:
+    """Normalized audio plus what normalization saved."""
+
+    audio_bytes: bytes
+    audio_format: str
+    sample_rate_hz: int
+    input_bytes: int
+    input_duration_s: float
+    duration_s: float
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.input_bytes - len(self.audio_bytes)
+
+    @property
+    def seconds_saved(self) -> float:
+        return self.input_duration_s - self.duration_s
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "input_bytes": self.input_bytes,
+            "output_bytes": len(self.audio_bytes),
+            "bytes_saved": self.bytes_saved,
+            "input_duration_s": round(self.input_duration_s, 2),
+            "duration_s": round(self.duration_s, 2),
+            "seconds_saved": round(self.seconds_saved, 2),
+        }
+
+
+def speech_frames(samples, sample_rate: int = SAMPLE_RATE):
+    """Boolean array, one entry per FRAME_MS frame: True where someone is talking."""
+    import numpy as np
+
+    frame = sample_rate * FRAME_MS // 1000
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return np.zeros(0, dtype=bool)
+    frames = samples[: n_frames * frame].reshape(n_frames, frame).astype(np.float64)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    level_db = 20 * np.log10(np.maximum(rms, 1e-10))
+    noise_floor = np.percentile(level_db, NOISE_FLOOR_PERCENTILE)
+    return level_db > max(SILENCE_DBFS, noise_floor + SPEECH_MARGIN_DB)
+
+
+def trim_silence(samples, sample_rate: int = SAMPLE_RATE):
+    """Drop edge silence and shorten long pauses; returns samples unchanged if no speech is found."""
+    import numpy as np
+
+    voiced = speech_frames(samples, sample_rate)
+    if not voiced.any():
+        return samples
+
+    frame = sample_rate * FRAME_MS // 1000
+    pad = sample_rate * EDGE_PAD_MS // 1000
+    max_pause = sample_rate * MAX_PAUSE_MS // 1000
+
+    # Contiguous speech runs as [start, end) sample ranges
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    runs = edges.reshape(-1, 2) * frame
+
+    keep = []
+    start = max(0, runs[0][0] - pad)
+    for (_, end), (next_start, _) in zip(runs[:-1], runs[1:]):
+        if next_start - end > max_pause:
+            keep.append(samples[start : end + max_pause // 2])
+            start = next_start - max_pause // 2
+    keep.append(samples[start : min(len(samples), runs[-1][1] + pad)])
+    return np.concatenate(keep)
+
+
+def chunk_bounds(
+    samples, max_chunk_s: float, min_chunk_s: float = 10.0, sample_rate: int = SAMPLE_RATE
+) -> List[Tuple[int, int]]:
+    """Split samples into [start, end) chunks of at most max_chunk_s, cut at pauses.
+
+    Each cut goes in the middle of the longest silence between min_chunk_s
+    and max_chunk_s into the chunk (the later one on ties), so words aren't
+    split; a chunk with no silence at all is cut at max_chunk_s.
+    """
+    import numpy as np
+
+    n = len(samples)
+    max_len = int(max_chunk_s * sample_rate)
+    if n <= max_len:
+        return [(0, n)]
+
+    frame = sample_rate * FRAME_MS // 1000
+    silent = ~speech_frames(samples, sample_rate)
+    max_frames = max_len // frame
+    min_frames = min(int(min_chunk_s * sample_rate) // frame, max_frames - 1)
+
+    bounds = []
+    start_frame = 0
+    while n - start_frame * frame > max_len:
+        window = silent[start_frame + min_frames : start_frame + max_frames]
+        cut = start_frame + max_frames
+        if window.any():
+            # Silent runs in the window as [start, end) frame offsets
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], window.astype(np.int8), [0]))))
+            runs = edges.reshape(-1, 2)
+            lengths = runs[:, 1] - runs[:, 0]
+            best = len(lengths) - 1 - int(np.argmax(lengths[::-1]))
+            cut = start_frame + min_frames + int(runs[best].sum() // 2)
+        bounds.append((start_frame * frame, cut * frame))
+        start_frame = cut
+    bounds.append((start_frame * frame, n))
+    return bounds
+
+
+def encode_wav(samples, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """16-bit mono PCM WAV bytes for float samples in [-1, 1]."""
+    import numpy as np
+
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def encode_compact(samples) -> Tuple[bytes, str]:
+    """(bytes, format) for samples: Ogg/Opus, or WAV if ffmpeg can't encode."""
+    try:
+        return encode_opus(samples), "ogg"
+    except RuntimeError as exc:
+        log.info("Opus encoding unavailable, using WAV: %s", exc)
+        return encode_wav(samples), "wav"
+
+
+def normalize_audio(audio_bytes: bytes, audio_format: Optional[str] = None) -> NormalizedAudio:
+    """Decode, downmix/resample to 16 kHz mono, trim silence and re-encode compactly.
+
+    ``audio_format`` is only a hint; the container is sniffed from the bytes
+    when possible. The result may be larger than the input (see
+    ``bytes_saved``).
+    """
+    audio_format = sniff_audio_format(audio_bytes) or audio_format or "wav"
+    samples = decode_pcm(audio_bytes, audio_format)
+    trimmed = trim_silence(samples)
+    encoded, encoded_format = encode_compact(trimmed)
+    result = NormalizedAudio(
+        audio_bytes=encoded,
+        audio_format=encoded_format,
+        sample_rate_hz=SAMPLE_RATE,
+        input_bytes=len(audio_bytes),
+        input_duration_s=len(samples) / SAMPLE_RATE,
+        duration_s=len(trimmed) / SAMPLE_RATE,
+    )
+    log.info("Normalized %s audio for ASR: %s", audio_format, result.stats())
+    return result
@@ -4,23 +4,38 @@ Provides a clean interface for calling Claude from domain agents with:
 - Environment-based API key configuration
 - Configurable model selection
 - Structured JSON response parsing
+- Prompt caching for large static system prompts
+- Sync and async clients sharing one concurrency cap, retry/backoff on
+  transient failures and per-model latency histograms
 - Error handling with graceful fallback
 - Logging for debugging and audit trails
 """
 
 from __future__ import annotations
 
+import asyncio
+import bisect
 import json
 import logging
 import os
+import random
 import re
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import anthropic
 
 log = logging.getLogger(__name__)
 
+# Max Claude requests in flight per process (shared by all clients)
+CLAUDE_MAX_CONCURRENCY = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "8"))
+# HTTP statuses worth retrying besides 5xx: request timeout, conflict, rate limited
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+
 
 @dataclass
 class ClaudeConfig:
@@ -30,16 +45,31 @@ class ClaudeConfig:
     max_tokens: int = 16000  # Max OUTPUT tokens
     max_input_tokens: int = 15000  # Max INPUT tokens (warn if exceeded)
     timeout_seconds: float = 120.0
+    prompt_caching: bool = True  # Mark the system prompt as a cacheable prefix
+    max_retries: int = 4  # Retries on transient errors before giving up
+    backoff_base_seconds: float = 1.0  # First retry waits up to this long
+    backoff_max_seconds: float = 30.0
 
     @classmethod
-    def from_dict(cls, config: Dict[str, Any]) -> "ClaudeConfig":
-        """Create config from dictionary (e.g., from YAML config)."""
+    def from_dict(cls, config: Optional[Dict[str, Any]] = None) -> "ClaudeConfig":
+        """Create config from dictionary (e.g., from YAML config).
+
+        With no dictionary, reads the shared app config (default.yaml).
+        """
+        if config is None:
+            from .app_config import get_config
+
+            config = get_config()
         claude_config = config.get("claude", {})
         return cls(
             model=claude_config.get("model", cls.model),
             max_tokens=claude_config.get("max_tokens", cls.max_tokens),
             max_input_tokens=claude_config.get("max_input_tokens", cls.max_input_tokens),
             timeout_seconds=claude_config.get("timeout_seconds", cls.timeout_seconds),
+            prompt_caching=claude_config.get("prompt_caching", cls.prompt_caching),
+            max_retries=claude_config.get("max_retries", cls.max_retries),
+            backoff_base_seconds=claude_config.get("backoff_base_seconds", cls.backoff_base_seconds),
+            backoff_max_seconds=claude_config.get("backoff_max_seconds", cls.backoff_max_seconds),
         )
 
 
@@ -54,6 +84,222 @@ class ClaudeResponse:
     model: Optional[str] = None
     usage: Optional[Dict[str, int]] = None
 
+    @property
+    def cache_hit_ratio(self) -> Optional[float]:
+        """Share of prompt tokens served from the prompt cache (None if no usage)."""
+        return cache_hit_ratio(self.usage)
+
+
+def cache_hit_ratio(usage: Optional[Dict[str, int]]) -> Optional[float]:
+    """Fraction of input tokens read from cache for a usage dict.
+
+    The API reports uncached input, cache writes and cache reads separately;
+    together they make up the full prompt.
+    """
+    if not usage:
+        return None
+    total = (
+        usage.get("input_tokens", 0)
+        + usage.get("cache_creation_input_tokens", 0)
+        + usage.get("cache_read_input_tokens", 0)
+    )
+    if not total:
+        return None
+    return usage.get("cache_read_input_tokens", 0) / total
+
+
+def build_system_blocks(
+    system_prompt: str,
+    system_suffix: Optional[str] = None,
+    *,
+    cache: bool = True,
+) -> List[Dict[str, Any]]:
+    """Build the `system` content blocks for a messages request.
+
+    The static system prompt comes first and, when caching is on, carries the
+    cache breakpoint so every later call with the same prompt reuses it. An
+    optional per-call suffix goes after the breakpoint and is never cached.
+    """
+    blocks: List[Dict[str, Any]] = [{"type": "text", "text": system_prompt}]
+    if cache:
+        blocks[0]["cache_control"] = {"type": "ephemeral"}
+    if system_suffix:
+        blocks.append({"type": "text", "text": system_suffix})
+    return blocks
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram (milliseconds)."""
+
+    BUCKETS_MS = (250, 500, 1000, 2000, 5000, 10000, 20000, 40000, 80000, 120000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+            self._count += 1
+            self._sum_ms += ms
+            self._max_ms = max(self._max_ms, ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{b}" for b in self.BUCKETS_MS] + ["le_inf"]
+            return {
+                "count": self._count,
+                "avg_ms": round(self._sum_ms / self._count, 1) if self._count else None,
+                "max_ms": round(self._max_ms, 1),
+                "buckets": dict(zip(labels, self._counts)),
+            }
+
+
+_latency: Dict[str, LatencyHistogram] = {}
+_latency_lock = threading.Lock()
+_retry_count = 0
+
+
+class ConcurrencyLimiter:
+    """One slot budget shared by threads and asyncio tasks (on any event loop).
+
+    Free slots go to waiters in FIFO order: a waiting thread is woken through
+    its Event, a waiting task by resolving its future on its own loop. Async
+    waiters hold no thread while they wait, and a task cancelled while
+    waiting never keeps a slot: if one was handed to it concurrently, it is
+    passed on.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._free = slots
+        self._lock = threading.Lock()
+        self._waiters: deque = deque()
+
+    @property
+    def available(self) -> int:
+        with self._lock:
+            return self._free
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot, blocking the calling thread until one is free."""
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                event = None
+            else:
+                event = threading.Event()
+                self._waiters.append(event)
+        if event is not None:
+            event.wait()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def async_slot(self):
+        """Hold a slot without blocking the event loop."""
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                fut = None
+            else:
+                fut = asyncio.get_running_loop().create_future()
+                self._waiters.append(fut)
+        if fut is not None:
+            try:
+                await fut
+            except asyncio.CancelledError:
+                with self._lock:
+                    if fut in self._waiters:  # never handed a slot
+                        self._waiters.remove(fut)
+                        raise
+                # Handed a slot as we were cancelled. If the future still got
+                # its result we own the slot; if it was cancelled first,
+                # _wake sees that and releases instead.
+                if not fut.cancelled():
+                    self.release()
+                raise
+        try:
+            yield
+        finally:
+            self.release()
+
+    def release(self) -> None:
+        """Return a slot: hand it to the oldest waiter, or mark it free."""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                try:
+                    waiter.get_loop().call_soon_threadsafe(self._wake, waiter)
+                    return
+                except RuntimeError:  # its event loop is closed
+                    continue
+            self._free += 1
+
+    def _wake(self, fut: "asyncio.Future[None]") -> None:
+        if fut.cancelled():
+            self.release()
+        else:
+            fut.set_result(None)
+
+
+# Process-wide cap on in-flight calls, shared by the sync and async clients
+_limiter = ConcurrencyLimiter(CLAUDE_MAX_CONCURRENCY)
+
+
+def _observe_latency(model: str, ms: float) -> None:
+    with _latency_lock:
+        hist = _latency.get(model)
+        if hist is None:
+            hist = _latency[model] = LatencyHistogram()
+    hist.observe(ms)
+
+
+def get_latency_stats() -> Dict[str, Any]:
+    """Per-model Claude call latency histograms plus the retry count."""
+    with _latency_lock:
+        models = dict(_latency)
+    return {
+        "max_concurrency": CLAUDE_MAX_CONCURRENCY,
+        "retries": _retry_count,
+        "models": {model: hist.snapshot() for model, hist in models.items()},
+    }
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Connection errors and timeouts, 408/409/429 and 5xx (incl. 529 overloaded)."""
+    if isinstance(exc, anthropic.APIConnectionError):  # includes APITimeoutError
+        return True
+    return isinstance(exc, anthropic.APIStatusError) and (
+        exc.status_code in RETRYABLE_STATUS_CODES or exc.status_code >= 500
+    )
+
+
+def _describe_error(exc: Exception) -> str:
+    return str(getattr(exc, "status_code", None) or type(exc).__name__)
+
+
+def _backoff_delay(config: ClaudeConfig, attempt: int, exc: Exception) -> float:
+    """Full-jitter exponential backoff, never shorter than a Retry-After hint."""
+    global _retry_count
+    _retry_count += 1
+    delay = random.uniform(0, min(config.backoff_max_seconds, config.backoff_base_seconds * 2 ** attempt))
+    retry_after = getattr(getattr(exc, "response", None), "headers", {}).get("retry-after")
+    try:
+        delay = max(delay, min(float(retry_after), config.backoff_max_seconds))
+    except (TypeError, ValueError):
+        pass
+    return delay
+
 
 class ClaudeClient:
     """Client for calling Claude API.
@@ -89,6 +335,14 @@ class ClaudeClient:
         self.config = config or ClaudeConfig()
         self._client: Optional[anthropic.Anthropic] = None
 
+        # Running prompt-cache totals across calls made by this client
+        self.cache_stats: Dict[str, int] = {
+            "calls": 0,
+            "input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+
     @property
     def client(self) -> anthropic.Anthropic:
         """Lazy-load the Anthropic client."""
@@ -98,6 +352,7 @@ class ClaudeClient:
             self._client = anthropic.Anthropic(
                 api_key=self.api_key,
                 timeout=self.config.timeout_seconds,
+                max_retries=0,  # retries handled in _send
             )
         return self._client
 
@@ -109,24 +364,71 @@ class ClaudeClient:
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
         extract_json: bool = True,
+        system_suffix: Optional[str] = None,
+        cache_system: Optional[bool] = None,
     ) -> ClaudeResponse:
         """Call Claude API with system prompt and user content.
 
         Args:
             system_prompt: The system prompt defining agent behavior and rules.
+                This is the static prefix and is cached when caching is on.
             user_content: The user's input (e.g., transcript to parse).
             model: Override model selection.
             max_tokens: Override max tokens.
             extract_json: If True, attempt to extract JSON from response.
+            system_suffix: Per-call system text appended after the cached prefix.
+            cache_system: Override config.prompt_caching for this call.
 
         Returns:
             ClaudeResponse with success status, content, and optional parsed JSON.
         """
+        request = self._prepare_request(
+            system_prompt, user_content, model, max_tokens, system_suffix, cache_system
+        )
+        try:
+            message = self._send(request)
+            return self._build_response(message, request["model"], extract_json)
+        except Exception as exc:
+            return self._error_response(exc)
+
+    def _send(self, request: Dict[str, Any]) -> Any:
+        """Make the API request, waiting for a concurrency slot and retrying transient errors."""
+        attempt = 0
+        while True:
+            with _limiter.slot():
+                start = time.perf_counter()
+                try:
+                    message = self.client.messages.create(**request)
+                except Exception as exc:
+                    if not _is_retryable(exc) or attempt >= self.config.max_retries:
+                        raise
+                    error = exc
+                else:
+                    _observe_latency(request["model"], (time.perf_counter() - start) * 1000)
+                    return message
+            delay = _backoff_delay(self.config, attempt, error)
+            log.warning("Claude API call failed (%s); retry %d in %.1fs", _describe_error(error), attempt + 1, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _prepare_request(
+        self,
+        system_prompt: str,
+        user_content: str,
+        model: Optional[str],
+        max_tokens: Optional[int],
+        system_suffix: Optional[str],
+        cache_system: Optional[bool],
+    ) -> Dict[str, Any]:
+        """Build messages.create kwargs and log the outgoing call."""
         model = model or self.config.model
         max_tokens = max_tokens or self.config.max_tokens
 
         # Estimate input tokens (rough: ~4 chars per token)
-        estimated_input_tokens = (len(system_prompt) + len(user_content)) // 4
+        estimated_input_tokens = (
+            len(system_prompt) + len(system_suffix or "") + len(user_content)
+        ) // 4
+        cache = self.config.prompt_caching if cache_system is None else cache_system
 
         if estimated_input_tokens > self.config.max_input_tokens:
             log.warning(
@@ -136,58 +438,78 @@ class ClaudeClient:
             )
 
         log.info(
-            "Calling Claude API (model=%s, max_output=%d, est_input=%d)",
-            model, max_tokens, estimated_input_tokens
+            "Calling Claude API (model=%s, max_output=%d, est_input=%d, cache=%s)",
+            model, max_tokens, estimated_input_tokens, cache
         )
 
-        try:
-            message = self.client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_content}
-                ],
-            )
+        return {
+            "model": model,
+            "max_tokens": max_tokens,
+            "system": build_system_blocks(system_prompt, system_suffix, cache=cache),
+            "messages": [
+                {"role": "user", "content": user_content}
+            ],
+        }
 
-            content = message.content[0].text if message.content else ""
-            usage = {
-                "input_tokens": message.usage.input_tokens,
-                "output_tokens": message.usage.output_tokens,
-            }
+    def _build_response(self, message: Any, model: str, extract_json: bool) -> ClaudeResponse:
+        content = message.content[0].text if message.content else ""
+        usage = self._usage_dict(message.usage)
+        self._record_cache_usage(usage)
 
-            log.info(
-                "Claude API call successful (input=%d, output=%d tokens)",
-                usage["input_tokens"],
-                usage["output_tokens"],
-            )
+        log.info(
+            "Claude API call successful (input=%d, output=%d, cache_read=%d, "
+            "cache_write=%d tokens, cache_hit=%.0f%%, session_cache_hit=%.0f%%)",
+            usage["input_tokens"],
+            usage["output_tokens"],
+            usage["cache_read_input_tokens"],
+            usage["cache_creation_input_tokens"],
+            100 * (cache_hit_ratio(usage) or 0.0),
+            100 * (cache_hit_ratio(self.cache_stats) or 0.0),
+        )
 
-            json_data = None
-            if extract_json:
-                json_data = self._extract_json(content)
+        json_data = None
+        if extract_json:
+            json_data = self._extract_json(content)
 
-            return ClaudeResponse(
-                success=True,
-                content=content,
-                json_data=json_data,
-                model=model,
-                usage=usage,
-            )
+        return ClaudeResponse(
+            success=True,
+            content=content,
+            json_data=json_data,
+            model=model,
+            usage=usage,
+        )
 
-        except anthropic.APIError as exc:
+    @staticmethod
+    def _error_response(exc: Exception) -> ClaudeResponse:
+        if isinstance(exc, anthropic.APIError):
             log.error("Claude API error: %s", exc)
             return ClaudeResponse(
                 success=False,
                 content="",
                 error=f"API error: {exc}",
             )
-        except Exception as exc:
-            log.error("Unexpected error calling Claude: %s", exc)
-            return ClaudeResponse(
-                success=False,
-                content="",
-                error=f"Unexpected error: {exc}",
-            )
+        log.error("Unexpected error calling Claude: %s", exc)
+        return ClaudeResponse(
+            success=False,
+            content="",
+            error=f"Unexpected error: {exc}",
+        )
+
+    @staticmethod
+    def _usage_dict(usage: Any) -> Dict[str, int]:
+        """Flatten the SDK usage object; cache fields are None when unused."""
+        return {
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+        }
+
+    def _record_cache_usage(self, usage: Dict[str, int]) -> None:
+        stats = self.cache_stats
+        stats["calls"] += 1
+        for key in ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"):
+            stats[key] += usage[key]
 
     def _extract_json(self, content: str) -> Optional[Dict[str, Any]]:
         """Extract JSON from Claude's response.
@@ -224,6 +546,79 @@ class ClaudeClient:
         return None
 
 
+class AsyncClaudeClient(ClaudeClient):
+    """Non-blocking Claude client for use from async routes.
+
+    Same configuration, prompt caching and ClaudeResponse contract as
+    ClaudeClient, but `call` is a coroutine backed by anthropic.AsyncAnthropic.
+    Calls share the sync client's process-wide limit (CLAUDE_MAX_CONCURRENCY)
+    and back off with jitter on transient errors without holding a slot
+    while they wait.
+
+    Usage:
+        client = AsyncClaudeClient()
+        response = await client.call(system_prompt=..., user_content=...)
+    """
+
+    @property
+    def client(self) -> anthropic.AsyncAnthropic:
+        """Lazy-load the async Anthropic client."""
+        if self._client is None:
+            if not self.api_key:
+                raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+            self._client = anthropic.AsyncAnthropic(
+                api_key=self.api_key,
+                timeout=self.config.timeout_seconds,
+                max_retries=0,  # retries handled in _send
+            )
+        return self._client
+
+    async def call(
+        self,
+        system_prompt: str,
+        user_content: str,
+        *,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        extract_json: bool = True,
+        system_suffix: Optional[str] = None,
+        cache_system: Optional[bool] = None,
+    ) -> ClaudeResponse:
+        """Async version of ClaudeClient.call (same arguments and return value)."""
+        request = self._prepare_request(
+            system_prompt, user_content, model, max_tokens, system_suffix, cache_system
+        )
+        try:
+            message = await self._send(request)
+            return self._build_response(message, request["model"], extract_json)
+        except Exception as exc:
+            return self._error_response(exc)
+
+    async def _send(self, request: Dict[str, Any]) -> Any:
+        attempt = 0
+        while True:
+            async with _limiter.async_slot():
+                start = time.perf_counter()
+                try:
+                    message = await self.client.messages.create(**request)
+                except Exception as exc:
+                    if not _is_retryable(exc) or attempt >= self.config.max_retries:
+                        raise
+                    error = exc
+                else:
+                    _observe_latency(request["model"], (time.perf_counter() - start) * 1000)
+                    return message
+            delay = _backoff_delay(self.config, attempt, error)
+            log.warning("Claude API call failed (%s); retry %d in %.1fs", _describe_error(error), attempt + 1, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
 # Module-level convenience function
 _default_client: Optional[ClaudeClient] = None
 
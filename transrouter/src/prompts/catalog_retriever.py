@@ -0,0 +1,221 @@
+"""Transcript-driven catalog retrieval for the inventory prompt.
+
+The inventory catalog is too large to send whole (651 grocery items alone),
+and sending a fixed slice hides the long tail from the model. Instead, the
+retriever picks the catalog entries a specific transcript is likely to
+mention and only those go into the prompt.
+
+Matching is purely local and lexical:
+- exact tokens from item names, keywords and manual-mapping spoken names
+- phonetic keys, for ASR misspellings ("jager" / "yager", "stirrings" / "sturings")
+- prefixes ("sauv" → "sauvignon")
+- a fuzzy fallback for leftover tokens (rapidfuzz)
+
+Each matched catalog token contributes its IDF weight (scaled by match type),
+so rare brand words outweigh generic ones like "can" or "light".
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rapidfuzz import fuzz, process
+from unidecode import unidecode
+
+from inventory_agent.catalog_store import get_catalog_store
+
+log = logging.getLogger(__name__)
+
+# Default number of catalog entries injected per transcript
+DEFAULT_TOP_K = 60
+
+# Weight per match type (multiplied by the catalog token's IDF)
+EXACT_WEIGHT = 1.0
+PHONETIC_WEIGHT = 0.7
+PREFIX_WEIGHT = 0.6
+FUZZY_WEIGHT = 0.5
+FUZZY_CUTOFF = 85
+
+# Transcript filler that would otherwise match catalog words
+STOPWORDS = frozenset(
+    """
+    a an and are at about be but by for from got have i in is it its of on or
+    our so that the there these this those to uh um we were with ok okay like
+    just also then next one two three four five six seven eight nine ten half
+    quarter full left some more have has had
+    case cases bottle bottles bag bags box boxes pack packs each
+    pound pounds lb lbs ounce ounces gallon gallons liter liters
+    """.split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_APOSTROPHE_RE = re.compile(r"['’]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ASCII word tokens, dropping stopwords and bare numbers."""
+    text = _APOSTROPHE_RE.sub("", unidecode(text).lower())
+    return [t for t in _TOKEN_RE.findall(text) if t not in STOPWORDS and not t.isdigit()]
+
+
+_PHONETIC_SUBS = (
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"ck|q|c(?=[aou])|c$"), "k"),
+    (re.compile(r"c(?=[eiy])"), "s"),
+    (re.compile(r"z"), "s"),
+    (re.compile(r"x"), "ks"),
+    (re.compile(r"dg|j"), "g"),
+    (re.compile(r"wh|w"), "v"),
+    (re.compile(r"(?<=.)[aeiouyh]"), ""),
+    (re.compile(r"(.)\1+"), r"\1"),
+)
+
+
+def phonetic_key(token: str) -> str:
+    """Coarse sound-alike key: merge similar consonants, drop inner vowels."""
+    key = token
+    for pattern, repl in _PHONETIC_SUBS:
+        key = pattern.sub(repl, key)
+    return key
+
+
+class CatalogRetriever:
+    """Index over catalog entries for top-K retrieval by transcript.
+
+    Built once per catalog/mapping set; `retrieve` is then a few dict lookups
+    per transcript token.
+    """
+
+    def __init__(
+        self,
+        catalog: Dict[str, List[Dict]],
+        mappings: Optional[Dict[str, str]] = None,
+    ):
+        self.entries: List[Tuple[str, Dict]] = [
+            (category_key, product)
+            for category_key, products in catalog.items()
+            for product in products
+        ]
+        self.mappings = mappings or {}
+
+        by_name = {product.get("item", "").lower(): idx for idx, (_, product) in enumerate(self.entries)}
+        # entry idx -> spoken names that map to it
+        self.entry_mappings: Dict[int, List[str]] = defaultdict(list)
+        for spoken, canonical in self.mappings.items():
+            idx = by_name.get(canonical.lower())
+            if idx is not None:
+                self.entry_mappings[idx].append(spoken)
+
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        for idx, (_, product) in enumerate(self.entries):
+            for token in self._entry_tokens(idx, product):
+                self.postings[token].add(idx)
+
+        n = max(len(self.entries), 1)
+        self.idf: Dict[str, float] = {
+            token: math.log(1 + n / len(ids)) for token, ids in self.postings.items()
+        }
+        self.vocab: List[str] = sorted(self.postings)
+        self.phonetic: Dict[str, List[str]] = defaultdict(list)
+        for token in self.vocab:
+            if len(token) >= 4 and len(phonetic_key(token)) >= 3:
+                self.phonetic[phonetic_key(token)].append(token)
+
+        # spoken-name phrases, matched against the normalized transcript
+        self._phrases: List[Tuple[str, int]] = [
+            (" ".join(tokenize(spoken)), idx)
+            for idx, spokens in self.entry_mappings.items()
+            for spoken in spokens
+            if tokenize(spoken)
+        ]
+
+    def _entry_tokens(self, idx: int, product: Dict) -> Iterable[str]:
+        yield from tokenize(product.get("item", ""))
+        for keyword in product.get("keywords", []):
+            yield from tokenize(keyword)
+        for spoken in self.entry_mappings.get(idx, ()):
+            yield from tokenize(spoken)
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Catalog tokens a transcript token may refer to, with match weights."""
+        if token in self.postings:
+            return [(token, EXACT_WEIGHT)]
+
+        matches: Dict[str, float] = {}
+        key = phonetic_key(token)
+        if len(token) >= 4 and len(key) >= 3:
+            for vocab_token in self.phonetic.get(key, ()):
+                matches[vocab_token] = PHONETIC_WEIGHT
+
+        if len(token) >= 3:
+            i = bisect.bisect_left(self.vocab, token)
+            while i < len(self.vocab) and self.vocab[i].startswith(token):
+                matches.setdefault(self.vocab[i], PREFIX_WEIGHT)
+                i += 1
+
+        if not matches and len(token) >= 5:
+            for vocab_token, _, _ in process.extract(
+                token, self.vocab, scorer=fuzz.ratio, score_cutoff=FUZZY_CUTOFF, limit=3
+            ):
+                matches[vocab_token] = FUZZY_WEIGHT
+
+        return list(matches.items())
+
+    def score(self, transcript: str) -> Dict[int, float]:
+        """Relevance score per catalog entry index (only entries with a hit)."""
+        tokens = tokenize(transcript)
+        best: Dict[str, float] = {}
+        for token in set(tokens):
+            for vocab_token, weight in self._expand(token):
+                best[vocab_token] = max(best.get(vocab_token, 0.0), weight)
+
+        scores: Dict[int, float] = defaultdict(float)
+        for vocab_token, weight in best.items():
+            contribution = weight * self.idf[vocab_token]
+            for idx in self.postings[vocab_token]:
+                scores[idx] += contribution
+
+        # A spoken-name phrase from the manual mappings is an exact hit
+        normalized = f" {' '.join(tokens)} "
+        top = max(scores.values(), default=0.0) + 1.0
+        for phrase, idx in self._phrases:
+            if f" {phrase} " in normalized:
+                scores[idx] = max(scores[idx], top)
+
+        return scores
+
+    def retrieve(self, transcript: str, top_k: int = DEFAULT_TOP_K) -> List[Tuple[str, Dict]]:
+        """Top-K (category_key, product) entries for the transcript, best first."""
+        scores = self.score(transcript)
+        ranked = sorted(scores, key=lambda idx: (-scores[idx], idx))[:top_k]
+        return [self.entries[idx] for idx in ranked]
+
+    def mappings_for(self, entries: Iterable[Tuple[str, Dict]]) -> Dict[str, str]:
+        """Manual mappings whose canonical name is among the given entries."""
+        wanted = {product.get("item", "").lower() for _, product in entries}
+        return {
+            spoken: canonical
+            for spoken, canonical in self.mappings.items()
+            if canonical.lower() in wanted
+        }
+
+
+def get_catalog_retriever(category: str = "bar") -> CatalogRetriever:
+    """Retriever for a category, built once per catalog version."""
+    return get_catalog_store().cached(("catalog_retriever", category), lambda: _build_retriever(category))
+
+
+def _build_retriever(category: str) -> CatalogRetriever:
+    from .inventory_prompt import load_catalog, load_manual_mappings
+
+    retriever = CatalogRetriever(load_catalog(category), load_manual_mappings())
+    log.info(
+        "Built catalog retriever (category=%s, entries=%d, vocab=%d)",
+        category, len(retriever.entries), len(retriever.vocab),
+    )
+    return retriever
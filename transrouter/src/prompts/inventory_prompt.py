@@ -5,6 +5,10 @@ Constructs the system prompt for the inventory agent by loading:
 - Manual item mappings (bar_item_mappings.json, food_item_mappings.json)
 - Inventory parsing rules
 
+The system prompt itself is static per category (and prompt-cached). The
+catalog entries and mappings relevant to a given transcript are retrieved
+locally and sent as a per-call suffix (see build_inventory_catalog_context).
+
 This follows the same pattern as payroll_prompt.py.
 """
 
@@ -15,45 +19,25 @@ import logging
 from pathlib import Path
 from typing import Dict, List
 
+from inventory_agent.catalog_store import get_catalog_store
+from .catalog_retriever import DEFAULT_TOP_K, get_catalog_retriever
+
 log = logging.getLogger(__name__)
 
 
 def load_catalog(category: str = "bar") -> Dict[str, List[Dict]]:
     """Load product catalog for a specific category.
 
+    Served from the shared CatalogStore: parsed once per process (and again
+    only when the file changes). The result is read-only.
+
     Args:
         category: Category to load (bar, food, supplies, or "all")
 
     Returns:
         Dict with category keys and product lists
     """
-    catalog_path = Path(__file__).parent.parent.parent.parent / "data" / "inventory_catalog.json"
-
-    if not catalog_path.exists():
-        log.warning("Inventory catalog not found at %s", catalog_path)
-        return {}
-
-    with catalog_path.open("r") as f:
-        full_catalog = json.load(f)
-
-    # If requesting specific category, return just that
-    if category != "all":
-        # Map category name to catalog key
-        category_map = {
-            "bar": ["beer_cost", "wine_cost", "liquor_cost", "n_a_beverage_cost"],
-            "food": ["grocery_and_dry_goods"],
-            "supplies": ["grocery_and_dry_goods"],  # Overlap with food
-        }
-
-        catalog = {}
-        for cat_key in category_map.get(category, []):
-            if cat_key in full_catalog:
-                catalog[cat_key] = full_catalog[cat_key]
-
-        return catalog
-
-    # Return all categories
-    return {k: v for k, v in full_catalog.items() if k != "global_rules"}
+    return get_catalog_store().slice(category)
 
 
 def load_manual_mappings() -> Dict[str, str]:
@@ -137,27 +121,69 @@ def format_manual_mappings_for_prompt(mappings: Dict[str, str], limit: int = 50)
     return "\n".join(lines)
 
 
+def build_inventory_catalog_context(
+    transcript: str,
+    category: str = "bar",
+    top_k: int = DEFAULT_TOP_K,
+) -> str:
+    """Build the transcript-specific catalog section of the system prompt.
+
+    Retrieves the top_k catalog entries the transcript most likely refers to
+    (plus the manual mappings that point at them) so the model sees the
+    relevant long-tail products without paying for the whole catalog.
+
+    Args:
+        transcript: Raw transcript from ASR
+        category: Inventory category (bar, food, supplies)
+        top_k: Max catalog entries to include
+
+    Returns:
+        Prompt section to append after the static system prompt.
+    """
+    retriever = get_catalog_retriever(category)
+    entries = retriever.retrieve(transcript, top_k=top_k)
+
+    candidates: Dict[str, List[Dict]] = {}
+    for category_key, product in entries:
+        candidates.setdefault(category_key, []).append(product)
+    mappings = retriever.mappings_for(entries)
+
+    log.info(
+        "Retrieved %d/%d catalog candidates and %d mappings for transcript (%d chars)",
+        len(entries), len(retriever.entries), len(mappings), len(transcript),
+    )
+
+    catalog_text = format_catalog_for_prompt(candidates, limit=top_k) if entries else "(no catalog matches)"
+    mappings_text = format_manual_mappings_for_prompt(mappings, limit=top_k) if mappings else "(none)"
+
+    return f'''## Candidate Products For This Transcript
+
+### Manual Mappings
+
+{mappings_text}
+
+### Catalog Candidates
+{catalog_text}
+'''
+
+
 def build_inventory_system_prompt(category: str = "bar") -> str:
-    """Build the complete system prompt for the inventory agent.
+    """Build the static system prompt for the inventory agent.
+
+    The catalog excerpt is not included here; pair this with
+    build_inventory_catalog_context(transcript, category) as the system suffix.
 
     Args:
         category: Inventory category (bar, food, supplies)
 
     Returns:
-        Complete system prompt string for Claude API call.
+        System prompt string for Claude API call.
     """
-    # Load catalog and mappings
     catalog = load_catalog(category)
-    manual_mappings = load_manual_mappings()
 
     # Count products
     total_products = sum(len(products) for products in catalog.values())
-    log.info("Building inventory prompt (category=%s, products=%d, mappings=%d)",
-             category, total_products, len(manual_mappings))
-
-    # Format for prompt (limit to avoid token bloat)
-    catalog_text = format_catalog_for_prompt(catalog, limit=100)
-    mappings_text = format_manual_mappings_for_prompt(manual_mappings, limit=50)
+    log.info("Building inventory prompt (category=%s, products=%d)", category, total_products)
 
     return f'''# Inventory Agent - Shelfy Inventory Parser
 
@@ -180,15 +206,14 @@ The transcript comes from Whisper ASR, so names may be misspelled or incomplete.
 **Your job**: Match spoken names to canonical catalog names.
 
 **Sources of truth (in priority order):**
-1. **Manual mappings** (see below) - these are EXACT mappings
+1. **Manual mappings** (see Candidate Products below) - these are EXACT mappings
 2. **Product catalog keywords** - fuzzy match using keywords
 3. **Your knowledge** - use context clues (brand names, sizes, etc.)
 
 ### Manual Mappings (Highest Priority)
 
-These are known spoken-name → canonical-name mappings:
-
-{mappings_text}
+Known spoken-name → canonical-name mappings relevant to this transcript are
+listed under **Candidate Products For This Transcript** at the end of this prompt.
 
 **RULE**: If the transcript says "margarita mix", you MUST use "Bar Mix, Margarita" (from manual mapping).
 
@@ -198,7 +223,9 @@ Category: **{category.upper()}**
 
 Total products in catalog: **{total_products}**
 
-{catalog_text}
+The catalog entries most likely mentioned in this transcript (matched on name,
+keywords and sound-alike spellings) are listed under **Candidate Products For
+This Transcript** at the end of this prompt. Prefer those canonical names.
 
 **RULE**: Match transcript names to catalog names using keywords. For example:
 - Transcript: "cab sauv" → Match: "Cabernet Sauvignon" (keywords: cab, sauv)
@@ -8,10 +8,10 @@ Responsibilities:
 
 import base64
 import binascii
-from pathlib import Path
 from typing import Any, Callable, Dict, Optional
 
 from . import intent_classifier, entity_extractor, domain_router, logging_utils
+from .app_config import DEFAULT_CONFIG, get_config  # noqa: F401  (DEFAULT_CONFIG re-exported)
 from .asr_adapter import ASRAdapter, get_asr_provider
 from .logging_utils import log_transcript
 from .schemas import (
@@ -22,27 +22,10 @@ from .schemas import (
     TranscriptResult,
 )
 
-DEFAULT_CONFIG = {
-    "asr": {"provider": "auto", "language": "en", "timeout_seconds": 120, "whisper_model": "base"},
-    "routing": {"default_domain": "payroll", "fallback_intent": "unknown"},
-    "logging": {"level": "INFO"},
-}
-
 
 def load_default_config() -> Dict[str, Any]:
-    """Load config from default.yaml if available, else use in-memory defaults."""
-    config_path = Path(__file__).resolve().parent.parent / "config" / "default.yaml"
-    if config_path.exists():
-        try:
-            import yaml  # type: ignore
-
-            with config_path.open("r", encoding="utf-8") as f:
-                loaded = yaml.safe_load(f) or {}
-                return {**DEFAULT_CONFIG, **loaded}
-        except Exception:
-            # Fall back silently to defaults if PyYAML is missing or file malformed.
-            return DEFAULT_CONFIG
-    return DEFAULT_CONFIG
+    """The shared config (default.yaml over in-memory defaults; see app_config)."""
+    return get_config()
 
 
 def _resolve_audio_bytes(audio_request: AudioRequest) -> bytes:
@@ -69,7 +52,7 @@ def handle_audio_request(
 ) -> RouterResponse:
     """Main entry for audio requests: transcribe -> interpret -> route."""
     logger = logger or logging_utils.get_logger("transrouter.orchestrator")
-    config = config or load_default_config()
+    config = config or get_config()
 
     try:
         audio_bytes = _resolve_audio_bytes(audio_request)
@@ -57,6 +57,7 @@ def test_health_endpoint_returns_healthy():
     assert "timestamp" in data
     assert "brain_loaded" in data
     assert "domains" in data
+    assert isinstance(data["asr"], list)
 
 
 def test_health_endpoint_includes_domains():
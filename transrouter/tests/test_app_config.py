@@ -0,0 +1,81 @@
+"""Tests for the shared, mtime-reloaded Transrouter config."""
+
+import os
+
+import pytest
+
+from transrouter.src.app_config import DEFAULT_CONFIG, AppConfig, get_config
+from transrouter.src.claude_client import ClaudeConfig
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_parses_once_and_reloads_on_change(tmp_path):
+    path = tmp_path / "default.yaml"
+    _write(path, "asr:\n  provider: whisper\n", 1_000_000_000)
+    config = AppConfig(path)
+
+    first = config.get()
+    assert first["asr"]["provider"] == "whisper"
+    assert first["routing"] == DEFAULT_CONFIG["routing"]
+    assert config.get() is first
+
+    _write(path, "asr:\n  provider: openai\n", 2_000_000_000)
+    assert config.get()["asr"]["provider"] == "openai"
+    assert config.version == 2
+
+
+def test_explicit_reload_and_read_only(tmp_path):
+    path = tmp_path / "default.yaml"
+    _write(path, "claude:\n  max_tokens: 100\n", 1_000_000_000)
+    config = AppConfig(path)
+    assert config.get()["claude"]["max_tokens"] == 100
+
+    # Same size and mtime: only an explicit reload notices
+    _write(path, "claude:\n  max_tokens: 200\n", 1_000_000_000)
+    assert config.get()["claude"]["max_tokens"] == 100
+    assert config.reload()["claude"]["max_tokens"] == 200
+
+    with pytest.raises(TypeError):
+        config.get()["claude"]["max_tokens"] = 1
+
+
+def test_missing_or_malformed_file_uses_defaults(tmp_path):
+    assert AppConfig(tmp_path / "missing.yaml").get() == DEFAULT_CONFIG
+
+    path = tmp_path / "bad.yaml"
+    path.write_text("asr: [unclosed\n")
+    assert AppConfig(path).get() == DEFAULT_CONFIG
+
+
+def test_bad_reload_keeps_last_good_config(tmp_path):
+    path = tmp_path / "default.yaml"
+    _write(path, "asr:\n  provider: whisper\n", 1_000_000_000)
+    config = AppConfig(path)
+    good = config.get()
+
+    _write(path, "asr: [half-written\n", 2_000_000_000)
+    assert config.get() is good
+    assert config.version == 1
+
+    _write(path, "asr:\n  provider: openai\n", 3_000_000_000)
+    assert config.get()["asr"]["provider"] == "openai"
+
+
+def test_claude_config_reads_shared_config_when_none_given():
+    claude = get_config().get("claude", {})
+    assert ClaudeConfig.from_dict().max_tokens == claude.get("max_tokens", ClaudeConfig.max_tokens)
+    assert ClaudeConfig.from_dict({}).max_tokens == ClaudeConfig.max_tokens
+
+
+def test_default_yaml_prompt_caching_reaches_claude_config(tmp_path):
+    config = AppConfig().get()
+    assert "prompt_caching" not in config["asr"]
+    assert ClaudeConfig.from_dict(config).prompt_caching is config["claude"]["prompt_caching"]
+
+    path = tmp_path / "default.yaml"
+    path.write_text("claude:\n  prompt_caching: false\n")
+    assert ClaudeConfig.from_dict(AppConfig(path).get()).prompt_caching is False
@@ -0,0 +1,81 @@
+"""Tests for the shared ASR provider registry."""
+
+import sys
+import types
+
+import pytest
+
+from transrouter.src.asr_adapter import (
+    OpenAIWhisperAdapter,
+    WhisperAdapter,
+    asr_status,
+    get_asr_provider,
+    reset_asr_providers,
+    warm_asr_provider,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    reset_asr_providers()
+    yield
+    reset_asr_providers()
+
+
+def _whisper_config(model="tiny"):
+    return {"asr": {"provider": "whisper", "whisper_model": model}}
+
+
+def test_same_settings_share_one_adapter():
+    first = get_asr_provider(_whisper_config())
+    assert get_asr_provider(_whisper_config()) is first
+    assert get_asr_provider(_whisper_config("small")) is not first
+    # "auto" without an API key resolves to the local model
+    assert get_asr_provider({"asr": {"provider": "auto", "whisper_model": "tiny"}}) is first
+
+
+def test_provider_aliases_resolve_to_one_adapter(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    adapter = get_asr_provider()
+    assert isinstance(adapter.inner.inner, OpenAIWhisperAdapter)
+    assert get_asr_provider({"asr": {"provider": "openai_whisper"}}) is adapter
+
+
+def test_unknown_provider_raises():
+    with pytest.raises(ValueError):
+        get_asr_provider({"asr": {"provider": "nope"}})
+
+
+def test_warm_loads_whisper_model_once(monkeypatch):
+    loads = []
+    fake_whisper = types.SimpleNamespace(load_model=lambda name: loads.append(name) or object())
+    monkeypatch.setitem(sys.modules, "whisper", fake_whisper)
+
+    adapter = warm_asr_provider(_whisper_config())
+    assert isinstance(adapter.inner.inner, WhisperAdapter)
+    assert adapter.is_warm
+    get_asr_provider(_whisper_config()).inner.inner._load_model()
+    assert loads == ["tiny"]
+    assert asr_status() == [{"provider": "whisper", "model": "tiny", "warm": True}]
+
+
+def test_warm_failure_is_reported_not_raised(monkeypatch):
+    monkeypatch.setitem(sys.modules, "whisper", None)  # import raises ImportError
+
+    assert warm_asr_provider(_whisper_config()) is None
+    assert asr_status() == [{"provider": "whisper", "model": "tiny", "warm": False}]
+
+
+def test_whisper_loads_a_model_per_concurrent_worker(monkeypatch):
+    loads = []
+    fake_whisper = types.SimpleNamespace(load_model=lambda name: loads.append(name) or object())
+    monkeypatch.setitem(sys.modules, "whisper", fake_whisper)
+    adapter = WhisperAdapter("tiny", workers=2)
+
+    with adapter._checkout() as first:
+        with adapter._checkout() as second:
+            assert first is not second
+    with adapter._checkout():
+        pass
+    assert loads == ["tiny", "tiny"]
@@ -0,0 +1,165 @@
+"""Tests for chunked, parallel transcription of long recordings."""
+
+import threading
+import time
+
+import numpy as np
+
+from transrouter.src import asr_adapter
+from transrouter.src.asr_adapter import (
+    ASRAdapter,
+    ChunkingASRAdapter,
+    NormalizingASRAdapter,
+    asr_chunks_long_audio,
+    create_asr_provider,
+)
+from transrouter.src.audio_io import decode_pcm
+from transrouter.src.audio_normalize import chunk_bounds, encode_wav
+from transrouter.src.schemas import TranscriptResult
+
+RATE = 16000
+
+
+def _tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _quiet(seconds):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * RATE)) * 1e-4).astype(np.float32)
+
+
+class SlowAdapter(ASRAdapter):
+    """Reports each chunk's length as its transcript and tracks concurrency."""
+
+    name = "slow"
+
+    def __init__(self, max_concurrency=4, segments=True):
+        self.max_concurrency = max_concurrency
+        self.segments = segments
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio_bytes, audio_format, sample_rate_hz):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        seconds = len(decode_pcm(audio_bytes, audio_format)) / sample_rate_hz
+        words = [{"start": 0.0, "end": seconds, "text": f"{seconds:.1f}"}] if self.segments else None
+        return TranscriptResult(transcript=f"{seconds:.1f}", confidence=0.5, words=words)
+
+
+def test_chunks_are_cut_in_pauses():
+    # Speech with a pause every 7 s; chunks of at most 20 s
+    block = np.concatenate([_tone(6), _quiet(1)])
+    samples = np.concatenate([block] * 8)
+
+    bounds = chunk_bounds(samples, max_chunk_s=20, min_chunk_s=5)
+
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(samples)
+    assert all(end == start for (_, end), (start, _) in zip(bounds[:-1], bounds[1:]))
+    for _, end in bounds[:-1]:
+        # Each cut lands inside a pause, not in speech
+        assert end % (7 * RATE) >= 6 * RATE
+    assert all(end - start <= 20 * RATE for start, end in bounds)
+
+
+def test_unbroken_speech_is_hard_cut():
+    bounds = chunk_bounds(_tone(25), max_chunk_s=10)
+    assert [round((end - start) / RATE) for start, end in bounds] == [10, 10, 5]
+
+
+def test_long_audio_is_transcribed_concurrently_and_stitched():
+    samples = np.concatenate([np.concatenate([_tone(4), _quiet(1)])] * 6)
+    inner = SlowAdapter(max_concurrency=4)
+    adapter = ChunkingASRAdapter(inner, chunk_seconds=6)
+
+    result = adapter.transcribe(encode_wav(samples), "wav", RATE)
+
+    assert inner.peak > 1
+    bounds = chunk_bounds(samples, 6)
+    assert result.transcript.split() == [f"{(end - start) / RATE:.1f}" for start, end in bounds]
+    assert [seg["start"] for seg in result.words] == [start / RATE for start, _ in bounds]
+    assert result.words[-1]["end"] == len(samples) / RATE
+    assert result.confidence == 0.5
+
+
+def test_chunks_without_segments_get_one_segment_each():
+    samples = np.concatenate([_tone(4), _quiet(1)] * 3)
+    adapter = ChunkingASRAdapter(SlowAdapter(max_concurrency=1, segments=False), chunk_seconds=6)
+
+    result = adapter.transcribe(encode_wav(samples), "wav", RATE)
+
+    assert adapter.inner.peak == 1
+    assert [seg["text"] for seg in result.words] == result.transcript.split()
+    assert result.words[1]["start"] == result.words[0]["end"]
+
+
+def test_short_audio_passes_through():
+    inner = SlowAdapter()
+    adapter = ChunkingASRAdapter(inner, chunk_seconds=6)
+    audio = encode_wav(_tone(3))
+
+    assert adapter.transcribe(audio, "wav", RATE).transcript == "3.0"
+    assert inner.peak == 1
+
+
+class SamplesAdapter(ASRAdapter):
+    """A provider that takes decoded samples, like local Whisper."""
+
+    name = "samples"
+    takes_samples = True
+
+    def __init__(self):
+        self.chunks = []
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio_bytes, audio_format, sample_rate_hz):
+        raise AssertionError("audio should arrive as samples")
+
+    def transcribe_samples(self, samples, original=None):
+        with self._lock:
+            self.chunks.append(len(samples))
+        return TranscriptResult(transcript="x")
+
+
+def test_samples_reach_the_provider_without_reencoding(monkeypatch):
+    def no_encoding(samples):
+        raise AssertionError("chunks should not be encoded")
+
+    monkeypatch.setattr("transrouter.src.audio_normalize.encode_compact", no_encoding)
+    samples = np.concatenate([np.concatenate([_tone(4), _quiet(1)])] * 4)
+    inner = SamplesAdapter()
+    adapter = NormalizingASRAdapter(ChunkingASRAdapter(inner, chunk_seconds=6))
+
+    adapter.transcribe(encode_wav(samples), "wav", RATE)
+
+    assert len(inner.chunks) > 1
+    assert all(n <= 6 * RATE for n in inner.chunks)
+
+
+def test_providers_are_chunked_inside_normalization():
+    adapter = create_asr_provider({"asr": {"provider": "whisper", "workers": 2}})
+    assert isinstance(adapter, NormalizingASRAdapter)
+    assert isinstance(adapter.inner, ChunkingASRAdapter)
+    assert adapter.max_concurrency == 2
+
+    plain = create_asr_provider({"asr": {"provider": "whisper", "normalize": False, "chunk_seconds": 0}})
+    assert not isinstance(plain, (NormalizingASRAdapter, ChunkingASRAdapter))
+
+
+def test_chunking_switch_follows_config(monkeypatch):
+    monkeypatch.setattr(asr_adapter, "ffmpeg_available", lambda: True)
+    assert asr_chunks_long_audio({"asr": {"provider": "whisper"}})
+    assert not asr_chunks_long_audio({"asr": {"provider": "whisper", "chunk_seconds": 0}})
+
+
+def test_long_audio_is_not_chunked_without_ffmpeg(monkeypatch):
+    # e.g. a 40 MB webm can't be decoded, so it must keep the direct fallback
+    monkeypatch.setattr(asr_adapter, "ffmpeg_available", lambda: False)
+    assert not asr_chunks_long_audio({"asr": {"provider": "whisper"}})
@@ -0,0 +1,80 @@
+"""Tests for in-memory audio handoff to the ASR adapters."""
+
+import io
+import os
+import subprocess
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from transrouter.src import audio_io
+from transrouter.src.asr_adapter import OpenAIWhisperAdapter
+
+
+def _wav(samples, rate=16000, channels=1):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+    return buf.getvalue()
+
+
+def test_16k_mono_wav_decodes_without_ffmpeg(monkeypatch):
+    monkeypatch.setattr(audio_io, "_ffmpeg", lambda *a: pytest.fail("ffmpeg should not run"))
+
+    samples = audio_io.decode_pcm(_wav([0, 16384, -32768]), "wav")
+
+    assert samples.dtype == np.float32
+    assert samples.tolist() == [0.0, 0.5, -1.0]
+
+
+def test_unpipeable_input_falls_back_to_spool_file(monkeypatch):
+    calls = []
+    pcm = np.array([8192], dtype=np.int16).tobytes()
+
+    def fake_ffmpeg(source, data):
+        calls.append(source)
+        if data is not None:
+            return subprocess.CompletedProcess([], 1, b"", b"moov atom not found")
+        assert os.path.exists(source) and source.endswith(".m4a")
+        return subprocess.CompletedProcess([], 0, pcm, b"")
+
+    monkeypatch.setattr(audio_io, "_ffmpeg", fake_ffmpeg)
+
+    assert audio_io.decode_pcm(b"not really m4a", "m4a").tolist() == [0.25]
+    assert calls[0] == "pipe:0"
+    assert not os.path.exists(calls[1])
+
+
+def test_resampled_wav_goes_through_ffmpeg_pipe(monkeypatch):
+    seen = []
+
+    def fake_ffmpeg(source, data):
+        seen.append((source, data))
+        return subprocess.CompletedProcess([], 0, b"\x00\x00", b"")
+
+    monkeypatch.setattr(audio_io, "_ffmpeg", fake_ffmpeg)
+    wav = _wav([1, 2], rate=48000)
+
+    audio_io.decode_pcm(wav, "wav")
+    assert seen == [("pipe:0", wav)]
+
+
+def test_openai_adapter_uploads_from_memory():
+    sent = {}
+
+    def create(**kwargs):
+        sent.update(kwargs)
+        return " hello "
+
+    adapter = OpenAIWhisperAdapter()
+    adapter._client = SimpleNamespace(audio=SimpleNamespace(transcriptions=SimpleNamespace(create=create)))
+
+    result = adapter.transcribe(b"RIFF....", "m4a", 16000)
+
+    assert result.transcript == "hello"
+    assert sent["file"] == ("audio.m4a", b"RIFF....")
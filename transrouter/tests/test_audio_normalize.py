@@ -0,0 +1,135 @@
+"""Tests for the pre-ASR audio normalization stage."""
+
+import io
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+from transrouter.src.asr_adapter import ASRAdapter, NormalizingASRAdapter, create_asr_provider
+from transrouter.src.audio_normalize import (
+    MAX_PAUSE_MS,
+    encode_compact,
+    encode_wav,
+    normalize_audio,
+    trim_silence,
+)
+from transrouter.src.schemas import TranscriptResult
+
+RATE = 16000
+
+
+def _tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _quiet(seconds):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * RATE)) * 1e-4).astype(np.float32)
+
+
+def _wav_bytes(samples, rate=RATE, channels=1):
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+class RecordingAdapter(ASRAdapter):
+    name = "recording"
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio_bytes, audio_format, sample_rate_hz):
+        self.calls.append((audio_bytes, audio_format, sample_rate_hz))
+        return TranscriptResult(transcript="ok")
+
+
+def test_trims_edges_and_shortens_long_pauses():
+    samples = np.concatenate([_quiet(2), _tone(1), _quiet(5), _tone(1), _quiet(3)])
+
+    trimmed = trim_silence(samples)
+
+    # Two seconds of speech, one capped pause, a little edge padding
+    assert 2.0 + MAX_PAUSE_MS / 1000 <= len(trimmed) / RATE < 3.2
+    assert len(trimmed) / RATE < len(samples) / RATE / 3
+
+
+def test_short_pauses_and_all_silence_are_kept():
+    speech = np.concatenate([_tone(1), _quiet(0.3), _tone(1)])
+    assert len(trim_silence(speech)) == len(speech)
+
+    silence = _quiet(2)
+    assert trim_silence(silence) is silence
+
+
+def test_normalize_reports_savings_and_returns_16k_mono():
+    audio = _wav_bytes(np.concatenate([_quiet(3), _tone(2), _quiet(3)]))
+
+    result = normalize_audio(audio, "wav")
+
+    assert result.sample_rate_hz == RATE
+    assert result.input_duration_s == 8.0
+    assert result.duration_s < 3
+    assert result.bytes_saved > 0 and result.stats()["seconds_saved"] > 5
+    if result.audio_format == "wav":
+        with wave.open(io.BytesIO(result.audio_bytes)) as w:
+            assert (w.getframerate(), w.getnchannels()) == (RATE, 1)
+    else:
+        assert result.audio_format == "ogg"
+
+
+def test_falls_back_to_wav_without_ffmpeg(monkeypatch):
+    def no_ffmpeg(*args, **kwargs):
+        raise FileNotFoundError("ffmpeg")
+
+    monkeypatch.setattr("transrouter.src.audio_io.subprocess.run", no_ffmpeg)
+    audio_bytes, audio_format = encode_compact(_tone(1))
+    assert audio_format == "wav"
+    assert audio_bytes[:4] == b"RIFF"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_opus_is_much_smaller_than_pcm():
+    samples = _tone(10)
+    audio_bytes, audio_format = encode_compact(samples)
+    assert audio_format == "ogg" and audio_bytes[:4] == b"OggS"
+    assert len(audio_bytes) < len(encode_wav(samples)) / 4
+
+
+def test_adapter_sends_normalized_audio_and_falls_back_on_failure():
+    inner = RecordingAdapter()
+    adapter = NormalizingASRAdapter(inner)
+
+    adapter.transcribe(_wav_bytes(np.concatenate([_quiet(2), _tone(1)])), "wav", 48000)
+    audio_bytes, audio_format, rate = inner.calls[-1]
+    assert (audio_format, rate) == ("wav", RATE)
+    assert len(audio_bytes) < 2 * RATE * 2
+
+    adapter.transcribe(b"not audio", "webm", 48000)
+    assert inner.calls[-1] == (b"not audio", "webm", 48000)
+
+
+def test_adapter_keeps_original_when_normalizing_does_not_shrink_it(monkeypatch):
+    # A compressed upload with no silence to trim: re-encoding only adds bytes
+    monkeypatch.setattr(
+        "transrouter.src.audio_normalize.encode_compact", lambda samples: (encode_wav(samples) * 2, "wav")
+    )
+    inner = RecordingAdapter()
+    original = _wav_bytes(_tone(2))
+
+    NormalizingASRAdapter(inner).transcribe(original, "wav", 48000)
+
+    assert inner.calls[-1] == (original, "wav", 48000)
+
+
+def test_normalization_can_be_disabled():
+    adapter = create_asr_provider({"asr": {"provider": "whisper", "normalize": False}})
+    assert not isinstance(adapter, NormalizingASRAdapter)
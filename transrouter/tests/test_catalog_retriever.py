@@ -0,0 +1,62 @@
+"""Tests for transcript-driven catalog retrieval."""
+
+from transrouter.src.prompts.catalog_retriever import CatalogRetriever
+from transrouter.src.prompts.inventory_prompt import build_inventory_catalog_context
+
+CATALOG = {
+    "beer_cost": [
+        {"item": "Coors Light 12oz Can", "keywords": ["coors", "light", "12oz", "can"]},
+        {"item": "Stella Artois Keg", "keywords": ["stella", "artois", "keg"]},
+        {"item": "Miller Lite 12oz Can", "keywords": ["miller", "lite", "12oz", "can"]},
+    ],
+    "wine_cost": [
+        {"item": "Justin Cabernet Sauvignon", "keywords": ["justin", "cabernet", "sauvignon"]},
+        {"item": "Santa Margherita Pinot Grigio", "keywords": ["pinot", "grigio"]},
+    ],
+    "liquor_cost": [
+        {"item": "Jagermeister", "keywords": ["jagermeister"]},
+        {"item": "Bar Mix, Margarita", "keywords": ["bar", "mix", "margarita"]},
+    ],
+}
+MAPPINGS = {"margarita mix": "Bar Mix, Margarita", "not in catalog": "Missing Product"}
+
+
+def _items(entries):
+    return [product["item"] for _, product in entries]
+
+
+def test_retrieves_only_mentioned_products():
+    retriever = CatalogRetriever(CATALOG, MAPPINGS)
+
+    items = _items(retriever.retrieve("half a case of coors light and two stella kegs"))
+
+    assert items[:2] == ["Coors Light 12oz Can", "Stella Artois Keg"]
+    assert "Justin Cabernet Sauvignon" not in items
+
+
+def test_handles_abbreviations_and_misspellings():
+    retriever = CatalogRetriever(CATALOG, MAPPINGS)
+
+    assert _items(retriever.retrieve("cab sauv", top_k=1)) == ["Justin Cabernet Sauvignon"]
+    assert _items(retriever.retrieve("yagermeister", top_k=1)) == ["Jagermeister"]
+
+
+def test_manual_mapping_phrase_ranks_first_and_is_reported():
+    retriever = CatalogRetriever(CATALOG, MAPPINGS)
+
+    entries = retriever.retrieve("twelve margarita mix and some pinot grigio")
+
+    assert _items(entries)[0] == "Bar Mix, Margarita"
+    assert retriever.mappings_for(entries) == {"margarita mix": "Bar Mix, Margarita"}
+
+
+def test_top_k_limits_results():
+    retriever = CatalogRetriever(CATALOG, MAPPINGS)
+    assert len(retriever.retrieve("coors miller stella justin jagermeister", top_k=2)) == 2
+    assert retriever.retrieve("") == []
+
+
+def test_catalog_context_reaches_long_tail():
+    # Grocery has far more than the old 100-item prompt slice
+    context = build_inventory_catalog_context("a case of sundried tomatoes", category="food")
+    assert "Tomatoes, Sundried" in context
@@ -0,0 +1,251 @@
+"""Tests for ClaudeClient prompt caching, retries and the async client."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import anthropic
+import httpx
+
+from transrouter.src.claude_client import (
+    AsyncClaudeClient,
+    ClaudeClient,
+    ConcurrencyLimiter,
+    ClaudeConfig,
+    LatencyHistogram,
+    cache_hit_ratio,
+    get_latency_stats,
+)
+
+
+def _message(text, input_tokens, cache_write=None, cache_read=None):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=50,
+            cache_creation_input_tokens=cache_write,
+            cache_read_input_tokens=cache_read,
+        ),
+    )
+
+
+def _client(config=None):
+    client = ClaudeClient(api_key="test", config=config)
+    client._client = MagicMock()
+    return client
+
+
+def test_system_prompt_is_marked_cacheable():
+    client = _client()
+    client._client.messages.create.return_value = _message('{"ok": true}', 100, cache_write=4000)
+
+    client.call("STATIC RULES", "transcript", system_suffix="week of Jan 6")
+
+    system = client._client.messages.create.call_args.kwargs["system"]
+    assert system == [
+        {"type": "text", "text": "STATIC RULES", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "week of Jan 6"},
+    ]
+
+
+def test_caching_can_be_disabled():
+    client = _client(ClaudeConfig(prompt_caching=False))
+    client._client.messages.create.return_value = _message("{}", 100)
+
+    client.call("STATIC RULES", "transcript")
+
+    system = client._client.messages.create.call_args.kwargs["system"]
+    assert system == [{"type": "text", "text": "STATIC RULES"}]
+
+
+def test_usage_tracks_cache_reads_and_writes():
+    client = _client()
+    client._client.messages.create.side_effect = [
+        _message("{}", 100, cache_write=4000, cache_read=0),
+        _message("{}", 100, cache_write=0, cache_read=4000),
+    ]
+
+    first = client.call("STATIC RULES", "a")
+    second = client.call("STATIC RULES", "b")
+
+    assert first.usage["cache_creation_input_tokens"] == 4000
+    assert first.cache_hit_ratio == 0.0
+    assert second.usage["cache_read_input_tokens"] == 4000
+    assert second.cache_hit_ratio == 4000 / 4100
+    assert client.cache_stats["calls"] == 2
+    assert cache_hit_ratio(client.cache_stats) == 4000 / 8200
+
+
+def test_missing_cache_fields_default_to_zero():
+    client = _client()
+    client._client.messages.create.return_value = _message("{}", 100)
+
+    response = client.call("STATIC RULES", "a")
+
+    assert response.usage["cache_read_input_tokens"] == 0
+    assert response.usage["cache_creation_input_tokens"] == 0
+    assert cache_hit_ratio({}) is None
+
+
+class _Overloaded(anthropic.APIStatusError):
+    def __init__(self, status_code=529, headers=None):
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        response = httpx.Response(status_code, request=request, headers=headers or {})
+        super().__init__("overloaded", response=response, body=None)
+
+
+def test_sync_client_retries_overloaded_then_succeeds(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("transrouter.src.claude_client.time.sleep", sleeps.append)
+    client = _client()
+    client._client.messages.create.side_effect = [_Overloaded(529), _Overloaded(429), _message("{}", 10)]
+
+    response = client.call("STATIC RULES", "a")
+
+    assert response.success
+    assert len(sleeps) == 2
+    assert client._client.messages.create.call_count == 3
+
+
+def test_retry_after_header_sets_minimum_delay(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("transrouter.src.claude_client.time.sleep", sleeps.append)
+    client = _client()
+    client._client.messages.create.side_effect = [_Overloaded(429, {"retry-after": "3"}), _message("{}", 10)]
+
+    client.call("STATIC RULES", "a")
+
+    assert sleeps[0] >= 3
+
+
+def test_connection_errors_and_5xx_are_retried(monkeypatch):
+    monkeypatch.setattr("transrouter.src.claude_client.time.sleep", lambda _: None)
+    client = _client()
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    client._client.messages.create.side_effect = [
+        anthropic.APIConnectionError(request=request),
+        anthropic.APITimeoutError(request=request),
+        _Overloaded(503),
+        _Overloaded(408),
+        _message("{}", 10),
+    ]
+
+    assert client.call("STATIC RULES", "a").success
+    assert client._client.messages.create.call_count == 5
+
+
+def test_sync_and_async_calls_share_one_limit(monkeypatch):
+    monkeypatch.setattr("transrouter.src.claude_client._limiter", ConcurrencyLimiter(1))
+    sync_client = _client()
+    release = threading.Event()
+    sync_client._client.messages.create.side_effect = lambda **_: release.wait() and _message("{}", 10)
+    worker = threading.Thread(target=sync_client.call, args=("STATIC RULES", "a"))
+    worker.start()
+
+    client = AsyncClaudeClient(api_key="test")
+    client._client = MagicMock()
+    client._client.messages.create = AsyncMock(return_value=_message("{}", 10))
+
+    async def run():
+        task = asyncio.ensure_future(client.call("STATIC RULES", "b"))
+        await asyncio.sleep(0.1)
+        assert not task.done()  # waiting for the slot the sync call holds
+        release.set()
+        return await task
+
+    assert asyncio.run(run()).success
+    worker.join()
+
+
+def test_cancelled_waiter_does_not_keep_a_slot():
+    limiter = ConcurrencyLimiter(1)
+
+    async def run():
+        holder_in, holder_out = asyncio.Event(), asyncio.Event()
+
+        async def holder():
+            async with limiter.async_slot():
+                holder_in.set()
+                await holder_out.wait()
+
+        held = asyncio.ensure_future(holder())
+        await holder_in.wait()
+        waiter = asyncio.ensure_future(limiter.async_slot().__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        holder_out.set()  # releases while the cancelled waiter is queued
+        await held
+        await asyncio.gather(waiter, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert limiter.available == 1
+
+
+def test_waiter_cancelled_after_being_handed_a_slot_passes_it_on():
+    limiter = ConcurrencyLimiter(1)
+
+    async def run():
+        with limiter.slot():
+            waiter = asyncio.ensure_future(limiter.async_slot().__aenter__())
+            await asyncio.sleep(0)
+        # The slot was handed to the waiter; cancel before it resumes
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert limiter.available == 1
+
+
+def test_non_retryable_errors_fail_fast():
+    client = _client(ClaudeConfig(max_retries=3))
+    client._client.messages.create.side_effect = _Overloaded(400)
+
+    response = client.call("STATIC RULES", "a")
+
+    assert not response.success
+    assert client._client.messages.create.call_count == 1
+
+
+def test_async_client_same_contract_and_records_latency():
+    client = AsyncClaudeClient(api_key="test", config=ClaudeConfig(model="test-model"))
+    client._client = MagicMock()
+    client._client.messages.create = AsyncMock(return_value=_message('{"ok": true}', 100, cache_read=900))
+
+    response = asyncio.run(client.call("STATIC RULES", "a"))
+
+    assert response.success
+    assert response.json_data == {"ok": True}
+    assert response.usage["cache_read_input_tokens"] == 900
+    assert get_latency_stats()["models"]["test-model"]["count"] >= 1
+
+
+def test_async_client_gives_up_after_max_retries(monkeypatch):
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr("transrouter.src.claude_client.asyncio.sleep", no_sleep)
+    client = AsyncClaudeClient(api_key="test", config=ClaudeConfig(max_retries=2))
+    client._client = MagicMock()
+    client._client.messages.create = AsyncMock(side_effect=_Overloaded(529))
+
+    response = asyncio.run(client.call("STATIC RULES", "a"))
+
+    assert not response.success
+    assert "API error" in response.error
+    assert client._client.messages.create.await_count == 3
+
+
+def test_latency_histogram_buckets():
+    hist = LatencyHistogram()
+    for ms in (100, 400, 150000):
+        hist.observe(ms)
+
+    snap = hist.snapshot()
+    assert snap["count"] == 3
+    assert snap["buckets"]["le_250"] == 1
+    assert snap["buckets"]["le_500"] == 1
+    assert snap["buckets"]["le_inf"] == 1